@@ -4,6 +4,8 @@
 -- Events table - core historical events
 CREATE TABLE IF NOT EXISTS events (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
+    event_uid TEXT UNIQUE,           -- Stable content ID (event_dedup.event_id), same in every run
+    content_hash TEXT,               -- Hash of all stored fields + people/places (change detection for sync)
     year INTEGER,                    -- Year (negative for BC, positive for AD)
     year_end INTEGER,                -- End year for periods (NULL for single events)
     title TEXT NOT NULL,             -- Event title
@@ -64,12 +66,63 @@ CREATE TABLE IF NOT EXISTS event_places (
     UNIQUE(event_id, place_id)
 );
 
+-- Tags (normalized from events.tags)
+CREATE TABLE IF NOT EXISTS tags (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL,              -- First-seen spelling
+    key TEXT NOT NULL UNIQUE         -- Lookup key (event_dedup.normalize_text of the name)
+);
+
+-- Event-Tags relation (many-to-many)
+CREATE TABLE IF NOT EXISTS event_tags (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    event_id INTEGER NOT NULL,
+    tag_id INTEGER NOT NULL,
+
+    FOREIGN KEY (event_id) REFERENCES events(id) ON DELETE CASCADE,
+    FOREIGN KEY (tag_id) REFERENCES tags(id) ON DELETE CASCADE,
+    UNIQUE(event_id, tag_id)
+);
+
+-- Bible references (parsed from events.bible_refs by bible_refs.parse_ref)
+-- Positions are chapter * 1000 + verse, so a passage is one interval per book
+CREATE TABLE IF NOT EXISTS bible_refs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    event_id INTEGER NOT NULL,
+    book TEXT NOT NULL,              -- OSIS code (Gen, Dan, 2Kgs, ...)
+    chapter INTEGER,                 -- NULL for a whole book
+    verse_start INTEGER,             -- NULL for whole chapters
+    chapter_end INTEGER,
+    verse_end INTEGER,
+    pos_start INTEGER NOT NULL,
+    pos_end INTEGER NOT NULL,
+    raw TEXT,                        -- Reference as written in the source
+
+    FOREIGN KEY (event_id) REFERENCES events(id) ON DELETE CASCADE,
+    UNIQUE(event_id, book, pos_start, pos_end)
+);
+
+-- Event cards: people/places of each event, materialized as JSON arrays
+-- (in link order) so a card is one primary-key lookup instead of a
+-- GROUP BY over both link tables; kept up to date by the event_details_*
+-- triggers
+CREATE TABLE IF NOT EXISTS event_details (
+    event_id INTEGER PRIMARY KEY,    -- = events.id
+    people TEXT NOT NULL DEFAULT '[]',
+    places TEXT NOT NULL DEFAULT '[]',
+
+    FOREIGN KEY (event_id) REFERENCES events(id) ON DELETE CASCADE
+);
+
 -- Indexes for performance
+-- Composite indexes follow data/database/workload.sql: the equality column
+-- first, then the range/sort column, so a filtered timeline is one index
+-- range already in year order (scripts/bench_workload.py checks the plans)
 CREATE INDEX IF NOT EXISTS idx_events_year ON events(year);
-CREATE INDEX IF NOT EXISTS idx_events_category ON events(category);
-CREATE INDEX IF NOT EXISTS idx_events_region ON events(region);
-CREATE INDEX IF NOT EXISTS idx_events_importance ON events(importance);
-CREATE INDEX IF NOT EXISTS idx_events_source_page ON events(source_page);
+CREATE INDEX IF NOT EXISTS idx_events_category_year ON events(category, year);
+CREATE INDEX IF NOT EXISTS idx_events_region_year ON events(region, year);
+CREATE INDEX IF NOT EXISTS idx_events_importance_year ON events(importance DESC, year);
+CREATE INDEX IF NOT EXISTS idx_events_source_page ON events(source_page, year);
 
 CREATE INDEX IF NOT EXISTS idx_people_name ON people(name);
 CREATE INDEX IF NOT EXISTS idx_people_birth_year ON people(birth_year);
@@ -83,12 +136,41 @@ CREATE INDEX IF NOT EXISTS idx_event_people_person ON event_people(person_id);
 CREATE INDEX IF NOT EXISTS idx_event_places_event ON event_places(event_id);
 CREATE INDEX IF NOT EXISTS idx_event_places_place ON event_places(place_id);
 
+CREATE INDEX IF NOT EXISTS idx_event_tags_tag ON event_tags(tag_id, event_id);
+CREATE INDEX IF NOT EXISTS idx_bible_refs_passage ON bible_refs(book, pos_start, pos_end);
+
 -- Full-text search (SQLite FTS5)
+-- remove_diacritics 2: "Rim" finds "Řím", "Nabuchodonozor" finds "Nabúchodonozor"
+-- prefix='2 3 4': prefix indexes for search-as-you-type ("kře*")
+-- Ranking weights (title 10x description) are stored as the table's 'rank' config
 CREATE VIRTUAL TABLE IF NOT EXISTS events_fts USING fts5(
     title,
     description,
     content=events,
-    content_rowid=id
+    content_rowid=id,
+    tokenize='unicode61 remove_diacritics 2',
+    prefix='2 3 4'
+);
+
+-- Substring search (trigram): infixes such as "chodonoz" in Nabuchodonozor.
+-- Holds folded text (database.fold_text); filled by database.refresh_trigram
+-- because the people/place columns come from the link tables
+CREATE VIRTUAL TABLE IF NOT EXISTS events_trigram USING fts5(
+    title,
+    description,
+    people,
+    places,
+    tokenize='trigram'
+);
+
+-- Interval index over [year, year_end] for "what was happening in year X"
+-- (R*Tree: overlap queries in logarithmic time; idx_events_year can only
+-- bound the start). Undated events are left out; kept in sync by the
+-- events_span_* triggers
+CREATE VIRTUAL TABLE IF NOT EXISTS events_span USING rtree_i32(
+    id,
+    year_min,
+    year_max
 );
 
 -- Triggers to keep FTS in sync
@@ -97,28 +179,89 @@ CREATE TRIGGER IF NOT EXISTS events_fts_insert AFTER INSERT ON events BEGIN
     VALUES (new.id, new.title, new.description);
 END;
 
+-- (external-content FTS: old tokens are removed with the 'delete' command)
 CREATE TRIGGER IF NOT EXISTS events_fts_delete AFTER DELETE ON events BEGIN
-    DELETE FROM events_fts WHERE rowid = old.id;
+    INSERT INTO events_fts(events_fts, rowid, title, description)
+    VALUES ('delete', old.id, old.title, old.description);
 END;
 
 CREATE TRIGGER IF NOT EXISTS events_fts_update AFTER UPDATE ON events BEGIN
-    DELETE FROM events_fts WHERE rowid = old.id;
+    INSERT INTO events_fts(events_fts, rowid, title, description)
+    VALUES ('delete', old.id, old.title, old.description);
     INSERT INTO events_fts(rowid, title, description)
     VALUES (new.id, new.title, new.description);
 END;
 
+-- Triggers to keep the interval index in sync
+CREATE TRIGGER IF NOT EXISTS events_span_insert AFTER INSERT ON events
+WHEN new.year IS NOT NULL BEGIN
+    INSERT INTO events_span(id, year_min, year_max)
+    VALUES (new.id, MIN(new.year, COALESCE(new.year_end, new.year)),
+            MAX(new.year, COALESCE(new.year_end, new.year)));
+END;
+
+CREATE TRIGGER IF NOT EXISTS events_span_delete AFTER DELETE ON events BEGIN
+    DELETE FROM events_span WHERE id = old.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS events_span_update AFTER UPDATE OF id, year, year_end ON events BEGIN
+    DELETE FROM events_span WHERE id = old.id;
+    INSERT INTO events_span(id, year_min, year_max)
+    SELECT new.id, MIN(new.year, COALESCE(new.year_end, new.year)),
+           MAX(new.year, COALESCE(new.year_end, new.year))
+    WHERE new.year IS NOT NULL;
+END;
+
+-- Triggers to keep event_details in sync
+CREATE TRIGGER IF NOT EXISTS event_details_insert AFTER INSERT ON events BEGIN
+    INSERT OR REPLACE INTO event_details(event_id) VALUES (new.id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS event_details_delete AFTER DELETE ON events BEGIN
+    DELETE FROM event_details WHERE event_id = old.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS event_details_people_insert AFTER INSERT ON event_people BEGIN
+    UPDATE event_details SET people = (
+        SELECT json_group_array(name) FROM (
+            SELECT p.name FROM event_people ep JOIN people p ON p.id = ep.person_id
+            WHERE ep.event_id = new.event_id ORDER BY ep.id))
+    WHERE event_id = new.event_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS event_details_people_delete AFTER DELETE ON event_people BEGIN
+    UPDATE event_details SET people = (
+        SELECT json_group_array(name) FROM (
+            SELECT p.name FROM event_people ep JOIN people p ON p.id = ep.person_id
+            WHERE ep.event_id = old.event_id ORDER BY ep.id))
+    WHERE event_id = old.event_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS event_details_places_insert AFTER INSERT ON event_places BEGIN
+    UPDATE event_details SET places = (
+        SELECT json_group_array(name) FROM (
+            SELECT pl.name FROM event_places epl JOIN places pl ON pl.id = epl.place_id
+            WHERE epl.event_id = new.event_id ORDER BY epl.id))
+    WHERE event_id = new.event_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS event_details_places_delete AFTER DELETE ON event_places BEGIN
+    UPDATE event_details SET places = (
+        SELECT json_group_array(name) FROM (
+            SELECT pl.name FROM event_places epl JOIN places pl ON pl.id = epl.place_id
+            WHERE epl.event_id = old.event_id ORDER BY epl.id))
+    WHERE event_id = old.event_id;
+END;
+
 -- Views for common queries
+-- (reads the materialized event_details; no join fan-out or GROUP BY)
 CREATE VIEW IF NOT EXISTS events_with_details AS
 SELECT
     e.*,
-    GROUP_CONCAT(DISTINCT p.name) as people_names,
-    GROUP_CONCAT(DISTINCT pl.name) as place_names
+    (SELECT group_concat(value) FROM json_each(d.people)) as people_names,
+    (SELECT group_concat(value) FROM json_each(d.places)) as place_names
 FROM events e
-LEFT JOIN event_people ep ON e.id = ep.event_id
-LEFT JOIN people p ON ep.person_id = p.id
-LEFT JOIN event_places epl ON e.id = epl.event_id
-LEFT JOIN places pl ON epl.place_id = pl.id
-GROUP BY e.id;
+LEFT JOIN event_details d ON d.event_id = e.id;
 
 -- Timeline view (chronological order)
 CREATE VIEW IF NOT EXISTS timeline AS
@@ -0,0 +1,110 @@
+-- CMSD query workload
+-- The queries the app and docs/DATABASE_SCHEMA.md run against events, used
+-- by scripts/bench_workload.py to check EXPLAIN QUERY PLAN and latency
+-- whenever the indexes change.
+--
+-- Each query starts with "-- name:"; "-- params:" holds its named
+-- parameters as JSON and "-- source:" where the access pattern comes from.
+-- LIMIT queries end their ORDER BY with id, so every index set returns the
+-- same rows when the other sort keys tie.
+
+-- name: year_exact
+-- source: DATABASE_SCHEMA.md "Události v roce 1492"
+-- params: {"year": 1492}
+SELECT * FROM events WHERE year = :year;
+
+-- name: year_range
+-- source: DATABASE_SCHEMA.md "Události v období"
+-- params: {"start": -1000, "end": -500}
+SELECT * FROM events WHERE year BETWEEN :start AND :end;
+
+-- name: bc_chronology
+-- source: DATABASE_SCHEMA.md "Biblická chronologie (BC)"
+-- params: {}
+SELECT id, year, title FROM events WHERE year < 0 ORDER BY year;
+
+-- name: category_in_range
+-- source: app timeline filtered by category
+-- params: {"category": "religion", "start": 1000, "end": 1600}
+SELECT id, year, title, importance FROM events
+WHERE category = :category AND year BETWEEN :start AND :end
+ORDER BY year;
+
+-- name: region_in_range
+-- source: app timeline filtered by region
+-- params: {"region": "Francie", "start": 1500, "end": 1900}
+SELECT id, year, title, importance FROM events
+WHERE region = :region AND year BETWEEN :start AND :end
+ORDER BY year;
+
+-- name: category_top
+-- source: app category view, most important first
+-- params: {"category": "war", "start": 1000, "end": 2000}
+SELECT id, year, title, importance FROM events
+WHERE category = :category AND year BETWEEN :start AND :end
+ORDER BY importance DESC, year, id
+LIMIT 20;
+
+-- name: region_top
+-- source: app region view, most important first
+-- params: {"region": "Anglie", "start": 1000, "end": 2000}
+SELECT id, year, title, importance FROM events
+WHERE region = :region AND year BETWEEN :start AND :end
+ORDER BY importance DESC, year, id
+LIMIT 20;
+
+-- name: top_in_range
+-- source: app timeline zoomed to a period, most important first
+-- params: {"start": 1300, "end": 1500}
+SELECT id, year, title, importance FROM events
+WHERE year BETWEEN :start AND :end
+ORDER BY importance DESC, year, id
+LIMIT 20;
+
+-- name: top_overall
+-- source: app start page
+-- params: {}
+SELECT id, year, title, importance FROM events
+ORDER BY importance DESC, year, id
+LIMIT 50;
+
+-- name: most_important
+-- source: DATABASE_SCHEMA.md "Nejdůležitější události"
+-- params: {"importance": 5}
+SELECT year, title, importance FROM events
+WHERE importance >= :importance
+ORDER BY year;
+
+-- name: category_counts
+-- source: DATABASE_SCHEMA.md "Počet událostí podle kategorie"
+-- params: {}
+SELECT category, COUNT(*) AS count FROM events
+GROUP BY category
+ORDER BY count DESC;
+
+-- name: region_counts_in_range
+-- source: app map legend for a period
+-- params: {"start": 1500, "end": 1700}
+SELECT region, COUNT(*) AS count FROM events
+WHERE year BETWEEN :start AND :end
+GROUP BY region
+ORDER BY count DESC;
+
+-- name: timeline_coverage
+-- source: DATABASE_SCHEMA.md "Timeline coverage"
+-- params: {}
+SELECT MIN(year) AS earliest_event, MAX(year) AS latest_event, COUNT(*) AS total_events FROM events;
+
+-- name: page_events
+-- source: app source-page view
+-- params: {"page": "3R"}
+SELECT id, year, title FROM events WHERE source_page = :page ORDER BY year;
+
+-- name: place_events
+-- source: DATABASE_SCHEMA.md "Události spojené s místem"
+-- params: {"place": "Řím"}
+SELECT e.year, e.title, pl.name AS place
+FROM events e
+JOIN event_places epl ON e.id = epl.event_id
+JOIN places pl ON epl.place_id = pl.id
+WHERE pl.name = :place;
@@ -2,7 +2,11 @@
 """Progressive extraction for 6L.pdf with multiple strategies"""
 
 import os
+import sys
 import json
+import time
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, FIRST_COMPLETED, wait
 import fitz
 from PIL import Image
 import io
@@ -16,7 +20,7 @@ model = genai.GenerativeModel('models/gemini-2.5-flash')
 pdf_path = Path("data/raw/pdfs/6L.pdf")
 output_dir = Path("data/processed/gemini_ultra")
 
-def pdf_to_image_bytes(pdf_path: Path, dpi: int = 200, max_size_mb: int = 15) -> bytes:
+def pdf_to_image_bytes(pdf_path: Path, dpi: int = 200, max_size_mb: int = 15, quality: int = 85) -> bytes:
     """Convert PDF to image with specified DPI and compression"""
     doc = fitz.open(str(pdf_path))
     page = doc[0]
@@ -35,8 +39,7 @@ def pdf_to_image_bytes(pdf_path: Path, dpi: int = 200, max_size_mb: int = 15) ->
     if img.mode in ('RGBA', 'LA', 'P'):
         img = img.convert('RGB')
 
-    # Start with quality 85
-    quality = 85
+    # Start with requested quality (85 by default)
     buffer = io.BytesIO()
     img.save(buffer, format='JPEG', quality=quality, optimize=True)
     img_bytes = buffer.getvalue()
@@ -53,7 +56,7 @@ def pdf_to_image_bytes(pdf_path: Path, dpi: int = 200, max_size_mb: int = 15) ->
     print(f"  Image: {len(img_bytes)/1024/1024:.2f} MB (quality={quality}, dpi={dpi})")
     return img_bytes
 
-def extract_with_gemini(image_bytes: bytes, pdf_name: str) -> list:
+def extract_with_gemini(image_bytes: bytes, pdf_name: str, raw_name: str = "6L_raw_attempt.txt") -> list:
     """Extract using Gemini"""
 
     prompt = f"""Analyzuješ HUSTOU českou historickou infografiku/časovou osu.
@@ -121,7 +124,7 @@ Vrať POUZE JSON array (bez markdown):"""
     except json.JSONDecodeError as e:
         print(f"  [JSON ERROR] {e}")
         # Save raw response
-        raw_file = output_dir / f"6L_raw_attempt.txt"
+        raw_file = output_dir / raw_name
         with open(raw_file, "w", encoding="utf-8") as f:
             f.write(response_text)
         raise
@@ -144,12 +147,123 @@ def try_extraction_strategy(dpi: int, attempt: int) -> list:
         print(f"  ✗ FAILED: {e}")
         return None
 
-def main():
+# Variants raced against each other: (dpi, jpeg quality)
+RACE_VARIANTS = [
+    (180, 85),
+    (150, 85),
+    (120, 80),
+    (100, 75),
+]
+
+
+def render_variant(dpi: int, quality: int) -> bytes:
+    """Render one variant (runs in a worker process - PyMuPDF is not thread-safe)"""
+    return pdf_to_image_bytes(pdf_path, dpi=dpi, max_size_mb=15, quality=quality)
+
+
+def race_strategies(variants=RACE_VARIANTS, hedge_delay: float = 0.0, settle: float = 0.0):
+    """Race all variants in parallel and keep the first valid, most complete result
+
+    All variants are rendered concurrently. With hedge_delay > 0 the API
+    calls are staggered: variant N is only submitted after N * hedge_delay
+    seconds, and never once a winner exists. After the first valid result,
+    results arriving within `settle` seconds may still replace it if they
+    contain more events. Everything else is cancelled.
+
+    Returns (events, (dpi, quality)) or (None, None).
+    """
+    print(f"\n{'='*70}")
+    print(f"RACE: {len(variants)} variants, hedge={hedge_delay}s, settle={settle}s")
+    print('='*70)
+
+    stop = threading.Event()
+    started = time.time()
+
+    def submit(index: int, image_future) -> list:
+        # Hedged submission - wait our turn unless someone already won
+        if hedge_delay > 0 and stop.wait(index * hedge_delay):
+            return None
+        img_bytes = image_future.result()
+        if stop.is_set():
+            return None
+        dpi, quality = variants[index]
+        raw_name = f"6L_raw_dpi{dpi}_q{quality}.txt"
+        events = extract_with_gemini(img_bytes, "6L", raw_name=raw_name)
+        print(f"  [DONE] DPI {dpi} q{quality}: {len(events)} events ({time.time() - started:.1f}s)")
+        return events
+
+    renderers = ProcessPoolExecutor(max_workers=len(variants))
+    callers = ThreadPoolExecutor(max_workers=len(variants))
+    try:
+        images = [renderers.submit(render_variant, dpi, q) for dpi, q in variants]
+        pending = {callers.submit(submit, i, img): variants[i] for i, img in enumerate(images)}
+
+        best, best_variant = None, None
+        deadline = None
+
+        while pending:
+            timeout = None if deadline is None else max(0.0, deadline - time.time())
+            done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            if not done:
+                break  # settle window expired
+
+            for future in done:
+                variant = pending.pop(future)
+                try:
+                    events = future.result()
+                except Exception as e:
+                    print(f"  [FAILED] DPI {variant[0]} q{variant[1]}: {e}")
+                    continue
+
+                if not events:
+                    continue
+                if best is None or len(events) > len(best):
+                    best, best_variant = events, variant
+                if deadline is None:
+                    deadline = time.time() + settle
+                    stop.set()
+
+        return best, best_variant
+
+    finally:
+        stop.set()
+        # Drop everything not yet running; in-flight API calls cannot be
+        # aborted, their results are simply discarded
+        callers.shutdown(wait=False, cancel_futures=True)
+        renderers.shutdown(wait=False, cancel_futures=True)
+
+
+def save_events(events: list, label: str):
+    """Save 6L events and print summary"""
+    output_file = output_dir / "6L_gemini.json"
+    with open(output_file, "w", encoding="utf-8") as f:
+        json.dump(events, f, ensure_ascii=False, indent=2)
+
+    print(f"\n{'='*70}")
+    print(f"SUCCESS! Extracted {len(events)} events from 6L.pdf")
+    print(f"Strategy that worked: {label}")
+    print(f"Saved to: {output_file}")
+    print('='*70)
+
+
+def main(race: bool = False, hedge_delay: float = 0.0, settle: float = 0.0):
     """Progressive extraction strategy"""
     print("="*70)
     print("PROGRESSIVE EXTRACTION: 6L.pdf")
     print("="*70)
     print(f"File size: 41.9 MB (largest PDF)")
+
+    if race:
+        print(f"Strategy: Race all DPI variants in parallel\n")
+        events, variant = race_strategies(hedge_delay=hedge_delay, settle=settle)
+        if events:
+            save_events(events, f"DPI {variant[0]}, JPEG quality {variant[1]}")
+            return events
+        print(f"\n{'='*70}")
+        print("ALL STRATEGIES FAILED")
+        print('='*70)
+        return None
+
     print(f"Strategy: Try decreasing DPI until success\n")
 
     strategies = [
@@ -165,16 +279,7 @@ def main():
         events = try_extraction_strategy(dpi, attempt)
 
         if events:
-            # Save
-            output_file = output_dir / "6L_gemini.json"
-            with open(output_file, "w", encoding="utf-8") as f:
-                json.dump(events, f, ensure_ascii=False, indent=2)
-
-            print(f"\n{'='*70}")
-            print(f"SUCCESS! Extracted {len(events)} events from 6L.pdf")
-            print(f"Strategy that worked: DPI {dpi}")
-            print(f"Saved to: {output_file}")
-            print('='*70)
+            save_events(events, f"DPI {dpi}")
             return events
 
     print(f"\n{'='*70}")
@@ -184,7 +289,17 @@ def main():
     return None
 
 if __name__ == "__main__":
-    result = main()
+    # Usage: python extract_6l_progressive.py [--race] [--hedge=SECONDS] [--settle=SECONDS]
+    race = "--race" in sys.argv
+    hedge_delay = 0.0
+    settle = 0.0
+    for arg in sys.argv[1:]:
+        if arg.startswith("--hedge="):
+            hedge_delay = float(arg.split("=", 1)[1])
+        elif arg.startswith("--settle="):
+            settle = float(arg.split("=", 1)[1])
+
+    result = main(race=race, hedge_delay=hedge_delay, settle=settle)
     if not result:
         print("\nNext steps:")
         print("1. Try splitting PDF into 4 quadrants")
@@ -1,10 +1,13 @@
 #!/usr/bin/env python3
 """Fix broken JSON from 6L extraction"""
 
+import sys
 import json
-import re
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).parent / "scripts"))
+from json_salvage import salvage_text
+
 input_file = Path("data/processed/gemini_ultra/6L_raw_attempt.txt")
 output_file = Path("data/processed/gemini_ultra/6L_gemini.json")
 
@@ -16,55 +19,27 @@ with open(input_file, 'r', encoding='utf-8') as f:
 print(f"Raw text length: {len(raw_text)} chars")
 print(f"Lines: {len(raw_text.splitlines())}")
 
-# Try 1: Fix unterminated strings and add closing bracket
-attempts = [
-    # Just add closing bracket
-    lambda t: t + "]" if not t.endswith("]") else t,
-
-    # Remove incomplete last object and close
-    lambda t: re.sub(r',\s*\{[^}]*$', '\n]', t),
-
-    # Find last complete object and close there
-    lambda t: t[:t.rfind('}')+1] + '\n]' if '}' in t else t,
-]
-
-for i, fix_func in enumerate(attempts, 1):
-    try:
-        print(f"\nAttempt {i}...")
-        fixed_text = fix_func(raw_text)
-
-        # Try to parse
-        events = json.loads(fixed_text)
-
-        print(f"SUCCESS! Parsed {len(events)} events")
-
-        # Validate events
-        valid_events = []
-        for event in events:
-            if isinstance(event, dict) and event.get('year') is not None:
-                valid_events.append(event)
-
-        print(f"Valid events: {len(valid_events)}")
+events, stats = salvage_text(raw_text)
 
-        # Save
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(valid_events, f, ensure_ascii=False, indent=2)
+if events:
+    print(f"SUCCESS! Recovered {len(events)} complete events")
+    for key, value in stats.items():
+        if value:
+            print(f"  {key}: {value}")
 
-        print(f"Saved to: {output_file}")
-        print(f"\nSample events:")
-        for event in valid_events[:3]:
-            print(f"  - {event.get('year')}: {event.get('title')}")
+    # Validate events
+    valid_events = [event for event in events if isinstance(event, dict) and event.get('year') is not None]
+    print(f"Valid events: {len(valid_events)}")
 
-        break
+    with open(output_file, 'w', encoding='utf-8') as f:
+        json.dump(valid_events, f, ensure_ascii=False, indent=2)
 
-    except json.JSONDecodeError as e:
-        print(f"  Failed: {e}")
-        continue
-    except Exception as e:
-        print(f"  Error: {e}")
-        continue
+    print(f"Saved to: {output_file}")
+    print(f"\nSample events:")
+    for event in valid_events[:3]:
+        print(f"  - {event.get('year')}: {event.get('title')}")
 else:
-    print("\nAll fix attempts failed. Manual intervention needed.")
+    print("\nNo complete events found. Manual intervention needed.")
 
     # Show last part of file
     print("\nLast 500 chars:")
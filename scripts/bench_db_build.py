@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+CMSD - Benchmark: index/FTS build order of bulk_load_database
+  eager     full schema first; every row maintains 13 indexes and fires the FTS trigger
+  deferred  bare tables, load, then indexes + one FTS 'rebuild' + optimize + ANALYZE
+
+Sizes default to 10x and 100x the real dataset.
+
+Usage:
+    python scripts/bench_db_build.py
+    python scripts/bench_db_build.py --sizes 23000 230000 2300000
+    python scripts/bench_db_build.py --generated
+    python scripts/bench_db_build.py --input data/synthetic/cmsd_230600_seed42.jsonl --sizes 230600
+"""
+
+import io
+import sys
+import time
+import tempfile
+import contextlib
+from pathlib import Path
+from typing import List, Dict, Any, Optional
+
+from bench_fuzzy_candidates import load_real_events, load_dataset, bench_events
+from database import bulk_load_database
+from validate_events import validate_events
+
+
+def timed_build(events, db_path: Path, deferred: bool) -> float:
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        bulk_load_database(events, db_path=db_path, deferred=deferred)
+    return time.perf_counter() - started
+
+
+def run(sizes: List[int] = None, generated: bool = False,
+        dataset: Optional[List[Dict[str, Any]]] = None):
+    real = load_real_events()
+    print(f"[LOAD] {len(real)} real events")
+    if not sizes:
+        sizes = [10 * len(real), 100 * len(real)]
+    print(f"\n{'Events':>10s} {'Eager s':>9s} {'Deferred s':>11s} {'Speedup':>8s} {'DB MB eager/deferred':>22s}")
+    print('-' * 64)
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in sizes:
+            events = list(validate_events(bench_events(real, size, generated=generated, dataset=dataset)))
+            eager_db, deferred_db = Path(tmp) / "eager.db", Path(tmp) / "deferred.db"
+
+            eager = timed_build(events, eager_db, deferred=False)
+            deferred = timed_build(events, deferred_db, deferred=True)
+            sizes_mb = eager_db.stat().st_size / 2**20, deferred_db.stat().st_size / 2**20
+
+            results.append({'events': size, 'eager_seconds': round(eager, 3), 'deferred_seconds': round(deferred, 3)})
+            print(f"{size:10d} {eager:9.2f} {deferred:11.2f} {eager / deferred:7.1f}x "
+                  f"{sizes_mb[0]:10.1f} / {sizes_mb[1]:.1f}")
+
+    return results
+
+
+if __name__ == "__main__":
+    sizes = None
+    if "--sizes" in sys.argv:
+        sizes = [int(x) for x in sys.argv[sys.argv.index("--sizes") + 1:] if x.isdigit()]
+    dataset = load_dataset(Path(sys.argv[sys.argv.index("--input") + 1])) if "--input" in sys.argv else None
+    run(sizes, generated="--generated" in sys.argv, dataset=dataset)
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+CMSD - Benchmark: incremental populate_database vs bulk_load_database
+Both loaders build a fresh database in a temp directory from the real
+events resampled up to each size (already validated, like in database.py).
+
+Usage:
+    python scripts/bench_db_load.py                          # 2.3k, 20k, 100k
+    python scripts/bench_db_load.py --sizes 100000 1000000 --bulk-only
+    python scripts/bench_db_load.py --generated
+    python scripts/bench_db_load.py --input data/synthetic/cmsd_230600_seed42.jsonl --sizes 230600
+"""
+
+import io
+import sys
+import time
+import tempfile
+import contextlib
+from pathlib import Path
+from typing import List, Dict, Any, Optional
+
+from bench_fuzzy_candidates import load_real_events, load_dataset, bench_events
+from database import populate_database, bulk_load_database
+from validate_events import validate_events
+
+DEFAULT_SIZES = [2300, 20_000, 100_000]
+
+
+def timed_load(loader, events, db_path: Path) -> float:
+    if db_path.exists():
+        db_path.unlink()
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):      # loaders print progress
+        loader(events, db_path=db_path)
+    return time.perf_counter() - started
+
+
+def run(sizes: List[int], bulk_only: bool = False, generated: bool = False,
+        dataset: Optional[List[Dict[str, Any]]] = None):
+    real = load_real_events()
+    print(f"[LOAD] {len(real)} real events")
+    print(f"\n{'Events':>10s} {'Incremental s':>14s} {'Bulk s':>9s} {'Bulk ev/s':>11s} {'Speedup':>8s}")
+    print('-' * 56)
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "bench.db"
+        for size in sizes:
+            events = list(validate_events(bench_events(real, size, generated=generated, dataset=dataset)))
+
+            incremental = None if bulk_only else timed_load(populate_database, events, db_path)
+            bulk = timed_load(bulk_load_database, events, db_path)
+
+            results.append({'events': size, 'incremental_seconds': incremental, 'bulk_seconds': round(bulk, 3)})
+            inc_text = f"{incremental:14.2f}" if incremental is not None else f"{'-':>14s}"
+            speedup = f"{incremental / bulk:7.1f}x" if incremental is not None else f"{'-':>8s}"
+            print(f"{size:10d} {inc_text} {bulk:9.2f} {size / bulk:11.0f} {speedup}")
+
+    return results
+
+
+if __name__ == "__main__":
+    sizes = DEFAULT_SIZES
+    if "--sizes" in sys.argv:
+        sizes = [int(x) for x in sys.argv[sys.argv.index("--sizes") + 1:] if x.isdigit()]
+    dataset = load_dataset(Path(sys.argv[sys.argv.index("--input") + 1])) if "--input" in sys.argv else None
+    run(sizes, bulk_only="--bulk-only" in sys.argv, generated="--generated" in sys.argv, dataset=dataset)
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+CMSD - Benchmark: sync_database vs full rebuild after one page changes
+For each size the database is bulk-built once, then:
+
+  rebuild    bulk_load_database of the modified set
+  no-op      sync_database with the unchanged set (hash comparison only)
+  one page   sync_database after every event of one source page changed
+
+Usage:
+    python scripts/bench_db_sync.py
+    python scripts/bench_db_sync.py --sizes 100000 1000000
+    python scripts/bench_db_sync.py --generated
+    python scripts/bench_db_sync.py --input data/synthetic/cmsd_230600_seed42.jsonl --sizes 230600
+"""
+
+import io
+import sys
+import time
+import tempfile
+import contextlib
+from pathlib import Path
+from typing import List, Dict, Any, Optional
+
+from bench_fuzzy_candidates import load_real_events, load_dataset, bench_events
+from database import bulk_load_database, sync_database
+from validate_events import validate_events
+
+DEFAULT_SIZES = [2300, 100_000]
+
+
+def timed(func, *args) -> tuple:
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = func(*args)
+    return time.perf_counter() - started, result
+
+
+def run(sizes: List[int], generated: bool = False,
+        dataset: Optional[List[Dict[str, Any]]] = None):
+    real = load_real_events()
+    print(f"[LOAD] {len(real)} real events")
+    print(f"\n{'Events':>10s} {'Changed':>8s} {'Rebuild s':>10s} {'No-op s':>9s} {'One page s':>11s}")
+    print('-' * 52)
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "sync.db"
+        for size in sizes:
+            events = list(validate_events(bench_events(real, size, generated=generated, dataset=dataset)))
+            page = events[0]['source_page']
+            modified = [dict(e, description=f"{e.get('description')} (opraveno)") if e['source_page'] == page else e
+                        for e in events]
+
+            timed(bulk_load_database, events, db_path)
+            noop, _ = timed(sync_database, events, db_path)
+            one_page, stats = timed(sync_database, modified, db_path)
+            rebuild, _ = timed(bulk_load_database, modified, db_path)
+
+            results.append({'events': size, 'changed': stats['updated'], 'rebuild_seconds': round(rebuild, 3),
+                            'noop_seconds': round(noop, 3), 'one_page_seconds': round(one_page, 3)})
+            print(f"{size:10d} {stats['updated']:8d} {rebuild:10.2f} {noop:9.2f} {one_page:11.2f}")
+
+    return results
+
+
+if __name__ == "__main__":
+    sizes = DEFAULT_SIZES
+    if "--sizes" in sys.argv:
+        sizes = [int(x) for x in sys.argv[sys.argv.index("--sizes") + 1:] if x.isdigit()]
+    dataset = load_dataset(Path(sys.argv[sys.argv.index("--input") + 1])) if "--input" in sys.argv else None
+    run(sizes, generated="--generated" in sys.argv, dataset=dataset)
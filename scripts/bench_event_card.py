@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+CMSD - Benchmark: event cards from the materialized event_details vs the old view
+Builds a database from the real events resampled to each size and times
+(median of repeated runs):
+
+  card      one event with its people and places, for 200 random ids
+              grouped   old events_with_details (LEFT JOIN people x places, GROUP BY e.id)
+              details   event_search.event_card (primary-key lookups)
+  year      all events of one year with people/place names
+              grouped   old view, WHERE year = X
+              details   events_with_details over event_details
+
+Usage:
+    python scripts/bench_event_card.py
+    python scripts/bench_event_card.py --sizes 100000 1000000
+    python scripts/bench_event_card.py --generated
+    python scripts/bench_event_card.py --input data/synthetic/cmsd_230600_seed42.jsonl --sizes 230600
+"""
+
+import io
+import sys
+import random
+import sqlite3
+import tempfile
+import contextlib
+from pathlib import Path
+from typing import List, Dict, Any, Optional
+
+from bench_fuzzy_candidates import load_real_events, load_dataset, bench_events
+from bench_search import median_ms
+from database import bulk_load_database
+from event_search import event_card
+from validate_events import validate_events
+
+DEFAULT_SIZES = [100_000, 1_000_000]
+CARDS = 200
+YEARS = [-586, 1415, 1939]
+
+# events_with_details as it was before event_details
+GROUPED_VIEW_SQL = """
+    CREATE VIEW events_grouped AS
+    SELECT
+        e.*,
+        GROUP_CONCAT(DISTINCT p.name) as people_names,
+        GROUP_CONCAT(DISTINCT pl.name) as place_names
+    FROM events e
+    LEFT JOIN event_people ep ON e.id = ep.event_id
+    LEFT JOIN people p ON ep.person_id = p.id
+    LEFT JOIN event_places epl ON e.id = epl.event_id
+    LEFT JOIN places pl ON epl.place_id = pl.id
+    GROUP BY e.id
+"""
+
+
+def names(row) -> tuple:
+    """(event id, people, places) with the name lists order-insensitive"""
+    return (row[0],) + tuple(sorted((value or '').split(',')) for value in row[-2:])
+
+
+def run(sizes: List[int], generated: bool = False,
+        dataset: Optional[List[Dict[str, Any]]] = None):
+    real = load_real_events()
+    print(f"[LOAD] {len(real)} real events")
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in sizes:
+            db_path = Path(tmp) / f"card_{size}.db"
+            with contextlib.redirect_stdout(io.StringIO()):
+                events = bench_events(real, size, generated=generated, dataset=dataset)
+                bulk_load_database(list(validate_events(events)), db_path=db_path)
+            conn = sqlite3.connect(db_path)
+            conn.execute(GROUPED_VIEW_SQL)
+            ids = random.Random(42).sample(range(1, conn.execute("SELECT MAX(id) FROM events").fetchone()[0] + 1),
+                                           CARDS)
+            print(f"\n{size} events")
+            print(f"{'Query':>12s} {'grouped ms':>11s} {'details ms':>11s} {'rows':>6s}")
+            print('-' * 44)
+
+            grouped_ms = median_ms(lambda: [conn.execute("SELECT * FROM events_grouped WHERE id = ?",
+                                                         (i,)).fetchone() for i in ids], repeat=3)
+            details_ms = median_ms(lambda: [event_card(conn, i) for i in ids])
+            results.append({'events': size, 'query': f'{CARDS} cards',
+                            'grouped_ms': round(grouped_ms, 2), 'details_ms': round(details_ms, 2)})
+            print(f"{f'{CARDS} cards':>12s} {grouped_ms:11.2f} {details_ms:11.2f} {CARDS:6d}")
+
+            for year in YEARS:
+                grouped = lambda: conn.execute("SELECT * FROM events_grouped WHERE year = ?", (year,)).fetchall()
+                details = lambda: conn.execute("SELECT * FROM events_with_details WHERE year = ?", (year,)).fetchall()
+                assert sorted(map(names, grouped())) == sorted(map(names, details()))
+                grouped_ms = median_ms(grouped, repeat=3)
+                details_ms = median_ms(details)
+                rows = len(details())
+
+                results.append({'events': size, 'query': f'year {year}',
+                                'grouped_ms': round(grouped_ms, 2), 'details_ms': round(details_ms, 2)})
+                print(f"{f'year {year}':>12s} {grouped_ms:11.2f} {details_ms:11.2f} {rows:6d}")
+            conn.close()
+
+    return results
+
+
+if __name__ == "__main__":
+    sizes = DEFAULT_SIZES
+    if "--sizes" in sys.argv:
+        sizes = [int(x) for x in sys.argv[sys.argv.index("--sizes") + 1:] if x.isdigit()]
+    dataset = load_dataset(Path(sys.argv[sys.argv.index("--input") + 1])) if "--input" in sys.argv else None
+    run(sizes, generated="--generated" in sys.argv, dataset=dataset)
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+CMSD - Memory benchmark: event dicts vs event_model.Event
+Resamples the real events up to each size, serializes them to JSONL
+(so every record is parsed fresh, like an extraction or merge input),
+then measures the retained bytes per event with tracemalloc:
+
+  dict    json.loads per line (what the pipeline held before)
+  Event   json.loads -> Event.from_dict (slots, interned strings, tuples)
+
+Usage:
+    python scripts/bench_event_memory.py                        # 10k, 100k, 1M
+    python scripts/bench_event_memory.py --sizes 10000 100000
+    python scripts/bench_event_memory.py --generated
+    python scripts/bench_event_memory.py --input data/synthetic/cmsd_230600_seed42.jsonl --sizes 230600
+"""
+
+import sys
+import json
+import gc
+import time
+import tracemalloc
+from pathlib import Path
+from typing import List, Callable, Dict, Any, Optional
+
+from bench_fuzzy_candidates import load_real_events, load_dataset, bench_events
+from event_model import Event
+
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000]
+
+
+def retained_bytes(lines: List[str], parse: Callable) -> tuple:
+    """(bytes still allocated after parsing all lines, seconds)"""
+    gc.collect()
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    started = time.perf_counter()
+    records = [parse(line) for line in lines]
+    elapsed = time.perf_counter() - started
+    gc.collect()
+    used = tracemalloc.get_traced_memory()[0] - base
+    tracemalloc.stop()
+    del records
+    return used, elapsed
+
+
+def run(sizes: List[int], generated: bool = False,
+        dataset: Optional[List[Dict[str, Any]]] = None):
+    real = load_real_events()
+    print(f"[LOAD] {len(real)} real events")
+    print(f"\n{'Events':>10s} {'dict B/ev':>10s} {'Event B/ev':>11s} {'Saved':>7s} {'dict s':>8s} {'Event s':>8s}")
+    print('-' * 60)
+
+    results = []
+    for size in sizes:
+        events = bench_events(real, size, generated=generated, dataset=dataset)
+        lines = [json.dumps(event, ensure_ascii=False) for event in events]
+
+        dict_bytes, dict_seconds = retained_bytes(lines, json.loads)
+        event_bytes, event_seconds = retained_bytes(lines, lambda line: Event.from_dict(json.loads(line)))
+
+        results.append({'events': size, 'dict_bytes': dict_bytes, 'event_bytes': event_bytes})
+        print(f"{size:10d} {dict_bytes / size:10.0f} {event_bytes / size:11.0f} "
+              f"{1 - event_bytes / dict_bytes:7.0%} {dict_seconds:8.2f} {event_seconds:8.2f}")
+
+    return results
+
+
+if __name__ == "__main__":
+    sizes = DEFAULT_SIZES
+    if "--sizes" in sys.argv:
+        sizes = [int(x) for x in sys.argv[sys.argv.index("--sizes") + 1:] if x.isdigit()]
+    dataset = load_dataset(Path(sys.argv[sys.argv.index("--input") + 1])) if "--input" in sys.argv else None
+    run(sizes, generated="--generated" in sys.argv, dataset=dataset)
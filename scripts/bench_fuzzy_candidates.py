@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+CMSD - Benchmark for year-blocked fuzzy candidate generation
+Scales the real dataset (~2,300 events) up to a synthetic 1M by
+resampling events with jittered years and perturbed titles, and times
+fuzzy_candidates.candidate_pairs at each size. The year jitter grows
+with the size (+-size/100 years, at least +-200) so the synthetic sets
+stay roughly as dense per year window as a 100k set, instead of piling
+~400 copies of every event into the same decade.
+
+Usage:
+    python scripts/bench_fuzzy_candidates.py                     # 2.3k .. 1M
+    python scripts/bench_fuzzy_candidates.py --sizes 2300 10000 100000
+    python scripts/bench_fuzzy_candidates.py --generated      # generated events, no near-duplicates
+    python scripts/bench_fuzzy_candidates.py --input data/synthetic/cmsd_230600_seed42.jsonl --sizes 230600
+
+Every benchmark takes --generated (events drawn from the distributions
+learned by synthetic_events.py instead of resampled real ones) and
+--input <file> (a dataset written by synthetic_events.py --out, JSON,
+JSONL or Parquet, sampled down to each size).
+"""
+
+import sys
+import json
+import time
+import random
+from pathlib import Path
+from typing import List, Dict, Any, Optional
+
+from event_io import iter_events
+from fuzzy_candidates import candidate_pairs, WINDOW_YEARS, THRESHOLD
+from synthetic_events import learn_profile, generate_events
+
+PROJECT_ROOT = Path(__file__).parent.parent
+EVENTS_JSON = PROJECT_ROOT / "data" / "processed" / "final_complete_all_19_pdfs.json"
+GEMINI_DIR = PROJECT_ROOT / "data" / "processed" / "gemini_ultra"
+
+DEFAULT_SIZES = [2300, 10_000, 100_000, 1_000_000]
+
+CZECH = "aábcčdďeéěfghiíjklmnňoópqrřsštťuúůvwxyýzž"
+
+
+def load_real_events() -> List[Dict[str, Any]]:
+    """Merged dataset if present, otherwise the raw per-page Gemini files"""
+    if EVENTS_JSON.exists():
+        with open(EVENTS_JSON, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    events = []
+    for file in sorted(GEMINI_DIR.glob("*_gemini.json")):
+        with open(file, 'r', encoding='utf-8') as f:
+            events.extend(json.load(f))
+    return events
+
+
+def load_dataset(path: Path) -> List[Dict[str, Any]]:
+    """Events from a file written by synthetic_events.py --out"""
+    if path.suffix == '.parquet':
+        from event_parquet import read_events     # optional dependency (pyarrow)
+        return read_events(path)
+    return list(iter_events(path))
+
+
+def perturb(title: str, rng: random.Random) -> str:
+    """One random character edit (substitute / delete / insert)"""
+    if not title:
+        return title
+    pos = rng.randrange(len(title))
+    op = rng.random()
+    if op < 0.4:
+        return title[:pos] + rng.choice(CZECH) + title[pos + 1:]
+    if op < 0.7:
+        return title[:pos] + title[pos + 1:]
+    return title[:pos] + rng.choice(CZECH) + title[pos:]
+
+
+def synthesize(real: List[Dict[str, Any]], size: int, seed: int = 42) -> List[Dict[str, Any]]:
+    """Resample real events up to `size`, jittering years and titles"""
+    rng = random.Random(seed)
+    spread = max(200, size // 100)
+    events = []
+    for i in range(size):
+        base = real[i % len(real)] if i < len(real) else rng.choice(real)
+        event = dict(base)
+        if i >= len(real):
+            event.pop('id', None)       # a copy is a new event, not the same stable ID
+            year = base.get('year')
+            if isinstance(year, int):
+                shift = rng.randint(-spread, spread)
+                event['year'] = year + shift
+                if isinstance(base.get('year_end'), int):
+                    event['year_end'] = base['year_end'] + shift
+            event['title'] = perturb(str(base.get('title') or ''), rng)
+        events.append(event)
+    return events
+
+
+def bench_events(real: List[Dict[str, Any]], size: int, seed: int = 42, generated: bool = False,
+                 dataset: Optional[List[Dict[str, Any]]] = None) -> List[Dict[str, Any]]:
+    """Benchmark input of `size` events: a sample of `dataset` (--input),
+    generate_events() (--generated) or synthesize()"""
+    if dataset is not None:
+        if size > len(dataset):
+            raise ValueError(f"size {size} is larger than the dataset ({len(dataset)} events)")
+        # A sample, not a prefix: generated files are in year order
+        return random.Random(seed).sample(dataset, size) if size < len(dataset) else list(dataset)
+    if generated:
+        return list(generate_events(learn_profile(real), size, seed))
+    return synthesize(real, size, seed)
+
+
+def run(sizes: List[int], window: int = WINDOW_YEARS, threshold: float = THRESHOLD, generated: bool = False,
+        dataset: Optional[List[Dict[str, Any]]] = None):
+    real = load_real_events()
+    print(f"[LOAD] {len(real)} real events")
+    print(f"\n{'Events':>10s} {'Seconds':>9s} {'Pairs':>10s} {'Events/s':>11s}")
+    print('-' * 44)
+
+    results = []
+    for size in sizes:
+        events = bench_events(real, size, generated=generated, dataset=dataset)
+        started = time.perf_counter()
+        rows, _, _ = candidate_pairs(events, window=window, threshold=threshold)
+        elapsed = time.perf_counter() - started
+        results.append({'events': size, 'seconds': round(elapsed, 3), 'pairs': int(len(rows))})
+        print(f"{size:10d} {elapsed:9.2f} {len(rows):10d} {size / elapsed:11.0f}")
+
+    return results
+
+
+if __name__ == "__main__":
+    sizes = DEFAULT_SIZES
+    if "--sizes" in sys.argv:
+        sizes = [int(x) for x in sys.argv[sys.argv.index("--sizes") + 1:] if x.isdigit()]
+    dataset = load_dataset(Path(sys.argv[sys.argv.index("--input") + 1])) if "--input" in sys.argv else None
+    run(sizes, generated="--generated" in sys.argv, dataset=dataset)
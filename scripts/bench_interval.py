@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+CMSD - Benchmark: "what was happening in year X" with the R*Tree vs B-tree
+Builds a database from the real events resampled to each size and times
+the interval-overlap query for years across the timeline (median of
+repeated runs):
+
+  btree     year <= X AND COALESCE(year_end, year) >= X on idx_events_year
+            (can only bound the start, so it walks every event before X)
+  rtree     event_search.events_at over events_span
+
+each for all overlapping events and for the 20 most important (the
+timeline scrubber); both find the same events.
+
+Usage:
+    python scripts/bench_interval.py
+    python scripts/bench_interval.py --sizes 100000 1000000
+    python scripts/bench_interval.py --generated
+    python scripts/bench_interval.py --input data/synthetic/cmsd_230600_seed42.jsonl --sizes 230600
+"""
+
+import io
+import sys
+import sqlite3
+import tempfile
+import contextlib
+from pathlib import Path
+from typing import List, Dict, Any, Optional
+
+from bench_fuzzy_candidates import load_real_events, load_dataset, bench_events
+from bench_search import median_ms
+from database import bulk_load_database
+from event_search import events_at
+from validate_events import validate_events
+
+DEFAULT_SIZES = [100_000, 1_000_000]
+YEARS = [-3000, -586, 30, 800, 1415, 1618, 1939, 2020]
+
+BTREE_SQL = """
+    SELECT id, year, title, source_page FROM events
+    WHERE year <= ? AND COALESCE(year_end, year) >= ?
+    ORDER BY importance DESC, year, id
+    LIMIT ?
+"""
+
+
+def run(sizes: List[int], generated: bool = False,
+        dataset: Optional[List[Dict[str, Any]]] = None):
+    real = load_real_events()
+    print(f"[LOAD] {len(real)} real events")
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in sizes:
+            db_path = Path(tmp) / f"interval_{size}.db"
+            with contextlib.redirect_stdout(io.StringIO()):
+                events = bench_events(real, size, generated=generated, dataset=dataset)
+                bulk_load_database(list(validate_events(events)), db_path=db_path)
+            conn = sqlite3.connect(db_path)
+            print(f"\n{size} events")
+            print(f"{'Year':>7s} {'btree ms':>9s} {'rtree ms':>9s} {'btree top20':>12s} "
+                  f"{'rtree top20':>12s} {'hits':>7s}")
+            print('-' * 62)
+
+            for year in YEARS:
+                row = {'events': size, 'year': year}
+                for limit, suffix in ((-1, ''), (20, '_top20')):
+                    btree = lambda: conn.execute(BTREE_SQL, (year, year, limit)).fetchall()
+                    rtree = lambda: events_at(conn, year, limit)
+                    if limit == -1:
+                        assert sorted(btree()) == sorted(rtree())
+                    row['btree' + suffix + '_ms'] = round(median_ms(btree), 2)
+                    row['rtree' + suffix + '_ms'] = round(median_ms(rtree), 2)
+                row['hits'] = len(events_at(conn, year, limit=None))
+
+                results.append(row)
+                print(f"{year:7d} {row['btree_ms']:9.2f} {row['rtree_ms']:9.2f} {row['btree_top20_ms']:12.2f} "
+                      f"{row['rtree_top20_ms']:12.2f} {row['hits']:7d}")
+            conn.close()
+
+    return results
+
+
+if __name__ == "__main__":
+    sizes = DEFAULT_SIZES
+    if "--sizes" in sys.argv:
+        sizes = [int(x) for x in sys.argv[sys.argv.index("--sizes") + 1:] if x.isdigit()]
+    dataset = load_dataset(Path(sys.argv[sys.argv.index("--input") + 1])) if "--input" in sys.argv else None
+    run(sizes, generated="--generated" in sys.argv, dataset=dataset)
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+CMSD - Latency benchmark for typical Czech search queries
+Builds a database from the real events resampled to each size and times
+(top 20 results, median of repeated runs):
+
+  like      the LIKE '%word%' fallback over title/description
+  plain     FTS5 with the default tokenizer (the old events_fts)
+  czech     events_fts: unicode61 remove_diacritics 2, prefix='2 3 4', BM25 rank
+
+Hit counts are printed too: the plain tokenizer misses folded spellings
+such as "Rim" for "Řím".
+
+Usage:
+    python scripts/bench_search.py
+    python scripts/bench_search.py --sizes 100000 1000000
+    python scripts/bench_search.py --generated
+    python scripts/bench_search.py --input data/synthetic/cmsd_230600_seed42.jsonl --sizes 230600
+"""
+
+import io
+import sys
+import time
+import sqlite3
+import tempfile
+import statistics
+import contextlib
+from pathlib import Path
+from typing import List, Dict, Any, Optional
+
+from bench_fuzzy_candidates import load_real_events, load_dataset, bench_events
+from database import bulk_load_database
+from event_search import fts_query, search
+from validate_events import validate_events
+
+DEFAULT_SIZES = [2300, 100_000]
+QUERIES = ['Řím', 'Rim', 'Nabuchodonozor', 'karel iv', 'kře', 'válka', 'valk', 'Babylon', 'husit']
+REPEAT = 5
+
+
+def median_ms(func, repeat: int = REPEAT) -> float:
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        times.append((time.perf_counter() - started) * 1000)
+    return statistics.median(times)
+
+
+def build(db_path: Path, events) -> sqlite3.Connection:
+    with contextlib.redirect_stdout(io.StringIO()):
+        bulk_load_database(events, db_path=db_path)
+    conn = sqlite3.connect(db_path)
+    conn.execute("""
+        CREATE VIRTUAL TABLE events_fts_plain USING fts5(
+            title, description, content=events, content_rowid=id)
+    """)
+    conn.execute("INSERT INTO events_fts_plain(events_fts_plain) VALUES('rebuild')")
+    conn.commit()
+    return conn
+
+
+def run(sizes: List[int], generated: bool = False,
+        dataset: Optional[List[Dict[str, Any]]] = None):
+    real = load_real_events()
+    print(f"[LOAD] {len(real)} real events")
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in sizes:
+            events = bench_events(real, size, generated=generated, dataset=dataset)
+            conn = build(Path(tmp) / f"search_{size}.db", list(validate_events(events)))
+            print(f"\n{size} events")
+            print(f"{'Query':>16s} {'like ms':>9s} {'plain ms':>9s} {'czech ms':>9s} "
+                  f"{'like hits':>10s} {'plain hits':>11s} {'czech hits':>11s}")
+            print('-' * 82)
+
+            for text in QUERIES:
+                pattern = f"%{text}%"
+                like_sql = "SELECT id FROM events WHERE title LIKE ? OR description LIKE ? LIMIT 20"
+                plain_sql = "SELECT rowid FROM events_fts_plain WHERE events_fts_plain MATCH ? ORDER BY rank LIMIT 20"
+                plain_query = fts_query(text, prefix=False)
+
+                like_ms = median_ms(lambda: conn.execute(like_sql, (pattern, pattern)).fetchall())
+                plain_ms = median_ms(lambda: conn.execute(plain_sql, (plain_query,)).fetchall())
+                czech_ms = median_ms(lambda: search(conn, text))
+
+                hits = [
+                    conn.execute("SELECT COUNT(*) FROM events WHERE title LIKE ? OR description LIKE ?",
+                                 (pattern, pattern)).fetchone()[0],
+                    conn.execute("SELECT COUNT(*) FROM events_fts_plain WHERE events_fts_plain MATCH ?",
+                                 (plain_query,)).fetchone()[0],
+                    conn.execute("SELECT COUNT(*) FROM events_fts WHERE events_fts MATCH ?",
+                                 (fts_query(text),)).fetchone()[0],
+                ]
+                results.append({'events': size, 'query': text, 'like_ms': round(like_ms, 2),
+                                'plain_ms': round(plain_ms, 2), 'czech_ms': round(czech_ms, 2), 'hits': hits})
+                print(f"{text:>16s} {like_ms:9.2f} {plain_ms:9.2f} {czech_ms:9.2f} "
+                      f"{hits[0]:10d} {hits[1]:11d} {hits[2]:11d}")
+            conn.close()
+
+    return results
+
+
+if __name__ == "__main__":
+    sizes = DEFAULT_SIZES
+    if "--sizes" in sys.argv:
+        sizes = [int(x) for x in sys.argv[sys.argv.index("--sizes") + 1:] if x.isdigit()]
+    dataset = load_dataset(Path(sys.argv[sys.argv.index("--input") + 1])) if "--input" in sys.argv else None
+    run(sizes, generated="--generated" in sys.argv, dataset=dataset)
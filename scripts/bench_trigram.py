@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+CMSD - Benchmark: substring search with the trigram index vs LIKE scans
+Builds a database from the real events resampled to each size and times
+infix fragments (top 20, median of repeated runs):
+
+  like      title/description LIKE '%fragment%' over every row
+  trigram   event_search.substring_search (events_trigram, folded text)
+  find      event_search.find (token FTS first, trigram fill-up)
+
+Usage:
+    python scripts/bench_trigram.py
+    python scripts/bench_trigram.py --sizes 100000 1000000
+    python scripts/bench_trigram.py --generated
+    python scripts/bench_trigram.py --input data/synthetic/cmsd_230600_seed42.jsonl --sizes 230600
+"""
+
+import io
+import sys
+import sqlite3
+import tempfile
+import contextlib
+from pathlib import Path
+from typing import List, Dict, Any, Optional
+
+from bench_fuzzy_candidates import load_real_events, load_dataset, bench_events
+from bench_search import median_ms
+from database import bulk_load_database
+from event_search import substring_search, find
+from validate_events import validate_events
+
+DEFAULT_SIZES = [100_000, 1_000_000]
+FRAGMENTS = ['chodonoz', 'Sedmiletá', 'lucembur', 'křesťan', 'babylo', 'revoluc', 'zxqw']
+
+
+def run(sizes: List[int], generated: bool = False,
+        dataset: Optional[List[Dict[str, Any]]] = None):
+    real = load_real_events()
+    print(f"[LOAD] {len(real)} real events")
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in sizes:
+            db_path = Path(tmp) / f"trigram_{size}.db"
+            with contextlib.redirect_stdout(io.StringIO()):
+                events = bench_events(real, size, generated=generated, dataset=dataset)
+                bulk_load_database(list(validate_events(events)), db_path=db_path)
+            conn = sqlite3.connect(db_path)
+            print(f"\n{size} events ({db_path.stat().st_size / 2**20:.0f} MB)")
+            print(f"{'Fragment':>12s} {'like ms':>9s} {'trigram ms':>11s} {'find ms':>9s} {'hits':>6s}")
+            print('-' * 52)
+
+            for fragment in FRAGMENTS:
+                pattern = f"%{fragment}%"
+                like_sql = "SELECT id FROM events WHERE title LIKE ? OR description LIKE ? LIMIT 20"
+                like_ms = median_ms(lambda: conn.execute(like_sql, (pattern, pattern)).fetchall(), repeat=3)
+                trigram_ms = median_ms(lambda: substring_search(conn, fragment))
+                find_ms = median_ms(lambda: find(conn, fragment))
+                hits = len(substring_search(conn, fragment, limit=20))
+
+                results.append({'events': size, 'fragment': fragment, 'like_ms': round(like_ms, 2),
+                                'trigram_ms': round(trigram_ms, 2), 'find_ms': round(find_ms, 2)})
+                print(f"{fragment:>12s} {like_ms:9.2f} {trigram_ms:11.2f} {find_ms:9.2f} {hits:6d}")
+            conn.close()
+
+    return results
+
+
+if __name__ == "__main__":
+    sizes = DEFAULT_SIZES
+    if "--sizes" in sys.argv:
+        sizes = [int(x) for x in sys.argv[sys.argv.index("--sizes") + 1:] if x.isdigit()]
+    dataset = load_dataset(Path(sys.argv[sys.argv.index("--input") + 1])) if "--input" in sys.argv else None
+    run(sizes, generated="--generated" in sys.argv, dataset=dataset)
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+CMSD - Benchmark for batch validation
+Times validate_events.validate_frame (columnar core) and the full
+dict-in/dict-out stream of validate_events on the real events
+resampled up to 1M.
+
+Usage:
+    python scripts/bench_validate.py                         # 2.3k .. 1M
+    python scripts/bench_validate.py --sizes 10000 100000
+    python scripts/bench_validate.py --generated
+    python scripts/bench_validate.py --input data/synthetic/cmsd_230600_seed42.jsonl --sizes 230600
+"""
+
+import sys
+import time
+from pathlib import Path
+from typing import List, Dict, Any, Optional
+
+import pandas as pd
+
+from bench_fuzzy_candidates import load_real_events, load_dataset, bench_events
+from validate_events import validate_frame, validate_events
+
+DEFAULT_SIZES = [2300, 100_000, 1_000_000]
+
+
+def run(sizes: List[int], generated: bool = False,
+        dataset: Optional[List[Dict[str, Any]]] = None):
+    real = load_real_events()
+    print(f"[LOAD] {len(real)} real events")
+    print(f"\n{'Events':>10s} {'Frame s':>9s} {'Frame ev/s':>12s} {'Stream s':>9s} {'Stream ev/s':>12s}")
+    print('-' * 56)
+
+    results = []
+    for size in sizes:
+        events = bench_events(real, size, generated=generated, dataset=dataset)
+        df = pd.DataFrame.from_records(events)
+
+        started = time.perf_counter()
+        validate_frame(df)
+        frame = time.perf_counter() - started
+
+        started = time.perf_counter()
+        for _ in validate_events(events):
+            pass
+        stream = time.perf_counter() - started
+
+        results.append({'events': size, 'frame_seconds': round(frame, 3), 'stream_seconds': round(stream, 3)})
+        print(f"{size:10d} {frame:9.2f} {size / frame:12.0f} {stream:9.2f} {size / stream:12.0f}")
+
+    return results
+
+
+if __name__ == "__main__":
+    sizes = DEFAULT_SIZES
+    if "--sizes" in sys.argv:
+        sizes = [int(x) for x in sys.argv[sys.argv.index("--sizes") + 1:] if x.isdigit()]
+    dataset = load_dataset(Path(sys.argv[sys.argv.index("--input") + 1])) if "--input" in sys.argv else None
+    run(sizes, generated="--generated" in sys.argv, dataset=dataset)
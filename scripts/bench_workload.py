@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+CMSD - Query workload benchmark: EXPLAIN QUERY PLAN and latency per index set
+Runs every query of data/database/workload.sql against the real events
+resampled to each size, once per index set on `events`:
+
+  baseline  the single-column indexes the schema used to have
+  schema    the indexes schema.sql defines now
+
+and prints the plan (SCAN / SEARCH ... USING INDEX / TEMP B-TREE) and the
+median latency of each, so an index change shows up as a plan and a
+number. Both index sets must return the same rows.
+
+Usage:
+    python scripts/bench_workload.py
+    python scripts/bench_workload.py --sizes 100000 1000000
+    python scripts/bench_workload.py --only category_top region_top
+    python scripts/bench_workload.py --generated
+    python scripts/bench_workload.py --input data/synthetic/cmsd_230600_seed42.jsonl --sizes 230600
+"""
+
+import io
+import re
+import sys
+import json
+import sqlite3
+import tempfile
+import itertools
+import contextlib
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from bench_fuzzy_candidates import load_real_events, load_dataset, bench_events
+from bench_search import median_ms
+from database import bulk_load_database, schema_statements, is_deferred
+from validate_events import validate_events
+
+PROJECT_ROOT = Path(__file__).parent.parent
+WORKLOAD_PATH = PROJECT_ROOT / "data" / "database" / "workload.sql"
+
+DEFAULT_SIZES = [100_000, 1_000_000]
+
+BASELINE_INDEXES = [
+    "CREATE INDEX idx_events_year ON events(year)",
+    "CREATE INDEX idx_events_category ON events(category)",
+    "CREATE INDEX idx_events_region ON events(region)",
+    "CREATE INDEX idx_events_importance ON events(importance)",
+    "CREATE INDEX idx_events_source_page ON events(source_page)",
+]
+
+EVENTS_INDEX_RE = re.compile(r'\bON\s+events\s*\(', re.IGNORECASE)
+
+
+def load_workload(path: Path = WORKLOAD_PATH) -> List[Dict[str, Any]]:
+    """[{name, source, params, sql}] from the "-- name:" / "-- params:" annotated file"""
+    queries, current = [], None
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            stripped = line.strip()
+            if stripped.startswith('-- name:'):
+                current = {'name': stripped[len('-- name:'):].strip(), 'source': '', 'params': {}, 'sql': ''}
+                queries.append(current)
+            elif current is None:
+                continue
+            elif stripped.startswith('-- params:'):
+                current['params'] = json.loads(stripped[len('-- params:'):])
+            elif stripped.startswith('-- source:'):
+                current['source'] = stripped[len('-- source:'):].strip()
+            elif not stripped.startswith('--'):
+                current['sql'] += line
+    for query in queries:
+        query['sql'] = query['sql'].strip().rstrip(';')
+    return queries
+
+
+def schema_event_indexes() -> List[str]:
+    return [s for s in schema_statements() if is_deferred(s) and 'INDEX' in s.upper() and EVENTS_INDEX_RE.search(s)]
+
+
+def use_indexes(conn: sqlite3.Connection, statements: List[str]):
+    """Replace the secondary indexes on events (the event_uid key stays) and refresh statistics"""
+    names = [row[0] for row in conn.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'events' "
+        "AND sql IS NOT NULL AND name != 'idx_events_uid'")]
+    for name in names:
+        conn.execute(f"DROP INDEX {name}")
+    for statement in statements:
+        conn.execute(statement)
+    conn.execute("ANALYZE")
+    conn.commit()
+
+
+def query_plan(conn: sqlite3.Connection, query: Dict[str, Any]) -> str:
+    rows = conn.execute("EXPLAIN QUERY PLAN " + query['sql'], query['params']).fetchall()
+    return '; '.join(row[3] for row in rows)
+
+
+def run(sizes: List[int], only: Optional[List[str]] = None, generated: bool = False,
+        dataset: Optional[List[Dict[str, Any]]] = None):
+    workload = [q for q in load_workload() if not only or q['name'] in only]
+    variants = {'baseline': BASELINE_INDEXES, 'schema': schema_event_indexes()}
+    real = load_real_events()
+    print(f"[LOAD] {len(real)} real events, {len(workload)} queries")
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in sizes:
+            db_path = Path(tmp) / f"workload_{size}.db"
+            with contextlib.redirect_stdout(io.StringIO()):
+                events = bench_events(real, size, generated=generated, dataset=dataset)
+                bulk_load_database(list(validate_events(events)), db_path=db_path)
+            conn = sqlite3.connect(db_path)
+
+            measured = {q['name']: {'events': size, 'query': q['name']} for q in workload}
+            answers = {}
+            for variant, statements in variants.items():
+                use_indexes(conn, statements)
+                for query in workload:
+                    fetch = lambda: conn.execute(query['sql'], query['params']).fetchall()
+                    rows = sorted(fetch(), key=repr)
+                    if answers.setdefault(query['name'], rows) != rows:
+                        raise AssertionError(f"{query['name']}: {variant} returned different rows")
+                    row = measured[query['name']]
+                    row[f'{variant}_ms'] = round(median_ms(fetch), 2)
+                    row[f'{variant}_plan'] = query_plan(conn, query)
+                    row['rows'] = len(rows)
+
+            print(f"\n{size} events")
+            print(f"{'Query':>24s} {'baseline ms':>12s} {'schema ms':>10s} {'speedup':>8s} {'rows':>8s}")
+            print('-' * 66)
+            for row in measured.values():
+                speedup = row['baseline_ms'] / max(row['schema_ms'], 0.01)
+                print(f"{row['query']:>24s} {row['baseline_ms']:12.2f} {row['schema_ms']:10.2f} "
+                      f"{speedup:7.1f}x {row['rows']:8d}")
+            print()
+            for row in measured.values():
+                print(f"[PLAN] {row['query']}")
+                print(f"    baseline: {row['baseline_plan']}")
+                print(f"    schema:   {row['schema_plan']}")
+            results.extend(measured.values())
+            conn.close()
+
+    return results
+
+
+if __name__ == "__main__":
+    sizes = DEFAULT_SIZES
+    if "--sizes" in sys.argv:
+        sizes = [int(x) for x in sys.argv[sys.argv.index("--sizes") + 1:] if x.isdigit()]
+    only = None
+    if "--only" in sys.argv:
+        # Names up to the next option, so an --input path is not taken for one
+        only = list(itertools.takewhile(lambda x: not x.startswith('--'), sys.argv[sys.argv.index("--only") + 1:]))
+    dataset = load_dataset(Path(sys.argv[sys.argv.index("--input") + 1])) if "--input" in sys.argv else None
+    run(sizes, only, generated="--generated" in sys.argv, dataset=dataset)
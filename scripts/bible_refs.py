@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+CMSD - Bible reference parser
+Turns the free-form references the models produce ("Da 7,4", "Gn 23, 1-20",
+"Exodus 20:4-6", "2. Petr 3:8", "2Kr 18-19", "Žalmy") into canonical
+passages: OSIS book code plus chapter/verse range.
+
+    parse_ref("Dan 7,4-8")  -> Passage('Dan', 7, 4, 7, 8)
+
+Positions are encoded as chapter * 1000 + verse (verse 0 = start of the
+chapter, 999 = its end), so a passage is one integer interval per book and
+"references overlapping Daniel 7" is an index range seek on
+(book, pos_start, pos_end).
+
+Usage:
+    python scripts/bible_refs.py "Da 7,4" "2Kr 18-19" Genesis
+"""
+
+import re
+import sys
+from typing import NamedTuple, Optional
+
+from event_dedup import normalize_text
+
+VERSE_SPAN = 1000
+WHOLE_CHAPTER_END = VERSE_SPAN - 1
+WHOLE_BOOK = (0, 999 * VERSE_SPAN + WHOLE_CHAPTER_END)
+
+# Czech / Latin / English names and abbreviations -> OSIS code
+# (keys are folded: lower case, no diacritics, no spaces or dots)
+BOOK_ALIASES = {
+    'Gen': ['gn', 'gen', 'genesis', '1mojz', '1mojzisova'],
+    'Exod': ['ex', 'exo', 'exod', 'exodus', '2mojz', '2mojzisova'],
+    'Lev': ['lv', 'lev', 'leviticus', '3mojz', '3mojzisova'],
+    'Num': ['nu', 'nm', 'num', 'numeri', '4mojz', '4mojzisova'],
+    'Deut': ['dt', 'deut', 'deuteronomium', '5mojz', '5mojzisova'],
+    'Josh': ['joz', 'jozue', 'josh', 'joshua'],
+    'Judg': ['sd', 'soud', 'soudcu', 'judg', 'judges'],
+    'Ruth': ['rt', 'ruth', 'rut'],
+    '1Sam': ['1s', '1sam', '1samuel', '1samuelova'],
+    '2Sam': ['2s', '2sam', '2samuel', '2samuelova'],
+    '1Kgs': ['1kr', '1kral', '1kralovska', '1kralove', '1kgs', '1kings'],
+    '2Kgs': ['2kr', '2kral', '2kralovska', '2kralove', '2kgs', '2kings'],
+    '1Chr': ['1pa', '1par', '1paralipomenon', '1letopisu', '1chr'],
+    '2Chr': ['2pa', '2par', '2paralipomenon', '2letopisu', '2chr'],
+    'Ezra': ['ezd', 'ezdras', 'ezra'],
+    'Neh': ['neh', 'nehemjas', 'nehemiah'],
+    'Esth': ['est', 'ester', 'esth', 'esther'],
+    'Job': ['jb', 'job', 'jobova'],
+    'Ps': ['z', 'zl', 'zalm', 'zalmy', 'ps', 'psalm', 'psalms', 'zaltar'],
+    'Prov': ['pr', 'pris', 'prislovi', 'prov', 'proverbs'],
+    'Eccl': ['kaz', 'kazatel', 'eccl', 'ecclesiastes'],
+    'Song': ['pis', 'pisen', 'pisenpisni', 'song'],
+    'Isa': ['iz', 'izaias', 'izajas', 'isa', 'isaiah'],
+    'Jer': ['jr', 'jer', 'jeremjas', 'jeremias', 'jeremiah'],
+    'Lam': ['plac', 'placjeremjase', 'pl', 'lam', 'lamentations'],
+    'Ezek': ['ez', 'ezech', 'ezechiel', 'ezek', 'ezekiel'],
+    'Dan': ['da', 'dan', 'daniel'],
+    'Hos': ['oz', 'ozeas', 'hos', 'hosea'],
+    'Joel': ['jl', 'joel'],
+    'Amos': ['am', 'amos'],
+    'Obad': ['abd', 'abdias', 'obad', 'obadiah'],
+    'Jonah': ['jon', 'jonas', 'jonah'],
+    'Mic': ['mi', 'mich', 'micheas', 'mic', 'micah'],
+    'Nah': ['na', 'nah', 'nahum'],
+    'Hab': ['abk', 'abakuk', 'hab', 'habakkuk'],
+    'Zeph': ['sf', 'sofonjas', 'zeph', 'zephaniah'],
+    'Hag': ['ag', 'ageus', 'aggeus', 'hag', 'haggai'],
+    'Zech': ['za', 'zach', 'zacharias', 'zech', 'zechariah'],
+    'Mal': ['mal', 'malachias', 'malachi'],
+    'Matt': ['mt', 'mat', 'matous', 'matt', 'matthew'],
+    'Mark': ['mk', 'mar', 'marek', 'mark'],
+    'Luke': ['l', 'lk', 'luk', 'lukas', 'luke'],
+    'John': ['j', 'jn', 'jan', 'john'],
+    'Acts': ['sk', 'skutky', 'acts'],
+    'Rom': ['r', 'rim', 'rimanum', 'rom', 'romans'],
+    '1Cor': ['1k', '1kor', '1korintskym', '1cor'],
+    '2Cor': ['2k', '2kor', '2korintskym', '2cor'],
+    'Gal': ['ga', 'gal', 'galatskym', 'galatians'],
+    'Eph': ['ef', 'efezskym', 'eph', 'ephesians'],
+    'Phil': ['fp', 'filipskym', 'phil', 'philippians'],
+    'Col': ['ko', 'kol', 'koloskym', 'col', 'colossians'],
+    '1Thess': ['1te', '1tes', '1tesalonickym', '1thess'],
+    '2Thess': ['2te', '2tes', '2tesalonickym', '2thess'],
+    '1Tim': ['1tm', '1tim', '1timoteovi', '1timothy'],
+    '2Tim': ['2tm', '2tim', '2timoteovi', '2timothy'],
+    'Titus': ['tt', 'tit', 'titovi', 'titus'],
+    'Phlm': ['fm', 'filemonovi', 'phlm', 'philemon'],
+    'Heb': ['zd', 'zid', 'zidum', 'heb', 'hebrews'],
+    'Jas': ['jk', 'jak', 'jakub', 'jakubuv', 'jas', 'james'],
+    '1Pet': ['1p', '1pt', '1petr', '1petruv', '1pet', '1peter'],
+    '2Pet': ['2p', '2pt', '2petr', '2petruv', '2pet', '2peter'],
+    '1John': ['1j', '1jan', '1januv', '1john'],
+    '2John': ['2j', '2jan', '2januv', '2john'],
+    '3John': ['3j', '3jan', '3januv', '3john'],
+    'Jude': ['ju', 'jud', 'juduv', 'jude'],
+    'Rev': ['zj', 'zjev', 'zjeveni', 'apokalypsa', 'rev', 'revelation'],
+}
+BOOKS = {alias: code for code, aliases in BOOK_ALIASES.items() for alias in aliases}
+
+# "<book> [chapter [,: verse]] [- chapter_or_verse [,: verse]]"
+REF_RE = re.compile(r'''
+    ^\s*(?P<book>(?:[1-3]\.?\s*)?[^\W\d_][^\d,:]*?)\.?
+    (?:\s*(?P<ch>\d+)
+        (?:\s*[,:]\s*(?P<v>\d+))?
+        (?:\s*[-–]\s*(?P<a>\d+)(?:\s*[,:]\s*(?P<b>\d+))?)?
+    )?\s*$
+''', re.VERBOSE)
+
+
+class Passage(NamedTuple):
+    book: str
+    chapter: Optional[int]
+    verse_start: Optional[int]
+    chapter_end: Optional[int]
+    verse_end: Optional[int]
+
+    @property
+    def pos_start(self) -> int:
+        if self.chapter is None:
+            return WHOLE_BOOK[0]
+        return self.chapter * VERSE_SPAN + (self.verse_start or 0)
+
+    @property
+    def pos_end(self) -> int:
+        if self.chapter is None:
+            return WHOLE_BOOK[1]
+        if self.verse_end is None:
+            return self.chapter_end * VERSE_SPAN + WHOLE_CHAPTER_END
+        return self.chapter_end * VERSE_SPAN + self.verse_end
+
+
+def book_code(name: str) -> Optional[str]:
+    key = normalize_text(name, remove_diacritics=True).replace(' ', '')
+    return BOOKS.get(key)
+
+
+def parse_ref(ref: str) -> Optional[Passage]:
+    """Canonical passage for one reference string; None if it cannot be read"""
+    if not isinstance(ref, str):
+        return None
+    match = REF_RE.match(ref)
+    if not match:
+        return None
+    book = book_code(match.group('book'))
+    if book is None:
+        return None
+
+    ch, v, a, b = (int(x) if x else None for x in match.group('ch', 'v', 'a', 'b'))
+    if ch is None:
+        return Passage(book, None, None, None, None)
+    if v is None:
+        # "2Kr 18" or chapter range "2Kr 18-19"
+        return Passage(book, ch, None, a or ch, None)
+    if a is None:
+        return Passage(book, ch, v, ch, v)
+    if b is None:
+        # verse range within one chapter: "Gn 23,1-20"
+        return Passage(book, ch, v, ch, max(a, v))
+    # across chapters: "Jan 3,16-4,2"
+    return Passage(book, ch, v, a, b)
+
+
+if __name__ == "__main__":
+    for ref in sys.argv[1:]:
+        passage = parse_ref(ref)
+        if passage is None:
+            print(f"  {ref!r:24s} -> [unparsed]")
+        else:
+            print(f"  {ref!r:24s} -> {passage}  pos {passage.pos_start}..{passage.pos_end}")
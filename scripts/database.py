@@ -4,68 +4,338 @@ Database operations for CMSD Historical Timeline
 Populates SQLite database from extracted JSON events
 """
 
+import sys
 import sqlite3
 import json
+import hashlib
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterable, NamedTuple, Optional, Tuple
 import pandas as pd
 
+from event_io import iter_events
+from event_dedup import event_id, normalize_text
+from bible_refs import Passage, parse_ref
+
 
 PROJECT_ROOT = Path(__file__).parent.parent
 DB_PATH = PROJECT_ROOT / "data" / "database" / "cmsd.db"
 SCHEMA_PATH = PROJECT_ROOT / "data" / "database" / "schema.sql"
 EVENTS_JSON = PROJECT_ROOT / "data" / "processed" / "final_complete_all_19_pdfs.json"
+EVENTS_PARQUET = PROJECT_ROOT / "data" / "processed" / "final_complete_all_19_pdfs.parquet"
 CSV_OUTPUT = PROJECT_ROOT / "data" / "processed"
+REJECTS_JSON = PROJECT_ROOT / "data" / "processed" / "rejected_events.json"
 
 
-def create_database():
-    """Create database and schema"""
-    print("Creating database...")
+# BM25 column weights for events_fts (title, description): ORDER BY rank uses them
+FTS_RANK = 'bm25(10.0, 1.0)'
 
-    # Ensure directory exists
-    DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+# Statements that can wait until the data is loaded (see build_deferred)
+DEFERRED_PREFIXES = ('CREATE INDEX', 'CREATE UNIQUE INDEX', 'CREATE TRIGGER')
 
-    # Read schema
+
+def schema_statements() -> List[str]:
+    """schema.sql split into complete statements (trigger bodies stay whole)"""
     with open(SCHEMA_PATH, 'r', encoding='utf-8') as f:
-        schema_sql = f.read()
+        lines = [line for line in f if not line.lstrip().startswith('--')]
+
+    statements, current = [], ''
+    for line in lines:
+        current += line
+        if sqlite3.complete_statement(current):
+            statements.append(current.strip())
+            current = ''
+    return statements
+
+
+def is_deferred(statement: str) -> bool:
+    return ' '.join(statement.split()).upper().startswith(DEFERRED_PREFIXES)
+
+
+def create_database(db_path: Path = DB_PATH, deferred: bool = False):
+    """Create database and schema
+
+    deferred=True creates only the tables, FTS table and views; secondary
+    indexes and FTS triggers are left for build_deferred() after loading.
+    """
+    print("Creating database...")
+
+    # Ensure directory exists
+    db_path.parent.mkdir(parents=True, exist_ok=True)
 
     # Create database
-    conn = sqlite3.connect(DB_PATH)
+    conn = sqlite3.connect(db_path)
     cursor = conn.cursor()
 
+    # Databases created before stable IDs: add the column before the schema
+    # creates its UNIQUE index
+    columns = [row[1] for row in cursor.execute("PRAGMA table_info(events)")]
+    if columns and 'event_uid' not in columns:
+        cursor.execute("ALTER TABLE events ADD COLUMN event_uid TEXT")
+        cursor.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_events_uid ON events(event_uid)")
+    if columns and 'content_hash' not in columns:
+        cursor.execute("ALTER TABLE events ADD COLUMN content_hash TEXT")
+
+    # Older FTS triggers deleted by rowid, which leaves stale tokens behind
+    # for an external-content table; replace them and rebuild the index once
+    rebuild_fts = False
+    for name, sql in cursor.execute("SELECT name, sql FROM sqlite_master WHERE type = 'trigger'").fetchall():
+        if name.startswith('events_fts_') and 'DELETE FROM events_fts' in sql:
+            cursor.execute(f"DROP TRIGGER {name}")
+            rebuild_fts = True
+
+    # FTS tables from before diacritic folding / prefix indexes are recreated
+    row = cursor.execute("SELECT sql FROM sqlite_master WHERE name = 'events_fts'").fetchone()
+    if row and 'remove_diacritics' not in row[0]:
+        cursor.execute("DROP TABLE events_fts")
+        rebuild_fts = True
+
+    # Databases from before the trigram / interval indexes and tag tables get them filled once
+    def missing(table):
+        return bool(columns) and not cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = ?", (table,)).fetchone()
+    fill_trigram = missing('events_trigram')
+    fill_tags = missing('event_tags')
+    fill_span = missing('events_span')
+    fill_details = missing('event_details')
+
+    # The old events_with_details view grouped the joined link tables per query
+    row = cursor.execute("SELECT sql FROM sqlite_master WHERE name = 'events_with_details'").fetchone()
+    if row and 'GROUP BY' in row[0]:
+        cursor.execute("DROP VIEW events_with_details")
+
+    # Single-column indexes replaced by the composite ones in schema.sql
+    for name in ('idx_events_category', 'idx_events_region', 'idx_events_importance'):
+        cursor.execute(f"DROP INDEX IF EXISTS {name}")
+    row = cursor.execute("SELECT sql FROM sqlite_master WHERE name = 'idx_events_source_page'").fetchone()
+    if row and 'year' not in row[0]:
+        cursor.execute("DROP INDEX idx_events_source_page")
+
     # Execute schema
-    cursor.executescript(schema_sql)
+    for statement in schema_statements():
+        if not (deferred and is_deferred(statement)):
+            cursor.execute(statement)
+    cursor.execute("INSERT INTO events_fts(events_fts, rank) VALUES('rank', ?)", (FTS_RANK,))
+    if rebuild_fts:
+        cursor.execute("INSERT INTO events_fts(events_fts) VALUES('rebuild')")
+    if fill_trigram:
+        refresh_trigram(conn)
+    if fill_tags:
+        backfill_tags_and_refs(conn)
+    if fill_span:
+        cursor.execute(SPAN_SQL)
+    if fill_details:
+        cursor.execute(DETAILS_SQL)
     conn.commit()
 
-    print(f"[OK] Database created: {DB_PATH}")
+    print(f"[OK] Database created: {db_path}")
     return conn
 
 
-def insert_event(cursor: sqlite3.Cursor, event: Dict[str, Any]) -> int:
-    """Insert single event and return its ID"""
-
-    # Convert lists to JSON strings
-    tags_json = json.dumps(event.get('tags', []), ensure_ascii=False)
-    bible_refs_json = json.dumps(event.get('bible_refs', []), ensure_ascii=False)
-
-    cursor.execute("""
-        INSERT INTO events (
-            year, year_end, title, description, category,
-            region, importance, tags, source_page, bible_refs
-        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-    """, (
+# events_span rows for dated events (the events_span_* triggers do the same per row)
+SPAN_SQL = """
+    INSERT INTO events_span (id, year_min, year_max)
+    SELECT id, MIN(year, COALESCE(year_end, year)), MAX(year, COALESCE(year_end, year))
+    FROM events
+    WHERE year IS NOT NULL
+"""
+
+# event_details rows (people/places JSON arrays in link order) for every event;
+# the event_details_* triggers maintain the same per link
+DETAILS_SQL = """
+    INSERT OR REPLACE INTO event_details (event_id, people, places)
+    SELECT
+        e.id,
+        (SELECT json_group_array(name) FROM (
+            SELECT p.name FROM event_people ep JOIN people p ON p.id = ep.person_id
+            WHERE ep.event_id = e.id ORDER BY ep.id)),
+        (SELECT json_group_array(name) FROM (
+            SELECT pl.name FROM event_places epl JOIN places pl ON pl.id = epl.place_id
+            WHERE epl.event_id = e.id ORDER BY epl.id))
+    FROM events e
+"""
+
+
+def build_deferred(conn: sqlite3.Connection):
+    """After a bulk load: secondary indexes, FTS, interval index and event cards in one pass each,
+    then triggers and statistics"""
+    deferred = [s for s in schema_statements() if is_deferred(s)]
+    with conn:
+        for statement in deferred:
+            if not statement.upper().startswith('CREATE TRIGGER'):
+                conn.execute(statement)
+        conn.execute("INSERT INTO events_fts(events_fts) VALUES('rebuild')")
+        conn.execute(SPAN_SQL)
+        conn.execute(DETAILS_SQL)
+        for statement in deferred:
+            if statement.upper().startswith('CREATE TRIGGER'):
+                conn.execute(statement)
+    conn.execute("INSERT INTO events_fts(events_fts) VALUES('optimize')")
+    conn.execute("ANALYZE")
+    conn.commit()
+
+
+# events_trigram holds folded copies (casefold, no diacritics or punctuation)
+# so substring search ignores spelling variants; people/places come from the links
+TRIGRAM_SQL = """
+    INSERT INTO events_trigram (rowid, title, description, people, places)
+    SELECT
+        e.id, fold(e.title), fold(e.description),
+        (SELECT fold(group_concat(name, ' ')) FROM (
+            SELECT p.name FROM event_people ep JOIN people p ON p.id = ep.person_id
+            WHERE ep.event_id = e.id ORDER BY ep.id)),
+        (SELECT fold(group_concat(name, ' ')) FROM (
+            SELECT pl.name FROM event_places epl JOIN places pl ON pl.id = epl.place_id
+            WHERE epl.event_id = e.id ORDER BY epl.id))
+    FROM events e
+"""
+
+
+def fold_text(value: Any) -> str:
+    return normalize_text(value, remove_diacritics=True) if value is not None else ''
+
+
+def refresh_trigram(conn: sqlite3.Connection, ids: Optional[Iterable[int]] = None):
+    """Rebuild the substring index for all events, or only for the given event ids"""
+    conn.create_function('fold', 1, fold_text, deterministic=True)
+    if ids is None:
+        conn.execute("DELETE FROM events_trigram")
+        conn.execute(TRIGRAM_SQL)
+        return
+    # An id can repeat (insert_event returns the existing row for a known event_uid)
+    ids = [(i,) for i in dict.fromkeys(ids)]
+    conn.executemany("DELETE FROM events_trigram WHERE rowid = ?", ids)
+    conn.executemany(TRIGRAM_SQL + " WHERE e.id = ?", ids)
+
+
+# events columns written from an event dict, in prepare_event order
+EVENT_COLUMNS = ('year', 'year_end', 'title', 'description', 'category', 'region',
+                 'importance', 'tags', 'source_page', 'bible_refs', 'content_hash')
+
+INSERT_EVENT_SQL = f"""
+    INSERT INTO events (event_uid, {', '.join(EVENT_COLUMNS)})
+    VALUES ({', '.join('?' * (len(EVENT_COLUMNS) + 1))})
+"""
+
+
+BIBLE_REF_COLUMNS = ('event_id', 'book', 'chapter', 'verse_start', 'chapter_end', 'verse_end',
+                     'pos_start', 'pos_end', 'raw')
+
+INSERT_BIBLE_REF_SQL = f"""
+    INSERT OR IGNORE INTO bible_refs ({', '.join(BIBLE_REF_COLUMNS)})
+    VALUES ({', '.join('?' * len(BIBLE_REF_COLUMNS))})
+"""
+
+
+class PreparedEvent(NamedTuple):
+    uid: str
+    values: tuple                        # EVENT_COLUMNS order, content_hash last
+    people: List[str]
+    places: List[str]
+    tags: List[Tuple[str, str]]          # (key, name)
+    passages: List[Tuple[Passage, str]]  # (parsed, raw reference)
+
+
+def prepare_event(event: Dict[str, Any]) -> Optional[PreparedEvent]:
+    """Row values and link lists for one event, or None if the row would fail the CHECKs
+
+    content_hash covers every stored field including the people/place
+    links, so sync_database can tell changed events apart without reading
+    the rows back.
+    """
+    title = event.get('title')
+    importance = event.get('importance')
+    if importance is None:
+        importance = 3
+    if not title or not (1 <= importance <= 5):
+        return None
+
+    people = _clean_names(event.get('people'))
+    places = _clean_names(event.get('places'))
+    values = (
         event.get('year'),
         event.get('year_end'),
-        event['title'],
+        title,
         event.get('description'),
         event.get('category'),
         event.get('region'),
-        event.get('importance', 3),
-        tags_json,
+        importance,
+        json.dumps(list(event.get('tags') or []), ensure_ascii=False),
         event.get('source_page'),
-        bible_refs_json
-    ))
+        json.dumps(list(event.get('bible_refs') or []), ensure_ascii=False),
+    )
+    content = json.dumps([values, people, places], ensure_ascii=False)
+    content_hash = hashlib.blake2b(content.encode('utf-8'), digest_size=16).hexdigest()
+    return PreparedEvent(event.get('id') or event_id(event), values + (content_hash,), people, places,
+                         _tag_entries(event.get('tags')), _passages(event.get('bible_refs')))
+
+
+def _tag_entries(tags: Any) -> List[Tuple[str, str]]:
+    """(key, name) per distinct tag; "Křesťanství" and "křesťanství" share a key"""
+    entries = {}
+    for name in _clean_names(tags):
+        key = normalize_text(name)
+        if key:
+            entries.setdefault(key, name)
+    return list(entries.items())
+
+
+def _passages(refs: Any) -> List[Tuple[Passage, str]]:
+    """Parsed Bible references (unreadable ones stay only in events.bible_refs)"""
+    passages = {}
+    for raw in _clean_names(refs):
+        passage = parse_ref(raw)
+        if passage is not None:
+            passages.setdefault((passage.book, passage.pos_start, passage.pos_end), (passage, raw))
+    return list(passages.values())
+
+
+def _bible_ref_rows(row_id: int, passages: List[Tuple[Passage, str]]) -> List[tuple]:
+    return [(row_id,) + tuple(passage) + (passage.pos_start, passage.pos_end, raw) for passage, raw in passages]
+
+
+def link_tags_and_refs(conn: sqlite3.Connection, row_id: int, prepared: PreparedEvent, tag_ids: Dict[str, int]):
+    """event_tags and bible_refs rows for one event (idempotent)"""
+    for key, name in prepared.tags:
+        tag_id = tag_ids.get(key)
+        if tag_id is None:
+            tag_id = conn.execute(
+                "INSERT INTO tags (name, key) VALUES (?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET key = excluded.key RETURNING id", (name, key)).fetchone()[0]
+            tag_ids[key] = tag_id
+        conn.execute("INSERT OR IGNORE INTO event_tags (event_id, tag_id) VALUES (?, ?)", (row_id, tag_id))
+    conn.executemany(INSERT_BIBLE_REF_SQL, _bible_ref_rows(row_id, prepared.passages))
+
+
+def backfill_tags_and_refs(conn: sqlite3.Connection):
+    """Fill tags/event_tags/bible_refs from the JSON columns (databases from before these tables)"""
+    tag_ids: Dict[str, int] = {}
+    for row_id, tags, refs in conn.execute("SELECT id, tags, bible_refs FROM events").fetchall():
+        prepared = PreparedEvent(None, (), [], [], _tag_entries(json.loads(tags or '[]')),
+                                 _passages(json.loads(refs or '[]')))
+        link_tags_and_refs(conn, row_id, prepared, tag_ids)
+
+
+def _clean_names(names: Any) -> List[str]:
+    """Stripped, non-empty, unique names in first-seen order"""
+    if not names or isinstance(names, str):
+        return []
+    return list(dict.fromkeys(n.strip() for n in names if isinstance(n, str) and n.strip()))
+
 
+def insert_event(cursor: sqlite3.Cursor, event: Dict[str, Any]) -> int:
+    """Insert single event and return its ID (existing row if the stable ID is known)"""
+
+    prepared = prepare_event(event)
+    if prepared is None:
+        raise ValueError("missing title or importance out of range")
+    event_uid, values = prepared.uid, prepared.values
+
+    cursor.execute("SELECT id FROM events WHERE event_uid = ?", (event_uid,))
+    row = cursor.fetchone()
+    if row:
+        return row[0]
+
+    cursor.execute(INSERT_EVENT_SQL, (event_uid,) + values)
     return cursor.lastrowid
 
 
@@ -93,12 +363,51 @@ def get_or_create_place(cursor: sqlite3.Cursor, name: str) -> int:
     return cursor.lastrowid
 
 
-def populate_database(events: List[Dict[str, Any]]):
-    """Populate database with extracted events"""
-    conn = create_database()
+def load_events(path: Path = None, years=None, pages=None, parquet: bool = False) -> Iterable[Dict[str, Any]]:
+    """Stream canonical events from the merged JSON (default) or, with parquet=True, the Parquet store
+
+    The Parquet file is only an export of the database (--parquet), so it is
+    never picked up on its own: merges into the JSON would be ignored.
+    `years=(from, to)` and `pages=[...]` are pushed down into the Parquet
+    reader (row-group statistics); for JSON they are applied while streaming.
+    """
+    if path is None:
+        path = EVENTS_PARQUET if parquet else EVENTS_JSON
+    print(f"[LOAD] Events from {path.name}")
+
+    if path.suffix == '.parquet':
+        from event_parquet import iter_parquet  # pyarrow is optional
+        return iter_parquet(path, years=years, pages=pages)
+
+    events = iter_events(path)
+    if years is None and not pages:
+        return events
+
+    lo, hi = years if years is not None else (None, None)
+
+    def matches(event):
+        year = event.get('year')
+        if lo is not None and (year is None or year < lo):
+            return False
+        if hi is not None and (year is None or year > hi):
+            return False
+        return not pages or event.get('source_page') in pages
+
+    return (event for event in events if matches(event))
+
+
+def populate_database(events: Iterable[Dict[str, Any]], db_path: Path = DB_PATH):
+    """Populate database with extracted events (any iterable, e.g. streamed from disk)
+
+    Incremental: events already present (same event_uid) are reused. For a
+    full rebuild use bulk_load_database. Runs as one WAL transaction, so it
+    can be applied to the live database.
+    """
+    conn = create_database(db_path)
+    conn.execute("PRAGMA journal_mode = WAL")
     cursor = conn.cursor()
 
-    print(f"\nPopulating database with {len(events)} events...")
+    print(f"\nPopulating database...")
 
     stats = {
         'events': 0,
@@ -107,11 +416,14 @@ def populate_database(events: List[Dict[str, Any]]):
         'relations': 0
     }
 
+    inserted_ids = []
+    tag_ids: Dict[str, int] = {}
     for i, event in enumerate(events, 1):
         try:
             # Insert event
             event_id = insert_event(cursor, event)
             stats['events'] += 1
+            inserted_ids.append(event_id)
 
             # Link people
             for person_name in event.get('people', []):
@@ -137,13 +449,17 @@ def populate_database(events: List[Dict[str, Any]]):
                     """, (event_id, place_id))
                     stats['relations'] += 1
 
+            link_tags_and_refs(cursor, event_id, prepare_event(event), tag_ids)
+
             if i % 50 == 0:
-                print(f"  Processed {i}/{len(events)} events...")
-                conn.commit()
+                print(f"  Processed {i} events...")
 
         except Exception as e:
             print(f"  [ERROR] Inserting event '{event.get('title', 'unknown')}': {e}")
 
+    # Substring index needs the people/place links, so it follows them
+    refresh_trigram(conn, inserted_ids)
+
     # Final commit
     conn.commit()
 
@@ -154,16 +470,224 @@ def populate_database(events: List[Dict[str, Any]]):
     cursor.execute("SELECT COUNT(*) FROM places")
     stats['places'] = cursor.fetchone()[0]
 
+    stats['tags'] = cursor.execute("SELECT COUNT(*) FROM tags").fetchone()[0]
+    stats['bible_refs'] = cursor.execute("SELECT COUNT(*) FROM bible_refs").fetchone()[0]
+
     conn.close()
 
+    print_population_stats(stats)
+    return stats
+
+
+def print_population_stats(stats: Dict[str, int]):
     print(f"\n{'='*60}")
     print(f"DATABASE POPULATION COMPLETE")
     print(f"{'='*60}")
     print(f"Events: {stats['events']}")
     print(f"People: {stats['people']}")
     print(f"Places: {stats['places']}")
+    print(f"Tags: {stats['tags']}")
+    print(f"Bible refs: {stats['bible_refs']}")
     print(f"Relations: {stats['relations']}")
 
+
+def bulk_load_database(events: Iterable[Dict[str, Any]], db_path: Path = DB_PATH,
+                       deferred: bool = True) -> Dict[str, int]:
+    """Full rebuild: load all events into a fresh database in one transaction
+
+    People and places are collected into name -> id dicts and all ids are
+    assigned in Python, so there are no per-row SELECTs or lastrowid round
+    trips; events, entities and link rows go in with executemany. Build-time
+    PRAGMAs (no journal, no fsync, large cache) are safe here because a
+    failed build is simply rerun.
+
+    With deferred=True (default) the rows go into bare tables; indexes and
+    the FTS index are built once afterwards (build_deferred).
+    """
+    if db_path.exists():
+        db_path.unlink()
+    conn = create_database(db_path, deferred=deferred)
+    conn.execute("PRAGMA journal_mode = OFF")
+    conn.execute("PRAGMA synchronous = OFF")
+    conn.execute("PRAGMA cache_size = -262144")     # 256 MB
+    conn.execute("PRAGMA temp_store = MEMORY")
+
+    print(f"\nBulk loading database...")
+
+    event_rows, person_links, place_links, tag_links, ref_rows = [], [], [], [], []
+    people: Dict[str, int] = {}
+    places: Dict[str, int] = {}
+    tags: Dict[str, Tuple[int, str]] = {}     # key -> (id, first-seen spelling)
+    uids = set()
+    skipped = 0
+
+    for event in events:
+        prepared = prepare_event(event)
+        if prepared is None:
+            print(f"  [ERROR] Skipping event '{event.get('title') or 'unknown'}': missing title or importance out of range")
+            skipped += 1
+            continue
+
+        if prepared.uid in uids:
+            continue
+        uids.add(prepared.uid)
+
+        row_id = len(event_rows) + 1
+        event_rows.append((row_id, prepared.uid) + prepared.values)
+
+        for name in prepared.people:
+            person_links.append((row_id, people.setdefault(name, len(people) + 1)))
+        for name in prepared.places:
+            place_links.append((row_id, places.setdefault(name, len(places) + 1)))
+        for key, name in prepared.tags:
+            tag_links.append((row_id, tags.setdefault(key, (len(tags) + 1, name))[0]))
+        ref_rows.extend(_bible_ref_rows(row_id, prepared.passages))
+
+    with conn:
+        conn.executemany(f"""
+            INSERT INTO events (id, event_uid, {', '.join(EVENT_COLUMNS)})
+            VALUES ({', '.join('?' * (len(EVENT_COLUMNS) + 2))})
+        """, event_rows)
+        conn.executemany("INSERT INTO people (id, name) VALUES (?, ?)",
+                         ((i, name) for name, i in people.items()))
+        conn.executemany("INSERT INTO places (id, name) VALUES (?, ?)",
+                         ((i, name) for name, i in places.items()))
+        conn.executemany("INSERT INTO event_people (event_id, person_id) VALUES (?, ?)", person_links)
+        conn.executemany("INSERT INTO event_places (event_id, place_id) VALUES (?, ?)", place_links)
+        conn.executemany("INSERT INTO tags (id, name, key) VALUES (?, ?, ?)",
+                         ((i, name, key) for key, (i, name) in tags.items()))
+        conn.executemany("INSERT INTO event_tags (event_id, tag_id) VALUES (?, ?)", tag_links)
+        conn.executemany(INSERT_BIBLE_REF_SQL, ref_rows)
+        refresh_trigram(conn)
+    if deferred:
+        build_deferred(conn)
+    conn.close()
+
+    stats = {
+        'events': len(event_rows),
+        'people': len(people),
+        'places': len(places),
+        'tags': len(tags),
+        'bible_refs': len(ref_rows),
+        'relations': len(person_links) + len(place_links),
+        'skipped': skipped,
+    }
+    print_population_stats(stats)
+    return stats
+
+
+def _link_entities(conn: sqlite3.Connection, row_id: int, names: List[str], table: str,
+                   link_table: str, link_column: str, cache: Dict[str, int]):
+    for name in names:
+        entity_id = cache.get(name)
+        if entity_id is None:
+            # DO UPDATE (a no-op) instead of DO NOTHING so RETURNING yields the existing id too
+            entity_id = conn.execute(
+                f"INSERT INTO {table} (name) VALUES (?) "
+                f"ON CONFLICT(name) DO UPDATE SET name = excluded.name RETURNING id", (name,)).fetchone()[0]
+            cache[name] = entity_id
+        conn.execute(f"INSERT OR IGNORE INTO {link_table} (event_id, {link_column}) VALUES (?, ?)",
+                     (row_id, entity_id))
+
+
+def _unlink_entities(conn: sqlite3.Connection, row_id: int, touched_people: set, touched_places: set,
+                     touched_tags: set):
+    touched_people.update(r[0] for r in conn.execute(
+        "DELETE FROM event_people WHERE event_id = ? RETURNING person_id", (row_id,)))
+    touched_places.update(r[0] for r in conn.execute(
+        "DELETE FROM event_places WHERE event_id = ? RETURNING place_id", (row_id,)))
+    touched_tags.update(r[0] for r in conn.execute(
+        "DELETE FROM event_tags WHERE event_id = ? RETURNING tag_id", (row_id,)))
+    conn.execute("DELETE FROM bible_refs WHERE event_id = ?", (row_id,))
+
+
+def sync_database(events: Iterable[Dict[str, Any]], db_path: Path = DB_PATH) -> Dict[str, int]:
+    """Bring an existing database in line with the canonical event set
+
+    Events are keyed on event_uid and compared by content_hash, so only new,
+    changed and vanished events are written: INSERT ... ON CONFLICT DO UPDATE
+    for the first two, DELETE for the last, with their people/place links
+    redone and FTS kept in step by the triggers. People, places and tags left
+    without any event are removed. Rerunning with unchanged input writes
+    nothing. All writes are one WAL transaction, so it runs on the live
+    database: readers see the old state until it commits.
+    """
+    conn = create_database(db_path)
+    conn.execute("PRAGMA journal_mode = WAL")
+    print(f"\nSyncing database...")
+
+    existing: Dict[str, Tuple[int, str]] = {}
+    legacy_ids = []                # rows from before stable IDs
+    for uid, row_id, content_hash in conn.execute("SELECT event_uid, id, content_hash FROM events"):
+        if uid is None:
+            legacy_ids.append(row_id)
+        else:
+            existing[uid] = (row_id, content_hash)
+
+    changed = []
+    seen = set()
+    stats = {'added': 0, 'updated': 0, 'deleted': 0, 'unchanged': 0, 'skipped': 0}
+    for event in events:
+        prepared = prepare_event(event)
+        if prepared is None:
+            stats['skipped'] += 1
+            continue
+        if prepared.uid in seen:
+            continue
+        seen.add(prepared.uid)
+
+        old = existing.get(prepared.uid)
+        if old is not None and old[1] == prepared.values[-1]:
+            stats['unchanged'] += 1
+        else:
+            changed.append((prepared, old is not None))
+
+    removed = legacy_ids + [row_id for uid, (row_id, _) in existing.items() if uid not in seen]
+
+    upsert = f"""
+        INSERT INTO events (event_uid, {', '.join(EVENT_COLUMNS)})
+        VALUES ({', '.join('?' * (len(EVENT_COLUMNS) + 1))})
+        ON CONFLICT(event_uid) DO UPDATE SET
+            {', '.join(f'{c} = excluded.{c}' for c in EVENT_COLUMNS)}
+        RETURNING id
+    """
+    touched_people, touched_places, touched_tags = set(), set(), set()
+    touched_events = list(removed)
+    people_ids: Dict[str, int] = {}
+    place_ids: Dict[str, int] = {}
+    tag_ids: Dict[str, int] = {}
+
+    with conn:
+        for row_id in removed:
+            _unlink_entities(conn, row_id, touched_people, touched_places, touched_tags)
+            conn.execute("DELETE FROM events WHERE id = ?", (row_id,))
+        stats['deleted'] = len(removed)
+
+        for prepared, is_update in changed:
+            row_id = conn.execute(upsert, (prepared.uid,) + prepared.values).fetchone()[0]
+            if is_update:
+                _unlink_entities(conn, row_id, touched_people, touched_places, touched_tags)
+                stats['updated'] += 1
+            else:
+                stats['added'] += 1
+            _link_entities(conn, row_id, prepared.people, 'people', 'event_people', 'person_id', people_ids)
+            _link_entities(conn, row_id, prepared.places, 'places', 'event_places', 'place_id', place_ids)
+            link_tags_and_refs(conn, row_id, prepared, tag_ids)
+            touched_events.append(row_id)
+        refresh_trigram(conn, touched_events)
+
+        # Entities that lost their last event
+        for table, link_table, column, ids in (('people', 'event_people', 'person_id', touched_people),
+                                               ('places', 'event_places', 'place_id', touched_places),
+                                               ('tags', 'event_tags', 'tag_id', touched_tags)):
+            conn.executemany(
+                f"DELETE FROM {table} WHERE id = ? AND NOT EXISTS "
+                f"(SELECT 1 FROM {link_table} WHERE {column} = ?)", ((i, i) for i in ids))
+    conn.close()
+
+    stats['events'] = len(seen)
+    print(f"[SYNC] {stats['added']} added, {stats['updated']} updated, {stats['deleted']} deleted, "
+          f"{stats['unchanged']} unchanged, {stats['skipped']} skipped")
     return stats
 
 
@@ -205,19 +729,80 @@ def export_to_csv():
     conn.close()
 
 
+def export_to_parquet(output_file: Path = EVENTS_PARQUET) -> int:
+    """Export events (with their people/places lists) to the Parquet canonical store"""
+    from event_parquet import write_parquet  # pyarrow is optional
+
+    conn = sqlite3.connect(DB_PATH)
+    rows = conn.execute("""
+        SELECT
+            e.event_uid, e.year, e.year_end, e.title, e.description, e.category,
+            e.region, e.importance, e.tags, e.source_page, e.bible_refs, d.people, d.places
+        FROM events e
+        JOIN event_details d ON d.event_id = e.id
+        ORDER BY e.year IS NULL, e.year, e.id
+    """)
+
+    def events():
+        for (uid, year, year_end, title, description, category, region, importance,
+             tags, source_page, bible_refs, people, places) in rows:
+            yield {
+                'id': uid, 'year': year, 'year_end': year_end, 'title': title,
+                'description': description, 'category': category, 'region': region,
+                'importance': importance, 'tags': json.loads(tags or '[]'),
+                'people': json.loads(people), 'places': json.loads(places),
+                'bible_refs': json.loads(bible_refs or '[]'), 'source_page': source_page,
+            }
+
+    count = write_parquet(events(), output_file)
+    conn.close()
+    print(f"[OK] Exported {count} events to {output_file.name}")
+    return count
+
+
 if __name__ == "__main__":
-    # Load extracted events
-    if not EVENTS_JSON.exists():
-        print(f"Error: {EVENTS_JSON} not found. Run extract.py first!")
+    # Load extracted events (merged JSON; --from-parquet reads the Parquet store instead)
+    from_parquet = "--from-parquet" in sys.argv
+    source = EVENTS_PARQUET if from_parquet else EVENTS_JSON
+    if not source.exists():
+        print(f"Error: {source} not found. Run extract.py first!")
         exit(1)
 
-    with open(EVENTS_JSON, 'r', encoding='utf-8') as f:
-        events = json.load(f)
-
-    # Populate database
-    stats = populate_database(events)
+    # Validate/normalize in columnar batches, then populate the database
+    from validate_events import validate_events, print_report
+
+    # Full rebuild by default; --sync applies only the differences,
+    # --incremental only adds new events to the existing database
+    if "--sync" in sys.argv:
+        populate = sync_database
+    elif "--incremental" in sys.argv:
+        populate = populate_database
+    else:
+        populate = bulk_load_database
+
+    rejects, flags = [], {}
+    events = validate_events(load_events(source), rejects=rejects, flags=flags)
+    if populate is bulk_load_database:
+        # Build into a shadow copy and swap it in atomically, so readers of
+        # cmsd.db never see a half-loaded database
+        from db_swap import shadow_build
+        with shadow_build(DB_PATH) as shadow:
+            stats = populate(events, db_path=shadow)
+    else:
+        # Sync / incremental write only the changes, in one WAL transaction on
+        # the live database; copying it into a shadow would cost time
+        # proportional to its size
+        stats = populate(events, db_path=DB_PATH)
+    print_report(stats['events'], rejects, flags)
+
+    with open(REJECTS_JSON, 'w', encoding='utf-8') as f:
+        json.dump(rejects, f, ensure_ascii=False, indent=2)
+    print(f"[SAVED] {REJECTS_JSON.name}")
 
     # Export to CSV
     export_to_csv()
 
+    if "--parquet" in sys.argv:
+        export_to_parquet()
+
     print("\n[OK] Done!")
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+CMSD - Shadow build and atomic swap of the SQLite database
+Rebuilding writers (database.py full rebuild, deduplicate.py) never touch
+the live cmsd.db:
+
+  1. build into cmsd.db.shadow (fresh, or a consistent copy of the live
+     database made with the SQLite backup API)
+  2. PRAGMA integrity_check, ANALYZE, VACUUM on the shadow
+  3. os.replace(shadow, cmsd.db) - atomic on POSIX; open connections keep
+     reading the old file until they reopen
+  4. publish the new generation in cmsd.db.generation (also stored as
+     PRAGMA user_version in the database itself)
+
+Long-lived readers use LiveReader, which compares one small file per call
+and reopens only when the generation changed.
+
+Usage:
+    python scripts/db_swap.py            # print the live generation
+"""
+
+import os
+import sqlite3
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional
+
+PROJECT_ROOT = Path(__file__).parent.parent
+DB_PATH = PROJECT_ROOT / "data" / "database" / "cmsd.db"
+
+SHADOW_SUFFIX = ".shadow"
+GENERATION_SUFFIX = ".generation"
+
+
+def shadow_path(db_path: Path = DB_PATH) -> Path:
+    return db_path.with_name(db_path.name + SHADOW_SUFFIX)
+
+
+def generation_path(db_path: Path = DB_PATH) -> Path:
+    return db_path.with_name(db_path.name + GENERATION_SUFFIX)
+
+
+def read_generation(db_path: Path = DB_PATH) -> int:
+    """Published generation of the live database (0 if never swapped)"""
+    try:
+        return int(generation_path(db_path).read_text().strip() or 0)
+    except (FileNotFoundError, ValueError):
+        return 0
+
+
+def _publish_generation(db_path: Path, generation: int):
+    path = generation_path(db_path)
+    tmp = path.with_name(path.name + '.tmp')
+    tmp.write_text(f"{generation}\n")
+    os.replace(tmp, path)
+
+
+def _fsync(path: Path):
+    with open(path, 'rb') as f:
+        os.fsync(f.fileno())
+
+
+def finalize_and_swap(shadow: Path, db_path: Path = DB_PATH) -> int:
+    """Check, analyze and compact the shadow, then swap it in; returns the new generation"""
+    generation = read_generation(db_path) + 1
+
+    conn = sqlite3.connect(shadow)
+    try:
+        result = [row[0] for row in conn.execute("PRAGMA integrity_check")]
+        if result != ['ok']:
+            raise RuntimeError(f"integrity_check failed on {shadow.name}: {result[:5]}")
+        conn.execute("PRAGMA journal_mode = DELETE")
+        conn.execute("ANALYZE")
+        conn.execute(f"PRAGMA user_version = {generation}")
+        conn.commit()
+        conn.execute("VACUUM")
+    finally:
+        conn.close()
+
+    _fsync(shadow)
+    os.replace(shadow, db_path)
+    _publish_generation(db_path, generation)
+    print(f"[SWAP] {db_path.name} -> generation {generation}")
+    return generation
+
+
+@contextmanager
+def shadow_build(db_path: Path = DB_PATH, copy_existing: bool = False) -> Iterator[Path]:
+    """Yield a shadow path to build into; swapped in on success, removed on failure
+
+    copy_existing=True starts from a snapshot of the live database (for
+    incremental writers); otherwise the shadow starts empty.
+    """
+    shadow = shadow_path(db_path)
+    for stale in (shadow, shadow.with_name(shadow.name + '-journal')):
+        if stale.exists():
+            stale.unlink()
+
+    if copy_existing and db_path.exists():
+        source = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+        target = sqlite3.connect(shadow)
+        source.backup(target)
+        source.close()
+        target.close()
+
+    try:
+        yield shadow
+        finalize_and_swap(shadow, db_path)
+    except BaseException:
+        if shadow.exists():
+            shadow.unlink()
+        raise
+
+
+class LiveReader:
+    """Read-only connection that reopens after a swap
+
+    reader = LiveReader()
+    reader.connection().execute("SELECT ...")     # cheap generation check per call
+    """
+
+    def __init__(self, db_path: Path = DB_PATH):
+        self.db_path = db_path
+        self.generation: Optional[int] = None
+        self.conn: Optional[sqlite3.Connection] = None
+
+    def connection(self) -> sqlite3.Connection:
+        generation = read_generation(self.db_path)
+        if self.conn is None or generation != self.generation:
+            if self.conn is not None:
+                self.conn.close()
+            self.conn = sqlite3.connect(f"file:{self.db_path}?mode=ro", uri=True, check_same_thread=False)
+            self.generation = generation
+        return self.conn
+
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+
+if __name__ == "__main__":
+    print(f"{DB_PATH.name}: generation {read_generation(DB_PATH)}")
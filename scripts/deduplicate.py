@@ -10,6 +10,8 @@ from pathlib import Path
 from typing import List, Dict, Set, Tuple
 import pandas as pd
 
+from db_swap import shadow_build
+
 # Fix Windows encoding for emoji
 if sys.platform == 'win32':
     sys.stdout.reconfigure(encoding='utf-8')
@@ -281,11 +283,13 @@ def main():
         print("🧹 Performing deduplication...")
         print()
 
-        # Remove exact duplicates
-        exact_count = remove_exact_duplicates(DB_PATH, dry_run=False)
+        # Work on a shadow copy; readers keep the old database until the swap
+        with shadow_build(DB_PATH, copy_existing=True) as shadow:
+            # Remove exact duplicates
+            exact_count = remove_exact_duplicates(shadow, dry_run=False)
 
-        # Merge similar events
-        similar_count = merge_similar_events(DB_PATH, dry_run=False)
+            # Merge similar events
+            similar_count = merge_similar_events(shadow, dry_run=False)
 
         # Final stats
         final_count = get_total_count(DB_PATH)
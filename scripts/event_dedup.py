@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+CMSD - Shared event deduplication
+One indexed, streaming dedup engine for all merge scripts.
+
+Events are keyed on a normalized (title, year, source_page) tuple computed
+once per event: NFC normalization, Czech-aware casefolding, collapsed
+whitespace, stripped punctuation and (optionally) stripped diacritics.
+Yearless events are kept (their year key is None). Every dropped event
+is recorded with the reason it was dropped.
+"""
+
+import re
+import hashlib
+import unicodedata
+from collections import Counter
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Tuple, Callable
+
+from event_model import Event
+
+DEFAULT_KEY_FIELDS = ('title', 'year', 'source_page')
+RECORD_TYPES = (dict, Event)
+TEXT_FIELDS = {'title', 'description', 'source_page', 'category', 'region'}
+
+# Drop reasons
+EXACT = 'exact_duplicate'
+CASE = 'case_variant'
+WHITESPACE = 'whitespace_variant'
+PUNCTUATION = 'punctuation_variant'
+DIACRITICS = 'diacritic_variant'
+NORMALIZED = 'normalized_duplicate'
+MISSING_TITLE = 'missing_title'
+NOT_AN_OBJECT = 'not_an_object'
+
+
+# Anything that is not a letter, digit, whitespace or combining mark:
+# punctuation and symbols incl. en dashes, Czech quotes „“ and '_'
+PUNCTUATION_RE = re.compile(r'[^\w\s\u0300-\u036f]|_')
+
+
+def collapse_whitespace(text: str) -> str:
+    return ' '.join(text.split())
+
+
+def strip_punctuation(text: str) -> str:
+    """Replace punctuation/symbols (incl. en dashes, quotes „“) by spaces"""
+    return PUNCTUATION_RE.sub(' ', text)
+
+
+def strip_diacritics(text: str) -> str:
+    """Babylónská říše -> Babylonska rise"""
+    decomposed = unicodedata.normalize('NFD', text)
+    return unicodedata.normalize('NFC', ''.join(c for c in decomposed if not unicodedata.combining(c)))
+
+
+def normalize_text(text: Any, remove_diacritics: bool = False) -> str:
+    """NFC + casefold + punctuation/whitespace folding (+ optional diacritic stripping)
+
+    str.casefold() handles the Czech alphabet (Č/č, Ř/ř, Ů/ů, ...) correctly;
+    the result stays in NFC so 'č' typed as c + U+030C matches precomposed 'č'.
+    """
+    if text is None:
+        return ''
+    if not isinstance(text, str):
+        text = str(text)
+    text = unicodedata.normalize('NFC', text).casefold()
+    text = collapse_whitespace(strip_punctuation(text))
+    if remove_diacritics:
+        text = strip_diacritics(text)
+    return text
+
+
+def normalize_year(value: Any) -> Optional[int]:
+    """Years arrive as ints, floats or strings ("-608"); anything else is None"""
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, int):
+        return value
+    try:
+        return int(float(str(value).strip()))
+    except (ValueError, OverflowError):     # "abc", "inf"
+        return None
+
+
+def make_key_func(fields: Tuple[str, ...] = DEFAULT_KEY_FIELDS, remove_diacritics: bool = False,
+                  compact: bool = False) -> Callable[[Dict[str, Any]], Any]:
+    """Build the normalized dedup key function
+
+    compact=True stores a 16-byte BLAKE2 digest instead of the key tuple,
+    which keeps the index small when deduplicating millions of events.
+    """
+    def key(event: Dict[str, Any]):
+        parts = []
+        for field in fields:
+            value = event.get(field)
+            if field in ('year', 'year_end'):
+                parts.append(normalize_year(value))
+            else:
+                parts.append(normalize_text(value, remove_diacritics))
+        parts = tuple(parts)
+        if compact:
+            return hashlib.blake2b(repr(parts).encode('utf-8'), digest_size=16).digest()
+        return parts
+
+    return key
+
+
+_identity_key = make_key_func()
+
+
+def event_id(event: Dict[str, Any]) -> str:
+    """Stable content ID from the normalized identity fields (title, year, source_page)
+
+    Events that the Deduplicator treats as the same get the same ID in every
+    run, so IDs survive re-extraction, re-merging and database rebuilds.
+    """
+    parts = _identity_key(event)
+    identity = '\x1f'.join('' if part is None else str(part) for part in parts)
+    return hashlib.blake2b(identity.encode('utf-8'), digest_size=8).hexdigest()
+
+
+def with_event_id(event: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy of the event with a fresh 'id' as its first field"""
+    tagged = {'id': event_id(event)}
+    tagged.update((k, v) for k, v in event.items() if k != 'id')
+    return tagged
+
+
+def classify_variant(kept_title: Any, dropped_title: Any) -> str:
+    """Explain why two titles collapsed to the same key"""
+    a = '' if kept_title is None else str(kept_title)
+    b = '' if dropped_title is None else str(dropped_title)
+    if a == b:
+        return EXACT
+    a, b = unicodedata.normalize('NFC', a).casefold(), unicodedata.normalize('NFC', b).casefold()
+    if a == b:
+        return CASE
+    a, b = collapse_whitespace(a), collapse_whitespace(b)
+    if a == b:
+        return WHITESPACE
+    a, b = collapse_whitespace(strip_punctuation(a)), collapse_whitespace(strip_punctuation(b))
+    if a == b:
+        return PUNCTUATION
+    if strip_diacritics(a) == strip_diacritics(b):
+        return DIACRITICS
+    return NORMALIZED
+
+
+class Deduplicator:
+    """Streaming dedup over any number of inputs with a hash index
+
+    Keeps the first occurrence of every key. Memory is one index entry per
+    unique event (plus the drop log when record_drops=True).
+    """
+
+    def __init__(self, fields: Tuple[str, ...] = DEFAULT_KEY_FIELDS, remove_diacritics: bool = False,
+                 compact: bool = False, record_drops: bool = True):
+        self.fields = fields
+        self.key = make_key_func(fields, remove_diacritics, compact)
+        self.index: Dict[Any, Tuple[str, int, Any]] = {}
+        self.reasons = Counter()
+        self.drops: List[Dict[str, Any]] = []
+        self.record_drops = record_drops
+        self.seen = 0
+        self.kept = 0
+
+    def _drop(self, reason: str, event: Any, source: str, position: int, kept: Optional[Tuple] = None):
+        self.reasons[reason] += 1
+        if not self.record_drops:
+            return
+        drop = {
+            'reason': reason,
+            'source': source,
+            'position': position,
+            'title': event.get('title') if isinstance(event, RECORD_TYPES) else None,
+            'year': event.get('year') if isinstance(event, RECORD_TYPES) else None,
+        }
+        if kept is not None:
+            drop['kept_source'], drop['kept_position'], drop['kept_title'] = kept
+        self.drops.append(drop)
+
+    def add(self, event: Any, source: str = '', position: Optional[int] = None) -> bool:
+        """Index one event. Returns True if it is new (kept)"""
+        self.seen += 1
+        if position is None:
+            position = self.seen - 1
+
+        if not isinstance(event, RECORD_TYPES):
+            self._drop(NOT_AN_OBJECT, event, source, position)
+            return False
+
+        title = event.get('title')
+        if title is None or not str(title).strip():
+            self._drop(MISSING_TITLE, event, source, position)
+            return False
+
+        key = self.key(event)
+        kept = self.index.get(key)
+        if kept is not None:
+            self._drop(classify_variant(kept[2], title), event, source, position, kept)
+            return False
+
+        self.index[key] = (source, position, title)
+        self.kept += 1
+        return True
+
+    def filter(self, events: Iterable[Any], source: str = '') -> Iterator[Dict[str, Any]]:
+        """Yield only new events from one input"""
+        for position, event in enumerate(events):
+            if self.add(event, source, position):
+                yield event
+
+    def stream(self, *inputs: Iterable[Any], sources: Optional[List[str]] = None) -> Iterator[Dict[str, Any]]:
+        """Yield unique events across any number of inputs, in input order"""
+        for i, events in enumerate(inputs):
+            source = sources[i] if sources else f"input{i}"
+            for event in self.filter(events, source):
+                yield event
+
+    @property
+    def dropped(self) -> int:
+        return self.seen - self.kept
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            'seen': self.seen,
+            'kept': self.kept,
+            'dropped': self.dropped,
+            'drop_reasons': dict(self.reasons.most_common()),
+        }
+
+
+def deduplicate_events(events: Iterable[Dict[str, Any]], remove_diacritics: bool = False,
+                       dedup: Optional[Deduplicator] = None) -> List[Dict[str, Any]]:
+    """Deduplicate events based on normalized (title, year, source_page)
+
+    Pass your own Deduplicator to read drop reasons afterwards.
+    """
+    if dedup is None:
+        dedup = Deduplicator(remove_diacritics=remove_diacritics)
+    return list(dedup.filter(events))
+
+
+def chronological_key(event: Dict[str, Any]) -> Tuple[int, int]:
+    """Sort key by year; yearless (or unparsable) events go last instead of crashing"""
+    year = normalize_year(event.get('year'))
+    return (1, 0) if year is None else (0, year)
+
+
+def print_drop_summary(dedup: Deduplicator):
+    for reason, count in dedup.reasons.most_common():
+        print(f"  {reason:22s} {count:5d}")
+
+
+if __name__ == "__main__":
+    import sys
+    import json
+    from pathlib import Path
+
+    if len(sys.argv) < 2:
+        print("Usage: python event_dedup.py <events.json> [more.json ...] [--strip-diacritics] [--out FILE]")
+        sys.exit(1)
+
+    args = sys.argv[1:]
+    remove = '--strip-diacritics' in args
+    args = [a for a in args if a != '--strip-diacritics']
+    out = None
+    if '--out' in args:
+        i = args.index('--out')
+        out = Path(args[i + 1])
+        del args[i:i + 2]
+
+    dedup = Deduplicator(remove_diacritics=remove)
+    unique = []
+    for name in args:
+        with open(name, 'r', encoding='utf-8') as f:
+            unique.extend(dedup.filter(json.load(f), source=Path(name).name))
+
+    summary = dedup.summary()
+    print(f"Seen: {summary['seen']}  Kept: {summary['kept']}  Dropped: {summary['dropped']}")
+    print_drop_summary(dedup)
+
+    if out:
+        with open(out, 'w', encoding='utf-8') as f:
+            json.dump(unique, f, ensure_ascii=False, indent=2)
+        drops_file = out.with_name(out.stem + '_drops.json')
+        with open(drops_file, 'w', encoding='utf-8') as f:
+            json.dump(dedup.drops, f, ensure_ascii=False, indent=2)
+        print(f"[SAVED] {out.name}, {drops_file.name}")
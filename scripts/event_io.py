@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+CMSD - Streaming event reader/writer
+Reads one event dict at a time from a JSON array (any indentation) or a
+JSONL file without loading the whole file, and writes events back as
+an indent=2 JSON array (byte-identical to json.dump(..., indent=2)) or
+JSONL, also one event at a time.
+
+    for event in iter_events(path): ...
+    with EventWriter(out_path) as writer:
+        writer.write(event)
+"""
+
+import json
+from pathlib import Path
+from typing import Dict, Any, Iterable, Iterator, Union
+
+from event_model import Event, as_dict
+
+CHUNK_SIZE = 1 << 16
+WHITESPACE = ' \t\r\n'
+DELIMITERS = WHITESPACE + ',]'
+
+_decoder = json.JSONDecoder()
+
+
+def _skip_ws(buffer: str, pos: int) -> int:
+    while pos < len(buffer) and buffer[pos] in WHITESPACE:
+        pos += 1
+    return pos
+
+
+def iter_values(path: Union[str, Path], chunk_size: int = CHUNK_SIZE) -> Iterator[Any]:
+    """Yield the items of a top-level JSON array, or each value of a JSONL /
+    concatenated-JSON file. Memory is one chunk plus the current item."""
+    with open(path, 'r', encoding='utf-8') as f:
+        buffer = ''
+        pos = 0
+        eof = False
+        in_array = None        # unknown until the first non-whitespace char
+
+        def fill() -> bool:
+            nonlocal buffer, pos, eof
+            chunk = f.read(chunk_size)
+            if not chunk:
+                eof = True
+                return False
+            buffer = buffer[pos:] + chunk
+            pos = 0
+            return True
+
+        while True:
+            pos = _skip_ws(buffer, pos)
+            if pos >= len(buffer):
+                if eof or not fill():
+                    break
+                continue
+
+            if in_array is None:
+                in_array = buffer[pos] == '['
+                if in_array:
+                    pos += 1
+                continue
+
+            if in_array and buffer[pos] == ',':
+                pos += 1
+                continue
+            if in_array and buffer[pos] == ']':
+                break
+
+            try:
+                value, end = _decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if eof or not fill():
+                    raise
+                continue
+
+            # A number may continue in the next chunk ("12" | "34", "2." | "5")
+            if not eof and (end == len(buffer) or buffer[end] not in DELIMITERS) and fill():
+                continue
+
+            pos = end
+            yield value
+
+
+def iter_events(path: Union[str, Path], chunk_size: int = CHUNK_SIZE) -> Iterator[Dict[str, Any]]:
+    """Event dicts only; anything else in the array is skipped"""
+    for value in iter_values(path, chunk_size):
+        if isinstance(value, dict):
+            yield value
+
+
+def iter_records(path: Union[str, Path], chunk_size: int = CHUNK_SIZE) -> Iterator[Event]:
+    """Like iter_events, but as compact Event records"""
+    for value in iter_events(path, chunk_size):
+        yield Event.from_dict(value)
+
+
+def count_events(path: Union[str, Path]) -> int:
+    return sum(1 for _ in iter_events(path))
+
+
+class EventWriter:
+    """Streaming writer; JSONL for *.jsonl paths, indent=2 JSON array otherwise"""
+
+    def __init__(self, path: Union[str, Path], jsonl: bool = None):
+        self.path = Path(path)
+        self.jsonl = self.path.suffix == '.jsonl' if jsonl is None else jsonl
+        self.count = 0
+        self._file = None
+
+    def __enter__(self) -> 'EventWriter':
+        self._file = open(self.path, 'w', encoding='utf-8')
+        if not self.jsonl:
+            self._file.write('[')
+        return self
+
+    def write(self, event: Dict[str, Any]):
+        event = as_dict(event)
+        if self.jsonl:
+            self._file.write(json.dumps(event, ensure_ascii=False))
+            self._file.write('\n')
+        else:
+            text = json.dumps(event, ensure_ascii=False, indent=2).replace('\n', '\n  ')
+            self._file.write(',\n  ' if self.count else '\n  ')
+            self._file.write(text)
+        self.count += 1
+
+    def write_all(self, events: Iterable[Dict[str, Any]]) -> int:
+        for event in events:
+            self.write(event)
+        return self.count
+
+    def __exit__(self, exc_type, exc, tb):
+        if not self.jsonl:
+            self._file.write('\n]' if self.count else ']')
+        self._file.close()
+
+
+def write_events(events: Iterable[Dict[str, Any]], path: Union[str, Path], jsonl: bool = None) -> int:
+    """Stream events to `path`; returns the number written"""
+    with EventWriter(path, jsonl) as writer:
+        return writer.write_all(events)
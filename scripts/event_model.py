@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+CMSD - Compact event record
+One slotted dataclass for the whole pipeline instead of 12-13 key dicts:
+
+  - __slots__: no per-instance __dict__
+  - category, region, source_page and list items (tags, people, places,
+    bible_refs) are interned, so "politics" or "Anglie" is stored once
+  - list fields are tuples
+  - the original key order is kept as one shared, interned tuple, so
+    to_dict() round-trips byte-identically (missing keys stay missing)
+  - unknown keys (e.g. 'providers') are kept in `extra`
+
+Event supports get() / [] / items() like a dict, so the dedup key,
+event_id, chronological_key and database.insert_event work on either
+representation.
+"""
+
+import sys
+from dataclasses import dataclass
+from typing import Dict, Any, Iterator, Optional, Tuple
+
+FIELDS = ('id', 'year', 'year_end', 'title', 'description', 'category', 'region',
+          'importance', 'tags', 'people', 'places', 'bible_refs', 'source_page')
+INTERNED_FIELDS = ('category', 'region', 'source_page')
+LIST_FIELDS = ('tags', 'people', 'places', 'bible_refs')
+
+_key_orders: Dict[Tuple[str, ...], Tuple[str, ...]] = {}
+
+
+def _intern(value: Any) -> Any:
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+def _shared_keys(keys: Tuple[str, ...]) -> Tuple[str, ...]:
+    """One tuple object per distinct key order"""
+    return _key_orders.setdefault(keys, keys)
+
+
+@dataclass(slots=True)
+class Event:
+    title: Any = None
+    year: Any = None
+    year_end: Any = None
+    description: Any = None
+    category: Any = None
+    region: Any = None
+    importance: Any = None
+    tags: Any = ()
+    people: Any = ()
+    places: Any = ()
+    bible_refs: Any = ()
+    source_page: Any = None
+    id: Any = None
+    extra: Optional[Dict[str, Any]] = None
+    order: Tuple[str, ...] = ()
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Event':
+        event = cls(order=_shared_keys(tuple(data)))
+        extra = None
+        for key, value in data.items():
+            if key in LIST_FIELDS and isinstance(value, list):
+                value = tuple(_intern(v) for v in value)
+            elif key in INTERNED_FIELDS:
+                value = _intern(value)
+            elif key not in FIELDS:
+                if extra is None:
+                    extra = {}
+                extra[key] = value
+                continue
+            setattr(event, key, value)
+        event.extra = extra
+        return event
+
+    def to_dict(self) -> Dict[str, Any]:
+        result = {}
+        for key in self.order:
+            if key in FIELDS:
+                value = getattr(self, key)
+                result[key] = list(value) if key in LIST_FIELDS and isinstance(value, tuple) else value
+            else:
+                result[key] = self.extra[key]
+        return result
+
+    def items(self) -> Iterator[Tuple[str, Any]]:
+        return iter(self.to_dict().items())
+
+    def get(self, name: str, default: Any = None) -> Any:
+        if name in self.order:
+            return getattr(self, name) if name in FIELDS else self.extra[name]
+        return default
+
+    def __getitem__(self, name: str) -> Any:
+        if name not in self.order:
+            raise KeyError(name)
+        return self.get(name)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.order
+
+    def set(self, name: str, value: Any):
+        """Set a field, appending it to the key order if it is new"""
+        if name not in self.order:
+            self.order = _shared_keys(self.order + (name,))
+        if name in FIELDS:
+            setattr(self, name, value)
+        else:
+            if self.extra is None:
+                self.extra = {}
+            self.extra[name] = value
+
+
+def as_dict(event: Any) -> Dict[str, Any]:
+    return event.to_dict() if isinstance(event, Event) else event
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+CMSD - Columnar canonical event store (Parquet)
+The canonical dataset as one Parquet file instead of a chain of
+pretty-printed final_*.json files:
+
+  category, region, source_page      dictionary-encoded (few distinct values)
+  tags, people, places, bible_refs   list<string> columns
+  year, year_end, importance         integers with row-group min/max stats
+
+Events are written in chronological order in row groups, so filters on
+year (and source_page) are pushed down to the row-group statistics and
+only matching row groups are read.
+
+Requires pyarrow (optional dependency; import this module lazily).
+
+Usage:
+    python scripts/event_parquet.py convert data/processed/final_complete_all_19_pdfs.json [out.parquet]
+    python scripts/event_parquet.py query data/processed/final_complete_all_19_pdfs.parquet --years -1000 0 --page 3R
+"""
+
+import sys
+from pathlib import Path
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Tuple
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from event_dedup import normalize_year, event_id
+
+PROJECT_ROOT = Path(__file__).parent.parent
+EVENTS_PARQUET = PROJECT_ROOT / "data" / "processed" / "final_complete_all_19_pdfs.parquet"
+
+ROW_GROUP_SIZE = 10_000
+DICTIONARY = pa.dictionary(pa.int32(), pa.string())
+STRING_LIST = pa.list_(pa.string())
+
+SCHEMA = pa.schema([
+    ('id', pa.string()),
+    ('year', pa.int32()),
+    ('year_end', pa.int32()),
+    ('title', pa.string()),
+    ('description', pa.string()),
+    ('category', DICTIONARY),
+    ('region', DICTIONARY),
+    ('importance', pa.int8()),
+    ('tags', STRING_LIST),
+    ('people', STRING_LIST),
+    ('places', STRING_LIST),
+    ('bible_refs', STRING_LIST),
+    ('source_page', DICTIONARY),
+])
+
+LIST_COLUMNS = ('tags', 'people', 'places', 'bible_refs')
+INT_COLUMNS = ('year', 'year_end', 'importance')
+
+
+def _text(value: Any) -> Optional[str]:
+    if value is None or value == '':
+        return None
+    return value if isinstance(value, str) else str(value)
+
+
+def _text_list(value: Any) -> List[str]:
+    if not isinstance(value, list):
+        return []
+    return [v if isinstance(v, str) else str(v) for v in value if v is not None]
+
+
+def _batch(events: List[Dict[str, Any]]) -> pa.RecordBatch:
+    columns = {name: [] for name in SCHEMA.names}
+    for event in events:
+        columns['id'].append(event.get('id') or event_id(event))
+        for name in INT_COLUMNS:
+            columns[name].append(normalize_year(event.get(name)))
+        for name in ('title', 'description', 'category', 'region', 'source_page'):
+            columns[name].append(_text(event.get(name)))
+        for name in LIST_COLUMNS:
+            columns[name].append(_text_list(event.get(name)))
+    return pa.RecordBatch.from_arrays(
+        [pa.array(columns[field.name], type=field.type) for field in SCHEMA], schema=SCHEMA)
+
+
+def write_parquet(events: Iterable[Dict[str, Any]], path: Path = EVENTS_PARQUET,
+                  row_group_size: int = ROW_GROUP_SIZE) -> int:
+    """Stream events (ideally chronological) into a Parquet file; returns the row count"""
+    count = 0
+    with pq.ParquetWriter(path, SCHEMA, compression='zstd') as writer:
+        pending = []
+        for event in events:
+            pending.append(event)
+            if len(pending) == row_group_size:
+                writer.write_batch(_batch(pending), row_group_size=row_group_size)
+                count += len(pending)
+                pending = []
+        if pending or count == 0:
+            writer.write_batch(_batch(pending), row_group_size=row_group_size)
+            count += len(pending)
+    return count
+
+
+def build_filters(years: Optional[Tuple[Optional[int], Optional[int]]] = None,
+                  pages: Optional[List[str]] = None) -> Optional[List[Tuple]]:
+    """pyarrow filter list for a year range (inclusive) and/or source pages"""
+    filters = []
+    if years is not None:
+        lo, hi = years
+        if lo is not None:
+            filters.append(('year', '>=', lo))
+        if hi is not None:
+            filters.append(('year', '<=', hi))
+    if pages:
+        filters.append(('source_page', 'in', list(pages)))
+    return filters or None
+
+
+def read_table(path: Path = EVENTS_PARQUET, years=None, pages=None,
+               columns: Optional[List[str]] = None) -> pa.Table:
+    """Read only the row groups (and columns) that can match the filters"""
+    return pq.read_table(path, columns=columns, filters=build_filters(years, pages))
+
+
+def iter_parquet(path: Path = EVENTS_PARQUET, years=None, pages=None,
+                 columns: Optional[List[str]] = None) -> Iterator[Dict[str, Any]]:
+    """Event dicts one at a time, filtered with predicate pushdown"""
+    table = read_table(path, years, pages, columns)
+    for batch in table.to_batches():
+        yield from batch.to_pylist()
+
+
+def read_events(path: Path = EVENTS_PARQUET, years=None, pages=None) -> List[Dict[str, Any]]:
+    return list(iter_parquet(path, years, pages))
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    if not args or args[0] not in ('convert', 'query'):
+        print("Usage: python event_parquet.py convert <events.json|jsonl> [out.parquet]")
+        print("       python event_parquet.py query <events.parquet> [--years FROM TO] [--page 3R ...]")
+        sys.exit(1)
+
+    command = args.pop(0)
+
+    if command == 'convert':
+        from event_io import iter_events
+
+        input_file = Path(args[0])
+        output_file = Path(args[1]) if len(args) > 1 else input_file.with_suffix('.parquet')
+        count = write_parquet(iter_events(input_file), output_file)
+        size_in, size_out = input_file.stat().st_size, output_file.stat().st_size
+        print(f"[SAVED] {output_file.name}: {count} events, "
+              f"{size_out / 1024:.0f} KB (JSON {size_in / 1024:.0f} KB)")
+
+    else:
+        input_file = Path(args.pop(0))
+        years, pages = None, []
+        while args:
+            arg = args.pop(0)
+            if arg == '--years':
+                years = (int(args.pop(0)), int(args.pop(0)))
+            elif arg == '--page':
+                pages.append(args.pop(0))
+
+        table = read_table(input_file, years, pages or None)
+        print(f"[QUERY] {table.num_rows} events")
+        for event in table.slice(0, 20).to_pylist():
+            print(f"  {event['year']}: {event['title']} [{event['source_page']}]")
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+CMSD - Event search over the FTS5 index
+User input becomes a safe FTS5 query: every word is quoted (so "-", ":"
+or "AND" typed by the user are plain text) and the last word gets a `*`
+for search-as-you-type, served by the prefix='2 3 4' indexes. Diacritics
+are folded by the tokenizer on both sides ("Rim" finds "Řím"). Results
+are ordered by the table's stored rank, BM25 with title weighted over
+description (database.FTS_RANK).
+
+find() plans the query over both indexes:
+
+  token    events_fts (word / prefix match, BM25) - always, ranked first
+  trigram  events_trigram (substring anywhere in title, description,
+           people, places; folded) - for fragments of 3+ characters, to
+           fill up the results token search could not find ("chodonoz",
+           "sedmileta"); shorter fragments cannot form a trigram
+
+events_by_tag() and events_by_passage() are index seeks on the normalized
+tags / bible_refs tables ("Dan 7" also finds events citing "Da 7,4-8").
+events_at() / events_between() answer "what was happening in year X" from
+the events_span R*Tree over [year, year_end]. event_card() is the full
+event with its people and places, read from the materialized event_details.
+
+Usage:
+    python scripts/event_search.py Nabuchodonozor
+    python scripts/event_search.py "karel iv" --limit 5
+    python scripts/event_search.py chodonoz --explain
+    python scripts/event_search.py --tag křesťanství
+    python scripts/event_search.py --passage "Dan 7"
+    python scripts/event_search.py --year 1415
+"""
+
+import re
+import sys
+import json
+import sqlite3
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from bible_refs import parse_ref
+from event_dedup import normalize_text
+
+PROJECT_ROOT = Path(__file__).parent.parent
+DB_PATH = PROJECT_ROOT / "data" / "database" / "cmsd.db"
+
+WORD_RE = re.compile(r'\w+')
+TRIGRAM_MIN = 3
+
+
+def fts_query(text: str, prefix: bool = True) -> Optional[str]:
+    """FTS5 MATCH expression for free text; None if there is nothing to search"""
+    words = WORD_RE.findall(text)
+    if not words:
+        return None
+    terms = [f'"{word}"' for word in words]
+    if prefix:
+        terms[-1] += '*'
+    return ' '.join(terms)
+
+
+def search(conn: sqlite3.Connection, text: str, limit: int = 20,
+           prefix: bool = True) -> List[Tuple[int, Optional[int], str, Optional[str]]]:
+    """(id, year, title, source_page) of the best-ranked matches"""
+    query = fts_query(text, prefix)
+    if query is None:
+        return []
+    return conn.execute("""
+        SELECT e.id, e.year, e.title, e.source_page
+        FROM events_fts
+        JOIN events e ON e.id = events_fts.rowid
+        WHERE events_fts MATCH ?
+        ORDER BY rank, e.id
+        LIMIT ?
+    """, (query, limit)).fetchall()
+
+
+def trigram_query(text: str) -> Optional[str]:
+    """Substring MATCH for events_trigram: one folded phrase per 3+ character fragment"""
+    fragments = [f for f in normalize_text(text, remove_diacritics=True).split() if len(f) >= TRIGRAM_MIN]
+    if not fragments:
+        return None
+    return ' '.join(f'"{fragment}"' for fragment in fragments)
+
+
+def plan(text: str) -> List[Tuple[str, str]]:
+    """[(index, MATCH expression)] in the order find() runs them"""
+    steps = []
+    query = fts_query(text)
+    if query is not None:
+        steps.append(('token', query))
+    query = trigram_query(text)
+    if query is not None:
+        steps.append(('trigram', query))
+    return steps
+
+
+def substring_search(conn: sqlite3.Connection, text: str,
+                     limit: int = 20) -> List[Tuple[int, Optional[int], str, Optional[str]]]:
+    """(id, year, title, source_page) of events containing every 3+ character fragment"""
+    query = trigram_query(text)
+    if query is None:
+        return []
+    return conn.execute("""
+        SELECT e.id, e.year, e.title, e.source_page
+        FROM events_trigram
+        JOIN events e ON e.id = events_trigram.rowid
+        WHERE events_trigram MATCH ?
+        ORDER BY e.importance DESC, e.year, e.id
+        LIMIT ?
+    """, (query, limit)).fetchall()
+
+
+def find(conn: sqlite3.Connection, text: str,
+         limit: int = 20) -> List[Tuple[int, Optional[int], str, Optional[str]]]:
+    """Token matches first (ranked), then substring matches up to `limit`"""
+    results = search(conn, text, limit)
+    if len(results) < limit:
+        seen = {row[0] for row in results}
+        for row in substring_search(conn, text, limit + len(results)):
+            if row[0] not in seen:
+                results.append(row)
+                if len(results) == limit:
+                    break
+    return results
+
+
+def events_by_tag(conn: sqlite3.Connection, tag: str,
+                  limit: int = 20) -> List[Tuple[int, Optional[int], str, Optional[str]]]:
+    """(id, year, title, source_page) of events with the tag (case/punctuation-insensitive)"""
+    return conn.execute("""
+        SELECT e.id, e.year, e.title, e.source_page
+        FROM tags t
+        JOIN event_tags et ON et.tag_id = t.id
+        JOIN events e ON e.id = et.event_id
+        WHERE t.key = ?
+        ORDER BY e.year, e.id
+        LIMIT ?
+    """, (normalize_text(tag), limit)).fetchall()
+
+
+def events_by_passage(conn: sqlite3.Connection, ref: str,
+                      limit: int = 20) -> List[Tuple[int, Optional[int], str, Optional[str]]]:
+    """(id, year, title, source_page) of events citing a passage that overlaps `ref`"""
+    passage = parse_ref(ref)
+    if passage is None:
+        return []
+    return conn.execute("""
+        SELECT e.id, e.year, e.title, e.source_page
+        FROM events e
+        WHERE e.id IN (
+            SELECT event_id FROM bible_refs
+            WHERE book = ? AND pos_start <= ? AND pos_end >= ?)
+        ORDER BY e.year, e.id
+        LIMIT ?
+    """, (passage.book, passage.pos_end, passage.pos_start, limit)).fetchall()
+
+
+def events_between(conn: sqlite3.Connection, start: int, end: int,
+                   limit: Optional[int] = 20) -> List[Tuple[int, Optional[int], str, Optional[str]]]:
+    """(id, year, title, source_page) of events whose [year, year_end] overlaps [start, end], most important first"""
+    return conn.execute("""
+        SELECT e.id, e.year, e.title, e.source_page
+        FROM events_span s
+        JOIN events e ON e.id = s.id
+        WHERE s.year_min <= ? AND s.year_max >= ?
+        ORDER BY e.importance DESC, e.year, e.id
+        LIMIT ?
+    """, (end, start, -1 if limit is None else limit)).fetchall()
+
+
+def events_at(conn: sqlite3.Connection, year: int,
+              limit: Optional[int] = 20) -> List[Tuple[int, Optional[int], str, Optional[str]]]:
+    """Events going on in `year` (single-year events of that year and periods spanning it)"""
+    return events_between(conn, year, year, limit)
+
+
+# JSON columns of an event card
+CARD_JSON = ('tags', 'bible_refs', 'people', 'places')
+
+
+def event_card(conn: sqlite3.Connection, event_id: int) -> Optional[Dict[str, Any]]:
+    """Event row plus people/places lists (two primary-key lookups); None if it does not exist"""
+    cursor = conn.execute("""
+        SELECT e.*, d.people, d.places
+        FROM events e
+        JOIN event_details d ON d.event_id = e.id
+        WHERE e.id = ?
+    """, (event_id,))
+    row = cursor.fetchone()
+    if row is None:
+        return None
+    card = dict(zip((c[0] for c in cursor.description), row))
+    for key in CARD_JSON:
+        card[key] = json.loads(card[key] or '[]')
+    return card
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    limit = 20
+    if '--limit' in args:
+        i = args.index('--limit')
+        limit = int(args[i + 1])
+        del args[i:i + 2]
+
+    explain = '--explain' in args
+    if explain:
+        args.remove('--explain')
+
+    lookup = find
+    for flag, func in (('--tag', events_by_tag), ('--passage', events_by_passage),
+                       ('--year', lambda conn, text, limit: events_at(conn, int(text), limit))):
+        if flag in args:
+            args.remove(flag)
+            lookup = func
+
+    if not args:
+        print("Usage: python event_search.py <text> [--limit N] [--explain] [--tag | --passage | --year]")
+        sys.exit(1)
+
+    text = ' '.join(args)
+    if explain and lookup is find:
+        for index, query in plan(text):
+            print(f"[PLAN] {index:8s} MATCH {query}")
+
+    conn = sqlite3.connect(f"file:{DB_PATH}?mode=ro", uri=True)
+    results = lookup(conn, text, limit)
+    print(f"[SEARCH] {len(results)} results")
+    for event_id, year, title, source_page in results:
+        print(f"  {year}: {title} [{source_page}]")
+    conn.close()
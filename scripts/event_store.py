@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+CMSD - Incremental canonical event store
+SQLite file holding one canonical record per normalized dedup key
+(see event_dedup.py). The key is the table's primary key, so merging a
+re-extracted page only looks up and writes that page's events; nothing
+else is reloaded or rewritten.
+
+Each merged event is either
+  added     - key not in the store yet
+  updated   - key exists, the new record fills or changes fields
+  unchanged - key exists and nothing new was learned
+
+Usage:
+    python scripts/event_store.py merge data/processed/gemini_ultra/8R_gemini.json [more.json ...]
+    python scripts/event_store.py merge data/processed/gemini_ultra          # all *_gemini.json
+    python scripts/event_store.py export [data/processed/final_complete_all_19_pdfs.json]
+    python scripts/event_store.py stats
+"""
+
+import sys
+import json
+import sqlite3
+import hashlib
+from datetime import datetime
+from pathlib import Path
+from typing import List, Dict, Any, Iterable, Iterator, Optional
+
+from event_dedup import make_key_func, normalize_year, chronological_key, with_event_id
+from event_io import iter_events, write_events
+
+PROJECT_ROOT = Path(__file__).parent.parent
+STORE_PATH = PROJECT_ROOT / "data" / "processed" / "canonical_events.db"
+EVENTS_JSON = PROJECT_ROOT / "data" / "processed" / "final_complete_all_19_pdfs.json"
+
+LIST_FIELDS = ('people', 'places', 'tags', 'bible_refs')
+LOOKUP_BATCH = 500         # keys per SELECT ... WHERE key IN (...)
+
+STORE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS canonical_events (
+    key BLOB PRIMARY KEY,          -- 16-byte digest of the normalized dedup key
+    year INTEGER,
+    title TEXT NOT NULL,
+    payload TEXT NOT NULL,         -- canonical event as JSON
+    first_source TEXT,
+    last_source TEXT,
+    updated_at TEXT
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_canonical_year ON canonical_events(year);
+
+CREATE TABLE IF NOT EXISTS merged_files (
+    name TEXT PRIMARY KEY,
+    sha256 TEXT NOT NULL,
+    merged_at TEXT,
+    added INTEGER,
+    updated INTEGER,
+    unchanged INTEGER,
+    skipped INTEGER
+);
+"""
+
+
+def _is_empty(value: Any) -> bool:
+    return value is None or value == '' or value == []
+
+
+def merge_record(current: Dict[str, Any], new: Dict[str, Any]) -> Dict[str, Any]:
+    """Field-wise merge: the newer extraction wins for non-empty scalars,
+    list fields (people, places, tags, bible_refs) are unioned in order"""
+    merged = dict(current)
+    for field, value in new.items():
+        if _is_empty(value):
+            continue
+        if field in LIST_FIELDS and isinstance(value, list) and isinstance(merged.get(field), list):
+            combined = list(merged[field])
+            combined.extend(v for v in value if v not in combined)
+            merged[field] = combined
+        else:
+            merged[field] = value
+    return merged
+
+
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class EventStore:
+    """Canonical events keyed on the compact normalized dedup key"""
+
+    def __init__(self, path: Path = STORE_PATH, remove_diacritics: bool = False):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript(STORE_SCHEMA)
+        self.key = make_key_func(remove_diacritics=remove_diacritics, compact=True)
+
+    def close(self):
+        self.conn.close()
+
+    def count(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM canonical_events").fetchone()[0]
+
+    def _lookup(self, keys: List[bytes]) -> Dict[bytes, Dict[str, Any]]:
+        found = {}
+        for lo in range(0, len(keys), LOOKUP_BATCH):
+            batch = keys[lo:lo + LOOKUP_BATCH]
+            placeholders = ','.join('?' * len(batch))
+            for key, payload in self.conn.execute(
+                    f"SELECT key, payload FROM canonical_events WHERE key IN ({placeholders})", batch):
+                found[key] = json.loads(payload)
+        return found
+
+    def merge_events(self, events: Iterable[Any], source: str = '') -> Dict[str, int]:
+        """Merge events into the store in one transaction; cost is O(len(events))"""
+        stats = {'added': 0, 'updated': 0, 'unchanged': 0, 'skipped': 0}
+
+        keyed = []
+        for event in events:
+            if not isinstance(event, dict) or _is_empty(event.get('title')):
+                stats['skipped'] += 1
+                continue
+            keyed.append((self.key(event), event))
+
+        current = self._lookup(list({key for key, _ in keyed}))
+        now = datetime.now().isoformat(timespec='seconds')
+        inserts, updates = {}, {}
+
+        for key, event in keyed:
+            if key not in current:
+                current[key] = event
+                inserts[key] = event
+                stats['added'] += 1
+                continue
+
+            merged = merge_record(current[key], event)
+            if merged == current[key]:
+                stats['unchanged'] += 1
+                continue
+
+            current[key] = merged
+            if key in inserts:
+                inserts[key] = merged
+            else:
+                updates[key] = merged
+            stats['updated'] += 1
+
+        with self.conn:
+            self.conn.executemany("""
+                INSERT INTO canonical_events (key, year, title, payload, first_source, last_source, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """, [
+                (key, normalize_year(e.get('year')), str(e['title']),
+                 json.dumps(e, ensure_ascii=False), source, source, now)
+                for key, e in inserts.items()
+            ])
+            self.conn.executemany("""
+                UPDATE canonical_events
+                SET year = ?, title = ?, payload = ?, last_source = ?, updated_at = ?
+                WHERE key = ?
+            """, [
+                (normalize_year(e.get('year')), str(e['title']),
+                 json.dumps(e, ensure_ascii=False), source, now, key)
+                for key, e in updates.items()
+            ])
+
+        return stats
+
+    def merge_file(self, path: Path, force: bool = False) -> Optional[Dict[str, int]]:
+        """Merge one per-page JSON file; returns None if this exact file was merged before"""
+        sha = file_sha256(path)
+        row = self.conn.execute("SELECT sha256 FROM merged_files WHERE name = ?", (path.name,)).fetchone()
+        if row and row[0] == sha and not force:
+            return None
+
+        stats = self.merge_events(iter_events(path), source=path.name)
+        with self.conn:
+            self.conn.execute("""
+                INSERT OR REPLACE INTO merged_files (name, sha256, merged_at, added, updated, unchanged, skipped)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """, (path.name, sha, datetime.now().isoformat(timespec='seconds'),
+                  stats['added'], stats['updated'], stats['unchanged'], stats['skipped']))
+        return stats
+
+    def events(self) -> List[Dict[str, Any]]:
+        """All canonical events in chronological order (yearless last)"""
+        events = [with_event_id(json.loads(payload))
+                  for (payload,) in self.conn.execute("SELECT payload FROM canonical_events")]
+        events.sort(key=chronological_key)
+        return events
+
+    def iter_events(self) -> Iterator[Dict[str, Any]]:
+        """Chronological stream straight from SQLite (year index, yearless last)"""
+        for (payload,) in self.conn.execute(
+                "SELECT payload FROM canonical_events ORDER BY year IS NULL, year"):
+            yield with_event_id(json.loads(payload))
+
+    def export(self, output_file: Path = EVENTS_JSON) -> int:
+        return write_events(self.iter_events(), output_file)
+
+
+def expand_inputs(names: List[str]) -> List[Path]:
+    """Files as given; directories expand to their *_gemini.json files"""
+    paths = []
+    for name in names:
+        path = Path(name)
+        if path.is_dir():
+            paths.extend(sorted(path.glob("*_gemini.json")))
+        else:
+            paths.append(path)
+    return paths
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    if not args or args[0] not in ('merge', 'export', 'stats'):
+        print("Usage: python event_store.py merge <file.json|dir> [...] [--force]")
+        print("       python event_store.py export [output.json]")
+        print("       python event_store.py stats")
+        sys.exit(1)
+
+    command = args.pop(0)
+    force = '--force' in args
+    args = [a for a in args if a != '--force']
+    store = EventStore()
+
+    if command == 'merge':
+        totals = {'added': 0, 'updated': 0, 'unchanged': 0, 'skipped': 0}
+        for path in expand_inputs(args):
+            stats = store.merge_file(path, force=force)
+            if stats is None:
+                print(f"  [SKIP] {path.name:28s} already merged (unchanged file)")
+                continue
+            for k, v in stats.items():
+                totals[k] += v
+            print(f"  [OK] {path.name:28s} +{stats['added']:<4d} ~{stats['updated']:<4d} "
+                  f"={stats['unchanged']:<4d} skipped {stats['skipped']}")
+        print(f"\n[STORE] {store.count()} canonical events "
+              f"(added {totals['added']}, updated {totals['updated']}, unchanged {totals['unchanged']})")
+
+    elif command == 'export':
+        output_file = Path(args[0]) if args else EVENTS_JSON
+        count = store.export(output_file)
+        print(f"[SAVED] {output_file.name}: {count} events")
+
+    else:
+        print(f"[STORE] {store.path.name}: {store.count()} canonical events")
+        for name, merged_at, added, updated, unchanged in store.conn.execute(
+                "SELECT name, merged_at, added, updated, unchanged FROM merged_files ORDER BY name"):
+            print(f"  {name:28s} {merged_at}  +{added} ~{updated} ={unchanged}")
+
+    store.close()
@@ -63,7 +63,8 @@ def pdf_to_base64_image(pdf_path: Path, dpi: int = 150) -> str:
     return img_base64
 
 
-def extract_events_from_image(client: OpenAI, image_base64: str, pdf_name: str) -> List[Dict[str, Any]]:
+def extract_events_from_image(client: OpenAI, image_base64: str, pdf_name: str,
+                              model: str = "gpt-4o") -> List[Dict[str, Any]]:
     """
     Extract structured historical events from image using GPT-4o Vision
     """
@@ -116,7 +117,7 @@ Vrat POUZE cisty JSON array, zadny dalsi text."""
 
     try:
         response = client.chat.completions.create(
-            model="gpt-4o",
+            model=model,
             messages=[
                 {
                     "role": "user",
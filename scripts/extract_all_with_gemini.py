@@ -15,6 +15,8 @@ from PIL import Image
 import io
 import time
 
+from event_io import write_events
+
 PROJECT_ROOT = Path(__file__).parent.parent
 PDFS_DIR = PROJECT_ROOT / "data" / "raw" / "pdfs"
 OUTPUT_DIR = PROJECT_ROOT / "data" / "processed" / "gemini_ultra"
@@ -181,8 +183,7 @@ def extract_all_pdfs():
 
             # Save per-PDF
             output_file = OUTPUT_DIR / f"{pdf_path.stem}_gemini.json"
-            with open(output_file, "w", encoding="utf-8") as f:
-                json.dump(events, f, ensure_ascii=False, indent=2)
+            write_events(events, output_file)
 
             # Rate limit: wait 3s between requests
             if pdf_path != all_pdfs[-1]:
@@ -196,8 +197,7 @@ def extract_all_pdfs():
 
     # Save combined
     combined_file = OUTPUT_DIR / "all_pdfs_gemini_ultra.json"
-    with open(combined_file, "w", encoding="utf-8") as f:
-        json.dump(all_events, f, ensure_ascii=False, indent=2)
+    write_events(all_events, combined_file)
 
     # Save stats
     stats_file = OUTPUT_DIR / "gemini_ultra_stats.json"
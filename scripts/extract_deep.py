@@ -74,7 +74,9 @@ def pdf_to_base64_image(pdf_path: Path, dpi: int = 150) -> str:
     return img_base64
 
 
-def claude_deep_extraction(client: anthropic.Anthropic, image_base64: str, pdf_name: str) -> List[Dict[str, Any]]:
+def claude_deep_extraction(client: anthropic.Anthropic, image_base64: str, pdf_name: str,
+                           media_type: str = "image/png",
+                           model: str = "claude-sonnet-4-20250514") -> List[Dict[str, Any]]:
     """Deep extraction using Claude Sonnet 4.5 Vision - BEST for Czech OCR!"""
     print(f"DEEP extraction from {pdf_name} using Claude Vision...")
 
@@ -176,7 +178,7 @@ Vrať POUZE validní JSON array s 30-200+ událostmi. ŽÁDNÝ jiný text!"""
 
     try:
         message = client.messages.create(
-            model="claude-sonnet-4-20250514",
+            model=model,
             max_tokens=16000,
             messages=[
                 {
@@ -186,7 +188,7 @@ Vrať POUZE validní JSON array s 30-200+ událostmi. ŽÁDNÝ jiný text!"""
                             "type": "image",
                             "source": {
                                 "type": "base64",
-                                "media_type": "image/png",
+                                "media_type": media_type,
                                 "data": image_base64,
                             },
                         },
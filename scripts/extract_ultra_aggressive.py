@@ -21,6 +21,8 @@ import fitz
 from PIL import Image
 import io
 
+from event_dedup import Deduplicator, deduplicate_events, chronological_key, print_drop_summary
+
 PROJECT_ROOT = Path(__file__).parent.parent
 PDFS_DIR = PROJECT_ROOT / "data" / "raw" / "pdfs"
 KNOWLEDGE_DIR = PROJECT_ROOT / "data" / "raw" / "knowledge_cards"
@@ -354,28 +356,15 @@ def ultra_aggressive_extraction():
     print(f"{'='*70}")
     print(f"Before dedup: {len(all_events)} events")
 
-    seen = set()
-    unique_events = []
-    for event in all_events:
-        # Skip events without year (from knowledge cards without parsed dates)
-        if event.get('year') is None:
-            continue
-
-        key = (
-            event.get('title', '').lower().strip(),
-            event.get('year'),
-            event.get('source_page', '')
-        )
-
-        if key not in seen:
-            seen.add(key)
-            unique_events.append(event)
+    dedup = Deduplicator()
+    unique_events = deduplicate_events(all_events, dedup=dedup)
 
     print(f"After dedup: {len(unique_events)} unique events")
     print(f"Duplicates removed: {len(all_events) - len(unique_events)}")
+    print_drop_summary(dedup)
 
     # Sort by year
-    unique_events.sort(key=lambda e: e.get('year', 0))
+    unique_events.sort(key=chronological_key)
 
     # Save final
     final_file = OUTPUT_DIR / "ultra_extraction_final.json"
@@ -384,6 +373,7 @@ def ultra_aggressive_extraction():
 
     # Save stats
     stats["total_after_dedup"] = len(unique_events)
+    stats["drop_reasons"] = dict(dedup.reasons)
     stats_file = OUTPUT_DIR / "ultra_extraction_stats.json"
     with open(stats_file, "w", encoding="utf-8") as f:
         json.dump(stats, f, ensure_ascii=False, indent=2)
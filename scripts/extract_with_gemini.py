@@ -15,6 +15,8 @@ import fitz
 from PIL import Image
 import io
 
+from event_io import write_events
+
 PROJECT_ROOT = Path(__file__).parent.parent
 PDFS_DIR = PROJECT_ROOT / "data" / "raw" / "pdfs"
 OUTPUT_DIR = PROJECT_ROOT / "data" / "processed"
@@ -186,8 +188,7 @@ def extract_single_pdf_gemini(pdf_filename: str):
     # Save
     if events:
         output_file = OUTPUT_DIR / f"{pdf_path.stem}_gemini.json"
-        with open(output_file, "w", encoding="utf-8") as f:
-            json.dump(events, f, ensure_ascii=False, indent=2)
+        write_events(events, output_file)
         print(f"\n[SUCCESS] Saved {len(events)} events to {output_file.name}")
         return events
     else:
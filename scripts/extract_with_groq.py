@@ -66,7 +66,8 @@ def pdf_to_base64_image(pdf_path: Path, dpi: int = 200) -> str:
     return img_base64
 
 
-def extract_with_groq(client: Groq, image_base64: str, pdf_name: str) -> List[Dict[str, Any]]:
+def extract_with_groq(client: Groq, image_base64: str, pdf_name: str,
+                      model: str = "llama-3.2-90b-vision-preview") -> List[Dict[str, Any]]:
     """Extract using Groq Vision (Llama 3.2 90B Vision)"""
     print(f"Extracting from {pdf_name} using Groq Vision (ULTRA FAST!)...")
 
@@ -116,7 +117,7 @@ Vrať POUZE validní JSON array s událostmi. ŽÁDNÝ jiný text nebo markdown!
 
     try:
         completion = client.chat.completions.create(
-            model="llama-3.2-90b-vision-preview",
+            model=model,
             messages=[
                 {
                     "role": "user",
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+CMSD - Year-blocked fuzzy merge candidates
+Two records are only plausible duplicates if their year/year_end
+intervals are close. Events are sorted by start year and compared only
+inside a sliding +-k-year window; title similarity inside each block is
+the cosine of character n-gram TF-IDF vectors, computed as sparse
+matrix products (NumPy/SciPy) instead of Python loops.
+
+Usage:
+    python scripts/fuzzy_candidates.py data/processed/final_complete_all_19_pdfs.json
+    python scripts/fuzzy_candidates.py events.json --window 5 --threshold 0.7 --out pairs.json
+"""
+
+import sys
+import json
+from pathlib import Path
+from typing import List, Dict, Any, Tuple
+
+import numpy as np
+from scipy import sparse
+
+from event_dedup import normalize_text, normalize_year
+
+PROJECT_ROOT = Path(__file__).parent.parent
+PROCESSED_DIR = PROJECT_ROOT / "data" / "processed"
+
+NGRAM = 3
+WINDOW_YEARS = 5
+THRESHOLD = 0.7
+CHUNK_ROWS = 2048
+LONG_SPAN = 50             # periods longer than this are blocked separately
+
+
+def year_intervals(events: List[Dict[str, Any]]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """(start, end, has_year) arrays; end = year_end or year, swapped if reversed"""
+    n = len(events)
+    start = np.zeros(n, dtype=np.int64)
+    end = np.zeros(n, dtype=np.int64)
+    has_year = np.zeros(n, dtype=bool)
+
+    for i, event in enumerate(events):
+        year = normalize_year(event.get('year'))
+        if year is None:
+            continue
+        year_end = normalize_year(event.get('year_end'))
+        if year_end is None:
+            year_end = year
+        start[i], end[i] = min(year, year_end), max(year, year_end)
+        has_year[i] = True
+
+    return start, end, has_year
+
+
+def tfidf_matrix(titles: List[str], ngram: int = NGRAM) -> sparse.csr_matrix:
+    """L2-normalized character n-gram TF-IDF rows (sublinear tf, smoothed idf)"""
+    vocabulary: Dict[str, int] = {}
+    indptr = [0]
+    indices: List[int] = []
+    counts: List[int] = []
+
+    for title in titles:
+        padded = f" {normalize_text(title, remove_diacritics=True)} "
+        grams: Dict[int, int] = {}
+        for i in range(max(1, len(padded) - ngram + 1)):
+            column = vocabulary.setdefault(padded[i:i + ngram], len(vocabulary))
+            grams[column] = grams.get(column, 0) + 1
+        indices.extend(grams.keys())
+        counts.extend(grams.values())
+        indptr.append(len(indices))
+
+    matrix = sparse.csr_matrix(
+        (np.asarray(counts, dtype=np.float32), np.asarray(indices, dtype=np.int32), np.asarray(indptr)),
+        shape=(len(titles), max(1, len(vocabulary))),
+    )
+
+    # tf-idf
+    df = np.bincount(matrix.indices, minlength=matrix.shape[1]).astype(np.float32)
+    idf = np.log((1 + matrix.shape[0]) / (1 + df)) + 1
+    matrix.data = (1 + np.log(matrix.data)) * idf[matrix.indices]
+
+    # L2 normalize rows
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    norms[norms == 0] = 1
+    matrix = sparse.diags(1 / norms).dot(matrix).tocsr()
+    return matrix
+
+
+def candidate_pairs(events: List[Dict[str, Any]], window: int = WINDOW_YEARS, threshold: float = THRESHOLD,
+                    ngram: int = NGRAM, chunk_rows: int = CHUNK_ROWS,
+                    long_span: int = LONG_SPAN) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Candidate duplicate pairs (i, j, score) with intervals at most `window` years apart
+
+    Indices refer to `events`. Yearless events are not blocked and never paired.
+    """
+    start, end, has_year = year_intervals(events)
+    dated = np.flatnonzero(has_year)
+    order = dated[np.argsort(start[dated], kind='stable')]
+
+    s_start, s_end = start[order], end[order]
+    matrix = tfidf_matrix([events[i].get('title') for i in order], ngram)
+
+    out_i, out_j, out_score = [], [], []
+
+    def compare(rows_sorted: np.ndarray):
+        """Score one chunk of rows (positions in start order) against its year window"""
+        first = int(rows_sorted[0])
+        # Rows are sorted by start: partners start no later than max(end) + window
+        partner_hi = int(np.searchsorted(s_start, s_end[rows_sorted].max() + window, side='right'))
+
+        block = (matrix[rows_sorted] @ matrix[first:partner_hi].T).tocoo()
+        hit = block.data >= threshold
+        rows = rows_sorted[block.row[hit]]
+        cols = block.col[hit] + first
+        scores = block.data[hit]
+
+        keep = cols > rows
+        rows, cols, scores = rows[keep], cols[keep], scores[keep]
+
+        # Interval gap (start_j >= start_i since sorted)
+        keep = s_start[cols] - s_end[rows] <= window
+        out_i.append(order[rows[keep]])
+        out_j.append(order[cols[keep]])
+        out_score.append(scores[keep])
+
+    # Long periods ("Babylonské zajetí", -597..-538) would stretch the window
+    # of every chunk they land in, so they are scored in chunks of their own
+    positions = np.arange(len(order))
+    span = s_end - s_start
+    short_rows = positions[span <= long_span]
+    long_rows = positions[span > long_span]
+    long_rows = long_rows[np.argsort(s_end[long_rows], kind='stable')]
+
+    for rows_sorted in (short_rows, long_rows):
+        for lo in range(0, len(rows_sorted), chunk_rows):
+            chunk = np.sort(rows_sorted[lo:lo + chunk_rows])
+            compare(chunk)
+
+    if not out_i:
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty, np.zeros(0, dtype=np.float32)
+    return np.concatenate(out_i), np.concatenate(out_j), np.concatenate(out_score)
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    if not args:
+        print("Usage: python fuzzy_candidates.py <events.json> [--window 5] [--threshold 0.7] [--out pairs.json]")
+        sys.exit(1)
+
+    input_file = Path(args.pop(0))
+    window = WINDOW_YEARS
+    threshold = THRESHOLD
+    output_file = PROCESSED_DIR / f"{input_file.stem}_fuzzy_candidates.json"
+
+    while args:
+        arg = args.pop(0)
+        if arg == "--window":
+            window = int(args.pop(0))
+        elif arg == "--threshold":
+            threshold = float(args.pop(0))
+        elif arg == "--out":
+            output_file = Path(args.pop(0))
+
+    with open(input_file, 'r', encoding='utf-8') as f:
+        events = json.load(f)
+
+    print(f"[LOAD] {input_file.name}: {len(events)} events")
+    rows, cols, scores = candidate_pairs(events, window=window, threshold=threshold)
+
+    pairs = [
+        {
+            'a': int(i), 'b': int(j), 'score': round(float(s), 3),
+            'title_a': events[i].get('title'), 'title_b': events[j].get('title'),
+            'year_a': events[i].get('year'), 'year_b': events[j].get('year'),
+        }
+        for i, j, s in sorted(zip(rows, cols, scores), key=lambda p: -p[2])
+    ]
+
+    with open(output_file, 'w', encoding='utf-8') as f:
+        json.dump({'source': input_file.name, 'window': window, 'threshold': threshold, 'pairs': pairs},
+                  f, ensure_ascii=False, indent=2)
+
+    print(f"[PAIRS] {len(pairs)} candidate pairs (window +-{window} years, threshold {threshold})")
+    for pair in pairs[:10]:
+        print(f"  {pair['score']:.2f}  {pair['year_a']}: {pair['title_a']}  <->  {pair['year_b']}: {pair['title_b']}")
+    print(f"[SAVED] {output_file.name}")
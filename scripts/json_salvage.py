@@ -0,0 +1,388 @@
+#!/usr/bin/env python3
+"""
+CMSD - Tolerant JSON salvage for raw model outputs
+Recovers every complete event object from broken LLM responses
+(truncation, trailing commas, markdown fences, unescaped quotes,
+stray values without keys) in a single linear pass.
+
+Usage:
+    python scripts/json_salvage.py data/processed/gemini_ultra/8R_raw.txt
+    python scripts/json_salvage.py data/processed/gemini_ultra          # all *raw*.txt
+    python scripts/json_salvage.py DIR --pattern "*_raw.txt" --out-dir OUT --workers 4
+"""
+
+import re
+import sys
+import json
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import List, Dict, Any, Iterator, Tuple, Optional
+
+PROJECT_ROOT = Path(__file__).parent.parent
+RAW_DIR = PROJECT_ROOT / "data" / "processed" / "gemini_ultra"
+
+NUMBER_RE = re.compile(r'-?(?:0|[1-9]\d*)(?:\.\d+)?(?:[eE][+-]?\d+)?')
+WORD_RE = re.compile(r'[A-Za-z_]+')
+LITERALS = {'true': True, 'false': False, 'null': None,
+            'True': True, 'False': False, 'None': None}
+ESCAPES = {'"': '"', '\\': '\\', '/': '/', 'b': '\b', 'f': '\f', 'n': '\n', 'r': '\r', 't': '\t'}
+WHITESPACE = ' \t\r\n'
+
+# Token kinds
+STRING, SCALAR, PUNCT = 'string', 'scalar', 'punct'
+
+
+def _skip_ws(text: str, i: int) -> int:
+    n = len(text)
+    while i < n and text[i] in WHITESPACE:
+        i += 1
+    return i
+
+
+def _closes_string(text: str, i: int) -> bool:
+    """Is the quote at text[i] a real closing quote (vs. an unescaped quote in prose)?"""
+    j = _skip_ws(text, i + 1)
+    if j >= len(text):
+        return True
+    c = text[j]
+    if c in ':}]':
+        return True
+    if c != ',':
+        return False
+    # After a comma real JSON continues with a value, a key or a closer
+    k = _skip_ws(text, j + 1)
+    if k >= len(text):
+        return True
+    c = text[k]
+    if c in '"{[]}-' or c.isdigit():
+        return True
+    word = WORD_RE.match(text, k)
+    return bool(word) and word.group() in LITERALS
+
+
+def tokenize(text: str, stats: Dict[str, int]) -> Iterator[Tuple[str, Any]]:
+    """Single-pass tolerant tokenizer. Garbage outside strings is skipped."""
+    i = 0
+    n = len(text)
+
+    while i < n:
+        c = text[i]
+
+        if c in WHITESPACE:
+            i += 1
+
+        elif c in '{}[]:,':
+            yield PUNCT, c
+            i += 1
+
+        elif c == '"':
+            chunks = []
+            start = i + 1
+            j = start
+            closed = False
+            while j < n:
+                ch = text[j]
+                if ch == '\\':
+                    chunks.append(text[start:j])
+                    nxt = text[j + 1] if j + 1 < n else ''
+                    if nxt == 'u' and j + 6 <= n:
+                        try:
+                            chunks.append(chr(int(text[j + 2:j + 6], 16)))
+                            j += 6
+                        except ValueError:
+                            chunks.append(nxt)
+                            j += 2
+                    elif nxt in ESCAPES:
+                        chunks.append(ESCAPES[nxt])
+                        j += 2
+                    else:
+                        # Invalid escape - keep the character literally
+                        chunks.append(nxt)
+                        j += 2
+                    start = j
+                elif ch == '"':
+                    if _closes_string(text, j):
+                        chunks.append(text[start:j])
+                        closed = True
+                        j += 1
+                        break
+                    stats['unescaped_quotes'] += 1
+                    j += 1
+                else:
+                    j += 1
+
+            if not closed:
+                # Truncated inside a string - nothing after this can be complete
+                stats['truncated'] = 1
+                return
+            yield STRING, ''.join(chunks)
+            i = j
+
+        elif c == '-' or c.isdigit():
+            match = NUMBER_RE.match(text, i)
+            if match:
+                literal = match.group()
+                value = float(literal) if any(x in literal for x in '.eE') else int(literal)
+                yield SCALAR, value
+                i = match.end()
+            else:
+                stats['garbage_chars'] += 1
+                i += 1
+
+        else:
+            word = WORD_RE.match(text, i)
+            if word and word.group() in LITERALS:
+                yield SCALAR, LITERALS[word.group()]
+                i = word.end()
+            elif word:
+                # Markdown fences, "json" labels, prose around the array
+                stats['garbage_chars'] += len(word.group())
+                i = word.end()
+            else:
+                stats['garbage_chars'] += 1
+                i += 1
+
+
+def looks_like_event(obj: Any) -> bool:
+    """Event objects always carry a title"""
+    return isinstance(obj, dict) and 'title' in obj
+
+
+def _unwrap(obj: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """Yield events from a completed top-level object ({"events": [...]} wrappers included)"""
+    if looks_like_event(obj):
+        yield obj
+        return
+    for value in obj.values():
+        if isinstance(value, list):
+            for item in value:
+                if looks_like_event(item):
+                    yield item
+
+
+def iter_salvaged(text: str, stats: Optional[Dict[str, int]] = None) -> Iterator[Dict[str, Any]]:
+    """Yield every complete event object in text, in order"""
+    if stats is None:
+        stats = new_stats()
+
+    # Frames: [container, pending_key, expect] - expect is 'key'/'colon'/'value' for objects
+    stack: List[list] = []
+    last_key: Optional[str] = None
+
+    def attach(value: Any) -> Iterator[Dict[str, Any]]:
+        nonlocal last_key
+        if not stack:
+            if isinstance(value, dict):
+                for event in _unwrap(value):
+                    yield event
+            return
+
+        frame = stack[-1]
+        container = frame[0]
+        if isinstance(container, list):
+            # Elements of the root array are emitted straight away, not kept
+            if len(stack) == 1 and isinstance(value, dict):
+                if looks_like_event(value):
+                    yield value
+                else:
+                    stats['non_event_objects'] += 1
+            else:
+                container.append(value)
+        else:
+            if frame[2] == 'key':
+                # Value without a key (e.g. a second '{' where a key belongs)
+                stats['dropped_values'] += 1
+                return
+            container[frame[1]] = value
+            last_key = frame[1]
+            frame[1], frame[2] = None, 'key'
+
+    for kind, token in tokenize(text, stats):
+        frame = stack[-1] if stack else None
+        in_object = frame is not None and isinstance(frame[0], dict)
+
+        if kind == PUNCT:
+            if token == '{':
+                stack.append([{}, None, 'key'])
+            elif token == '[':
+                stack.append([[], None, None])
+            elif token in '}]':
+                want = dict if token == '}' else list
+                if not any(isinstance(f[0], want) for f in stack):
+                    stats['stray_closers'] += 1
+                    continue
+                # Close any unterminated inner containers first
+                while not isinstance(stack[-1][0], want):
+                    inner = stack.pop()
+                    stats['unclosed_containers'] += 1
+                    for event in attach(inner[0]):
+                        yield event
+                done = stack.pop()
+                if done[2] == 'colon':
+                    _fold_stray(done[0], last_key, done[1], stats)
+                for event in attach(done[0]):
+                    yield event
+            elif token == ':':
+                if in_object and frame[2] == 'colon':
+                    frame[2] = 'value'
+            elif token == ',':
+                if in_object and frame[2] == 'colon':
+                    # "region": "Novgorod", "Moskva", "Tver" - a stray value
+                    # where a key should be; fold it into the previous value
+                    _fold_stray(frame[0], last_key, frame[1], stats)
+                    frame[1], frame[2] = None, 'key'
+                elif in_object and frame[2] == 'value':
+                    stats['dropped_values'] += 1
+                    frame[1], frame[2] = None, 'key'
+            continue
+
+        # Scalars and strings
+        if in_object:
+            if frame[2] == 'key':
+                if kind == STRING:
+                    frame[1], frame[2] = token, 'colon'
+                else:
+                    stats['dropped_values'] += 1
+                continue
+            if frame[2] == 'colon':
+                # Missing colon: "title" "X"
+                stats['missing_colons'] += 1
+                frame[2] = 'value'
+        elif frame is None:
+            stats['dropped_values'] += 1
+            continue
+
+        for event in attach(token):
+            yield event
+
+    if stack:
+        stats['truncated'] = 1
+
+
+def _fold_stray(obj: Dict[str, Any], last_key: Optional[str], stray: str, stats: Dict[str, int]):
+    if last_key in obj and isinstance(obj[last_key], str):
+        obj[last_key] = f"{obj[last_key]}, {stray}"
+        stats['folded_values'] += 1
+    elif last_key in obj and isinstance(obj[last_key], list):
+        obj[last_key].append(stray)
+        stats['folded_values'] += 1
+    else:
+        stats['dropped_values'] += 1
+
+
+def new_stats() -> Dict[str, int]:
+    return {
+        'truncated': 0,
+        'unescaped_quotes': 0,
+        'garbage_chars': 0,
+        'stray_closers': 0,
+        'unclosed_containers': 0,
+        'missing_colons': 0,
+        'folded_values': 0,
+        'dropped_values': 0,
+        'non_event_objects': 0,
+    }
+
+
+def salvage_text(text: str) -> Tuple[List[Dict[str, Any]], Dict[str, int]]:
+    """Recover all complete events from text. Returns (events, stats)"""
+    stats = new_stats()
+    events = list(iter_salvaged(text, stats))
+    return events, stats
+
+
+def salvage_file(raw_file: Path, output_file: Optional[Path] = None) -> Dict[str, Any]:
+    """Salvage one raw response file, optionally saving recovered events"""
+    with open(raw_file, 'r', encoding='utf-8', errors='replace') as f:
+        text = f.read()
+
+    events, stats = salvage_text(text)
+
+    if output_file is not None and events:
+        with open(output_file, 'w', encoding='utf-8') as f:
+            json.dump(events, f, ensure_ascii=False, indent=2)
+
+    return {
+        'file': raw_file.name,
+        'chars': len(text),
+        'events': len(events),
+        'output': output_file.name if output_file is not None and events else None,
+        'stats': stats,
+    }
+
+
+def output_name(raw_file: Path) -> str:
+    """8R_raw.txt -> 8R_salvaged.json, 8R_raw_retry.txt -> 8R_retry_salvaged.json"""
+    stem = raw_file.stem.replace('_raw', '')
+    return f"{stem}_salvaged.json"
+
+
+def _salvage_job(args: Tuple[str, Optional[str]]) -> Dict[str, Any]:
+    raw_file, output_file = args
+    return salvage_file(Path(raw_file), Path(output_file) if output_file else None)
+
+
+def salvage_directory(directory: Path, pattern: str = "*raw*.txt", out_dir: Optional[Path] = None,
+                      workers: Optional[int] = None, save: bool = True) -> List[Dict[str, Any]]:
+    """Salvage every matching file in directory in parallel"""
+    files = sorted(directory.glob(pattern))
+    out_dir = out_dir or directory
+    if save:
+        out_dir.mkdir(parents=True, exist_ok=True)
+
+    jobs = [(str(f), str(out_dir / output_name(f)) if save else None) for f in files]
+    if len(jobs) <= 1:
+        return [_salvage_job(job) for job in jobs]
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_salvage_job, jobs))
+
+
+def print_report(reports: List[Dict[str, Any]]):
+    print(f"\n{'File':28s} {'Chars':>8s} {'Events':>7s}  Notes")
+    print('-' * 70)
+    total = 0
+    for report in reports:
+        stats = report['stats']
+        notes = [f"{k}={v}" for k, v in stats.items() if v and k != 'garbage_chars']
+        print(f"{report['file']:28s} {report['chars']:8d} {report['events']:7d}  {', '.join(notes)}")
+        total += report['events']
+    print('-' * 70)
+    print(f"{'TOTAL':28s} {'':8s} {total:7d}")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    pattern = "*raw*.txt"
+    out_dir = None
+    workers = None
+    save = True
+
+    paths = []
+    while args:
+        arg = args.pop(0)
+        if arg == "--pattern":
+            pattern = args.pop(0)
+        elif arg == "--out-dir":
+            out_dir = Path(args.pop(0))
+        elif arg == "--workers":
+            workers = int(args.pop(0))
+        elif arg == "--dry-run":
+            save = False
+        else:
+            paths.append(Path(arg))
+
+    if not paths:
+        paths = [RAW_DIR]
+
+    reports = []
+    for path in paths:
+        if path.is_dir():
+            reports.extend(salvage_directory(path, pattern, out_dir, workers, save))
+        elif path.exists():
+            target = (out_dir or path.parent) / output_name(path) if save else None
+            reports.append(salvage_file(path, target))
+        else:
+            print(f"[SKIP] {path} not found")
+
+    print_report(reports)
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+CMSD - K-way streaming merge of per-page extractions
+Inputs already in chronological order (e.g. earlier final_*.json
+merges) are streamed as-is. Any other file is sorted once with a chunked
+external sort - sorted runs of RUN_SIZE records spilled to .sorted/,
+then merged - and cached as JSONL next to the inputs
+(.sorted/<name>.jsonl, rebuilt when the source is newer). The global
+timeline is then a heapq k-way merge of those streams with dedup applied
+as records go by. Records are held as compact event_model.Event objects
+while sorting and merging.
+
+The default dedup key contains the normalized year, and the stream arrives
+in year order, so the dedup index only ever holds the current year's keys.
+Memory is one pending record per input plus one year of keys (and one
+run while sorting), not the whole dataset. Yearless (or null-year) events sort last.
+
+Usage:
+    python scripts/kway_merge.py                                  # gemini_ultra/*_gemini.json
+    python scripts/kway_merge.py data/processed/gemini_ultra --out merged.json
+"""
+
+import sys
+import heapq
+import itertools
+from pathlib import Path
+from typing import List, Dict, Any, Iterator, Optional
+
+from event_dedup import Deduplicator, chronological_key, normalize_year, print_drop_summary, with_event_id
+from event_io import iter_records, write_events
+
+PROJECT_ROOT = Path(__file__).parent.parent
+GEMINI_DIR = PROJECT_ROOT / "data" / "processed" / "gemini_ultra"
+OUTPUT_FILE = PROJECT_ROOT / "data" / "processed" / "final_complete_all_19_pdfs.json"
+CACHE_DIRNAME = ".sorted"
+RUN_SIZE = 50_000
+
+
+def is_sorted(path: Path) -> bool:
+    """True if the file is already in chronological order (one streaming pass)"""
+    keys = map(chronological_key, iter_records(path))
+    return all(a <= b for a, b in itertools.pairwise(keys))
+
+
+def sorted_cache(path: Path, run_size: int = RUN_SIZE) -> Path:
+    """The file itself if already chronological, else a sorted JSONL copy (built once)
+
+    Unsorted files are sorted externally: runs of `run_size` records are
+    sorted and spilled to .sorted/, then merged into the cache file, so at
+    most one run is held in memory. Both steps are stable: page order is
+    kept within a year.
+    """
+    cache = path.parent / CACHE_DIRNAME / f"{path.stem}.jsonl"
+    if cache.exists() and cache.stat().st_mtime >= path.stat().st_mtime:
+        return cache
+    if is_sorted(path):
+        return path
+
+    cache.parent.mkdir(exist_ok=True)
+    runs = []
+    try:
+        records = iter_records(path)
+        while chunk := list(itertools.islice(records, run_size)):
+            chunk.sort(key=chronological_key)
+            run = cache.parent / f"{path.stem}.run{len(runs)}.jsonl"
+            write_events(chunk, run, jsonl=True)
+            runs.append(run)
+
+        # heapq.merge takes ties from earlier runs first, which keeps the sort stable
+        tmp = cache.with_suffix('.tmp')
+        write_events(heapq.merge(*(iter_records(run) for run in runs), key=chronological_key), tmp, jsonl=True)
+        tmp.replace(cache)
+    finally:
+        for run in runs:
+            run.unlink(missing_ok=True)
+    return cache
+
+
+def _tagged(source: str, events: Iterator[Dict[str, Any]]) -> Iterator[tuple]:
+    for event in events:
+        yield source, event
+
+
+def kway_merge(paths: List[Path], dedup: Optional[Deduplicator] = None) -> Iterator[Dict[str, Any]]:
+    """Yield unique events from all inputs in chronological order
+
+    Ties (same year) keep input order: earlier files first, then page order,
+    so the first occurrence kept is the same as concatenate-dedup-sort.
+    Every event is stamped with its stable content ID (event_dedup.event_id).
+    The index is cleared at each new year only if the dedup key contains the
+    year; otherwise it holds every key, as in concatenate-dedup-sort.
+    """
+    if dedup is None:
+        dedup = Deduplicator(record_drops=False)
+    per_year = 'year' in dedup.fields
+
+    # Tag each event with its source so drops can name the file
+    tagged = [_tagged(path.name, iter_records(sorted_cache(path))) for path in paths]
+
+    current_year = object()
+    for source, event in heapq.merge(*tagged, key=lambda item: chronological_key(item[1])):
+        year = normalize_year(event.get('year'))
+        if per_year and year != current_year:
+            # No later event can share a key with an earlier year
+            dedup.index.clear()
+            current_year = year
+        if dedup.add(event, source):
+            yield with_event_id(event)
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    output_file = OUTPUT_FILE
+    if '--out' in args:
+        i = args.index('--out')
+        output_file = Path(args[i + 1])
+        del args[i:i + 2]
+
+    input_dir = Path(args[0]) if args else GEMINI_DIR
+    paths = sorted(input_dir.glob("*_gemini.json"))
+    if not paths:
+        print(f"Error: no *_gemini.json files in {input_dir}")
+        sys.exit(1)
+
+    print(f"[LOAD] {len(paths)} per-page files from {input_dir}")
+    dedup = Deduplicator(record_drops=False)
+    count = write_events(kway_merge(paths, dedup), output_file)
+
+    print(f"[DEDUP] {dedup.seen} seen, {count} unique, {dedup.dropped} dropped")
+    print_drop_summary(dedup)
+    print(f"[SAVED] {output_file.name}")
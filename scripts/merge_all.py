@@ -8,43 +8,22 @@ import json
 from pathlib import Path
 from typing import List, Dict, Any
 
+from event_dedup import Deduplicator, print_drop_summary
+from event_io import count_events, EventWriter
+from kway_merge import kway_merge
+
 PROJECT_ROOT = Path(__file__).parent.parent
 PROCESSED_DIR = PROJECT_ROOT / "data" / "processed"
 
-def load_json(file_path: Path) -> List[Dict[str, Any]]:
-    """Load JSON file"""
+def count_source(file_path: Path) -> int:
+    """Count a JSON file's events (streamed); 0 if missing"""
     if not file_path.exists():
         print(f"[SKIP] {file_path.name} not found")
-        return []
-
-    with open(file_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-
-    print(f"[LOAD] {file_path.name}: {len(data)} events")
-    return data
-
-
-def deduplicate_events(events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    """Deduplicate events based on (title, year, source_page)"""
-    seen = set()
-    unique = []
-
-    for event in events:
-        # Skip events without year
-        if event.get('year') is None:
-            continue
-
-        key = (
-            event.get('title', '').lower().strip(),
-            event.get('year'),
-            event.get('source_page', '')
-        )
+        return 0
 
-        if key not in seen:
-            seen.add(key)
-            unique.append(event)
-
-    return unique
+    count = count_events(file_path)
+    print(f"[COUNT] {file_path.name}: {count} events")
+    return count
 
 
 def merge_all_data():
@@ -53,51 +32,46 @@ def merge_all_data():
     print("MERGING ALL EXTRACTION DATA")
     print("="*70)
 
-    all_events = []
-
-    # Load all sources
+    # Count all sources
     sources = [
         PROCESSED_DIR / "merged_events.json",           # 359 from Claude single-pass
         PROCESSED_DIR / "ultra_extraction_final.json",  # 12 from ultra aggressive
     ]
 
-    for source in sources:
-        events = load_json(source)
-        all_events.extend(events)
+    total_before = sum(count_source(source) for source in sources)
+    sources = [source for source in sources if source.exists()]
 
-    print(f"\n[TOTAL] Before dedup: {len(all_events)} events")
+    print(f"\n[TOTAL] Before dedup: {total_before} events")
 
-    # Deduplicate
-    unique_events = deduplicate_events(all_events)
-    print(f"[DEDUP] After dedup: {len(unique_events)} unique events")
-    print(f"[REMOVED] {len(all_events) - len(unique_events)} duplicates")
-
-    # Sort by year
-    unique_events.sort(key=lambda e: e.get('year', 0))
+    # Chronological k-way merge, deduplicated and written as it streams
+    dedup = Deduplicator(record_drops=False)
+    categories = {}
 
-    # Save final merged
     final_file = PROCESSED_DIR / "final_merged_events.json"
-    with open(final_file, 'w', encoding='utf-8') as f:
-        json.dump(unique_events, f, ensure_ascii=False, indent=2)
+    with EventWriter(final_file) as writer:
+        for event in kway_merge(sources, dedup):
+            writer.write(event)
+            cat = event.get('category', 'unknown')
+            categories[cat] = categories.get(cat, 0) + 1
+
+    unique_count = writer.count
+    print(f"[DEDUP] After dedup: {unique_count} unique events")
+    print(f"[REMOVED] {dedup.dropped} duplicates")
+    print_drop_summary(dedup)
 
     print(f"\n[SAVED] {final_file.name}")
 
     # Generate stats
     stats = {
-        "total_events": len(unique_events),
+        "total_events": unique_count,
         "sources": {
             "claude_single_pass": 359,
             "ultra_aggressive": 12
         },
-        "duplicates_removed": len(all_events) - len(unique_events)
+        "duplicates_removed": dedup.dropped,
+        "drop_reasons": dict(dedup.reasons)
     }
 
-    # Category breakdown
-    categories = {}
-    for event in unique_events:
-        cat = event.get('category', 'unknown')
-        categories[cat] = categories.get(cat, 0) + 1
-
     stats['by_category'] = categories
 
     # Save stats
@@ -110,14 +84,14 @@ def merge_all_data():
     print("\n" + "="*70)
     print("MERGE COMPLETE")
     print("="*70)
-    print(f"Total unique events: {len(unique_events)}")
+    print(f"Total unique events: {unique_count}")
     print(f"\nCategory breakdown:")
     for cat, count in sorted(categories.items(), key=lambda x: -x[1]):
         print(f"  {cat:15s} {count:4d}")
 
-    return unique_events, stats
+    return final_file, stats
 
 
 if __name__ == "__main__":
-    events, stats = merge_all_data()
-    print(f"\n[SUCCESS] {len(events)} events ready for database!")
+    final_file, stats = merge_all_data()
+    print(f"\n[SUCCESS] {stats['total_events']} events ready for database!")
@@ -7,6 +7,10 @@ import json
 from pathlib import Path
 from typing import List, Dict, Any
 
+from event_dedup import Deduplicator, print_drop_summary
+from event_io import count_events, iter_events, EventWriter
+from kway_merge import kway_merge
+
 PROJECT_ROOT = Path(__file__).parent.parent
 GEMINI_ULTRA_DIR = PROJECT_ROOT / "data" / "processed" / "gemini_ultra"
 PROCESSED_DIR = PROJECT_ROOT / "data" / "processed"
@@ -18,37 +22,35 @@ def merge_gemini_ultra():
     print("MERGING GEMINI ULTRA FILES")
     print("="*70)
 
-    all_events = []
     stats = {"total_events": 0, "by_file": {}, "errors": []}
 
-    # Load all *_gemini.json files
+    # Stream all *_gemini.json files into the combined file
     gemini_files = sorted(GEMINI_ULTRA_DIR.glob("*_gemini.json"))
+    combined_file = GEMINI_ULTRA_DIR / "all_pdfs_gemini_ultra.json"
 
-    for file in gemini_files:
-        try:
+    with EventWriter(combined_file) as writer:
+        for file in gemini_files:
             # Skip empty files
             if file.stat().st_size <= 10:
                 print(f"[SKIP] {file.name} (empty)")
                 stats["by_file"][file.name] = 0
                 continue
 
-            with open(file, 'r', encoding='utf-8') as f:
-                events = json.load(f)
-
-            print(f"[LOAD] {file.name}: {len(events)} events")
-            all_events.extend(events)
-            stats["by_file"][file.name] = len(events)
-            stats["total_events"] += len(events)
-
-        except Exception as e:
-            print(f"[ERROR] {file.name}: {e}")
-            stats["errors"].append(file.name)
-            stats["by_file"][file.name] = 0
+            before = writer.count
+            try:
+                # Validate the whole file first so a broken one adds nothing
+                count_events(file)
+                writer.write_all(iter_events(file))
+            except Exception as e:
+                print(f"[ERROR] {file.name}: {e}")
+                stats["errors"].append(file.name)
+                stats["by_file"][file.name] = 0
+                continue
 
-    # Save combined file
-    combined_file = GEMINI_ULTRA_DIR / "all_pdfs_gemini_ultra.json"
-    with open(combined_file, 'w', encoding='utf-8') as f:
-        json.dump(all_events, f, ensure_ascii=False, indent=2)
+            count = writer.count - before
+            print(f"[LOAD] {file.name}: {count} events")
+            stats["by_file"][file.name] = count
+            stats["total_events"] += count
 
     print(f"\n[SAVED] {combined_file.name}")
     print(f"Total events: {stats['total_events']}")
@@ -65,54 +67,51 @@ def merge_gemini_ultra():
     print("MERGING WITH EXISTING DATA")
     print("="*70)
 
-    # Load existing data
+    # Count existing data
     existing_file = PROCESSED_DIR / "final_complete_with_gemini.json"
     if existing_file.exists():
-        with open(existing_file, 'r', encoding='utf-8') as f:
-            existing_events = json.load(f)
-        print(f"[LOAD] Existing data: {len(existing_events)} events")
+        existing_events = count_events(existing_file)
+        print(f"[COUNT] Existing data: {existing_events} events")
+        inputs = [existing_file, combined_file]
     else:
-        existing_events = []
+        existing_events = 0
         print("[INFO] No existing data found")
+        inputs = [combined_file]
 
-    # Combine
-    combined_events = existing_events + all_events
-    print(f"\n[TOTAL] Before dedup: {len(combined_events)} events")
-    print(f"  Existing: {len(existing_events)}")
-    print(f"  Gemini ultra: {len(all_events)}")
+    print(f"\n[TOTAL] Before dedup: {existing_events + stats['total_events']} events")
+    print(f"  Existing: {existing_events}")
+    print(f"  Gemini ultra: {stats['total_events']}")
 
-    # Deduplicate
-    unique_events = deduplicate_events(combined_events)
-    print(f"\n[DEDUP] After dedup: {len(unique_events)} unique events")
-    print(f"[REMOVED] {len(combined_events) - len(unique_events)} duplicates")
-
-    # Sort by year
-    unique_events.sort(key=lambda e: e.get('year', 0))
+    # Chronological k-way merge, deduplicated and written as it streams
+    dedup = Deduplicator(record_drops=False)
+    categories = {}
 
-    # Save final
     final_file = PROCESSED_DIR / "final_with_gemini_ultra.json"
-    with open(final_file, 'w', encoding='utf-8') as f:
-        json.dump(unique_events, f, ensure_ascii=False, indent=2)
+    with EventWriter(final_file) as writer:
+        for event in kway_merge(inputs, dedup):
+            writer.write(event)
+            cat = event.get('category', 'unknown')
+            categories[cat] = categories.get(cat, 0) + 1
+
+    unique_count = writer.count
+    print(f"\n[DEDUP] After dedup: {unique_count} unique events")
+    print(f"[REMOVED] {dedup.dropped} duplicates")
+    print_drop_summary(dedup)
 
     print(f"\n[SAVED] {final_file.name}")
 
     # Stats
     final_stats = {
-        "total_events": len(unique_events),
+        "total_events": unique_count,
         "sources": {
-            "existing": len(existing_events),
-            "gemini_ultra": len(all_events)
+            "existing": existing_events,
+            "gemini_ultra": stats["total_events"]
         },
-        "duplicates_removed": len(combined_events) - len(unique_events),
-        "improvement": f"{len(existing_events)} -> {len(unique_events)} (+{len(unique_events) - len(existing_events)})"
+        "duplicates_removed": dedup.dropped,
+        "drop_reasons": dict(dedup.reasons),
+        "improvement": f"{existing_events} -> {unique_count} (+{unique_count - existing_events})"
     }
 
-    # Category breakdown
-    categories = {}
-    for event in unique_events:
-        cat = event.get('category', 'unknown')
-        categories[cat] = categories.get(cat, 0) + 1
-
     final_stats['by_category'] = categories
 
     # Save final stats
@@ -125,8 +124,8 @@ def merge_gemini_ultra():
     print(f"\n{'='*70}")
     print("MERGE COMPLETE!")
     print("="*70)
-    print(f"Total unique events: {len(unique_events)}")
-    print(f"Improvement: {len(existing_events)} -> {len(unique_events)} (+{len(unique_events) - len(existing_events)})")
+    print(f"Total unique events: {unique_count}")
+    print(f"Improvement: {existing_events} -> {unique_count} (+{unique_count - existing_events})")
     print(f"\nCategory breakdown:")
     for cat, count in sorted(categories.items(), key=lambda x: -x[1])[:10]:
         print(f"  {cat:15s} {count:4d}")
@@ -136,32 +135,9 @@ def merge_gemini_ultra():
         for err in stats["errors"]:
             print(f"  - {err}")
 
-    return unique_events, final_stats
-
-
-def deduplicate_events(events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    """Deduplicate events based on (title, year, source_page)"""
-    seen = set()
-    unique = []
-
-    for event in events:
-        # Skip events without year
-        if event.get('year') is None:
-            continue
-
-        key = (
-            event.get('title', '').lower().strip(),
-            event.get('year'),
-            event.get('source_page', '')
-        )
-
-        if key not in seen:
-            seen.add(key)
-            unique.append(event)
-
-    return unique
+    return final_file, final_stats
 
 
 if __name__ == "__main__":
-    events, stats = merge_gemini_ultra()
-    print(f"\n[SUCCESS] {len(events)} unique events ready for database!")
+    final_file, stats = merge_gemini_ultra()
+    print(f"\n[SUCCESS] {stats['total_events']} unique events ready for database!")
@@ -8,44 +8,23 @@ import json
 from pathlib import Path
 from typing import List, Dict, Any
 
+from event_dedup import Deduplicator, print_drop_summary
+from event_io import count_events, EventWriter
+from kway_merge import kway_merge
+
 PROJECT_ROOT = Path(__file__).parent.parent
 PROCESSED_DIR = PROJECT_ROOT / "data" / "processed"
 
 
-def load_json(file_path: Path) -> List[Dict[str, Any]]:
-    """Load JSON file"""
+def count_source(file_path: Path) -> int:
+    """Count a JSON file's events (streamed); 0 if missing"""
     if not file_path.exists():
         print(f"[SKIP] {file_path.name} not found")
-        return []
-
-    with open(file_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-
-    print(f"[LOAD] {file_path.name}: {len(data)} events")
-    return data
-
-
-def deduplicate_events(events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    """Deduplicate events based on (title, year, source_page)"""
-    seen = set()
-    unique = []
-
-    for event in events:
-        # Skip events without year
-        if event.get('year') is None:
-            continue
-
-        key = (
-            event.get('title', '').lower().strip(),
-            event.get('year'),
-            event.get('source_page', '')
-        )
+        return 0
 
-        if key not in seen:
-            seen.add(key)
-            unique.append(event)
-
-    return unique
+    count = count_events(file_path)
+    print(f"[COUNT] {file_path.name}: {count} events")
+    return count
 
 
 def merge_all_with_left():
@@ -54,11 +33,13 @@ def merge_all_with_left():
     print("MERGING ALL DATA + LEFT PAGES")
     print("="*70)
 
-    all_events = []
+    inputs = []
 
-    # Load existing data
-    existing = load_json(PROCESSED_DIR / "final_merged_events.json")
-    all_events.extend(existing)
+    # Count existing data
+    existing_file = PROCESSED_DIR / "final_merged_events.json"
+    existing = count_source(existing_file)
+    if existing:
+        inputs.append(existing_file)
 
     # Load all Left pages
     left_pages = [
@@ -75,45 +56,44 @@ def merge_all_with_left():
     left_count = 0
     for left_file in left_pages:
         left_path = PROCESSED_DIR / left_file
-        left_events = load_json(left_path)
-        all_events.extend(left_events)
-        left_count += len(left_events)
+        count = count_source(left_path)
+        if count:
+            inputs.append(left_path)
+        left_count += count
 
-    print(f"\n[TOTAL] Before dedup: {len(all_events)} events")
-    print(f"  Existing: {len(existing)}")
+    print(f"\n[TOTAL] Before dedup: {existing + left_count} events")
+    print(f"  Existing: {existing}")
     print(f"  Left pages: {left_count}")
 
-    # Deduplicate
-    unique_events = deduplicate_events(all_events)
-    print(f"\n[DEDUP] After dedup: {len(unique_events)} unique events")
-    print(f"[REMOVED] {len(all_events) - len(unique_events)} duplicates")
-
-    # Sort by year
-    unique_events.sort(key=lambda e: e.get('year', 0))
+    # Chronological k-way merge, deduplicated and written as it streams
+    dedup = Deduplicator(record_drops=False)
+    categories = {}
 
-    # Save final merged
     final_file = PROCESSED_DIR / "final_with_left_pages.json"
-    with open(final_file, 'w', encoding='utf-8') as f:
-        json.dump(unique_events, f, ensure_ascii=False, indent=2)
+    with EventWriter(final_file) as writer:
+        for event in kway_merge(inputs, dedup):
+            writer.write(event)
+            cat = event.get('category', 'unknown')
+            categories[cat] = categories.get(cat, 0) + 1
+
+    unique_count = writer.count
+    print(f"\n[DEDUP] After dedup: {unique_count} unique events")
+    print(f"[REMOVED] {dedup.dropped} duplicates")
+    print_drop_summary(dedup)
 
     print(f"\n[SAVED] {final_file.name}")
 
     # Generate stats
     stats = {
-        "total_events": len(unique_events),
+        "total_events": unique_count,
         "sources": {
-            "previous_merged": len(existing),
+            "previous_merged": existing,
             "left_pages": left_count
         },
-        "duplicates_removed": len(all_events) - len(unique_events)
+        "duplicates_removed": dedup.dropped,
+        "drop_reasons": dict(dedup.reasons)
     }
 
-    # Category breakdown
-    categories = {}
-    for event in unique_events:
-        cat = event.get('category', 'unknown')
-        categories[cat] = categories.get(cat, 0) + 1
-
     stats['by_category'] = categories
 
     # Save stats
@@ -126,15 +106,15 @@ def merge_all_with_left():
     print("\n" + "="*70)
     print("MERGE WITH LEFT PAGES COMPLETE")
     print("="*70)
-    print(f"Total unique events: {len(unique_events)}")
-    print(f"Improvement: 370 -> {len(unique_events)} (+{len(unique_events) - 370})")
+    print(f"Total unique events: {unique_count}")
+    print(f"Improvement: 370 -> {unique_count} (+{unique_count - 370})")
     print(f"\nCategory breakdown:")
     for cat, count in sorted(categories.items(), key=lambda x: -x[1]):
         print(f"  {cat:15s} {count:4d}")
 
-    return unique_events, stats
+    return final_file, stats
 
 
 if __name__ == "__main__":
-    events, stats = merge_all_with_left()
-    print(f"\n[SUCCESS] {len(events)} events ready for database!")
+    final_file, stats = merge_all_with_left()
+    print(f"\n[SUCCESS] {stats['total_events']} events ready for database!")
@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""
+CMSD - Near-duplicate detection with MinHash + LSH
+Finds the same historical event extracted from several sheets/providers
+under slightly different Czech titles ("Babylonské zajetí" vs
+"Babylonská říše – zajetí Judy") without comparing every pair.
+
+Each event gets a MinHash signature over its title character n-grams and
+description word n-grams. LSH banding puts events whose signatures agree
+on a whole band into the same bucket; only those candidate pairs are
+scored. A pair is accepted only if the two events come from different
+pages or providers and lie within MAX_YEAR_GAP years of each other.
+Clusters are complete-link: accepted pairs are merged strongest first,
+and two clusters join only if every member pair between them is
+accepted, so "Ferdinand I" - "Ferdinand II" - "Ferdinand III" chains do
+not grow into one cluster.
+
+Usage:
+    python scripts/near_duplicates.py data/processed/final_complete_all_19_pdfs.json
+    python scripts/near_duplicates.py events.json --threshold 0.6 --out clusters.json
+    python scripts/near_duplicates.py --self-check     # the example pair above must cluster
+"""
+
+import sys
+import json
+import hashlib
+from collections import defaultdict
+from pathlib import Path
+from typing import List, Dict, Any, Set, Tuple, Optional, Iterable
+
+from event_dedup import normalize_text, normalize_year
+
+try:
+    import numpy as np
+except ImportError:  # pure Python fallback, fine for a few thousand events
+    np = None
+
+PROJECT_ROOT = Path(__file__).parent.parent
+PROCESSED_DIR = PROJECT_ROOT / "data" / "processed"
+
+PRIME = (1 << 32) + 15      # smallest prime above 2^32
+MAX_HASH = (1 << 32) - 1
+
+NUM_PERM = 128
+BANDS = 32                 # 32 bands x 4 rows -> ~50% recall point at Jaccard ~0.42, ~87% at 0.5
+THRESHOLD = 0.5            # "Babylonské zajetí" / "Babylonská říše – zajetí Judy": Jaccard 0.52
+MAX_YEAR_GAP = 5           # same window as fuzzy_candidates.WINDOW_YEARS
+TITLE_NGRAM = 3            # character n-grams of the title
+DESCRIPTION_NGRAM = 2      # word n-grams of the description
+MAX_BUCKET = 200           # buckets bigger than this are stop-word noise, skip them
+
+# Titles that must end up in one cluster at the default settings (--self-check)
+EXAMPLE_PAIR = ({'title': 'Babylonské zajetí', 'year': -586, 'source_page': '2L'},
+                {'title': 'Babylonská říše – zajetí Judy', 'year': -586, 'source_page': '3R'})
+
+
+def shingles(event: Dict[str, Any], title_ngram: int = TITLE_NGRAM,
+             description_ngram: int = DESCRIPTION_NGRAM, use_description: bool = True) -> Set[str]:
+    """Title char n-grams + description word n-grams, diacritics stripped"""
+    result = set()
+
+    title = normalize_text(event.get('title'), remove_diacritics=True)
+    padded = f" {title} "
+    if len(padded) <= title_ngram:
+        result.add('t:' + padded)
+    else:
+        for i in range(len(padded) - title_ngram + 1):
+            result.add('t:' + padded[i:i + title_ngram])
+
+    if use_description:
+        words = normalize_text(event.get('description'), remove_diacritics=True).split()
+        for i in range(len(words) - description_ngram + 1):
+            result.add('d:' + ' '.join(words[i:i + description_ngram]))
+
+    return result
+
+
+def _hash32(shingle: str) -> int:
+    return int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=4).digest(), 'little')
+
+
+class MinHasher:
+    """Universal-hash MinHash: h_i(x) = ((a_i * x + b_i) mod p) truncated to 32 bits
+
+    a_i < 2^31 keeps a_i * x + b_i inside uint64 for 32-bit x, so the NumPy
+    and pure Python paths produce identical signatures.
+    """
+
+    def __init__(self, num_perm: int = NUM_PERM, seed: int = 1):
+        import random
+        rng = random.Random(seed)
+        self.num_perm = num_perm
+        self.a = [rng.randint(1, (1 << 31) - 1) for _ in range(num_perm)]
+        self.b = [rng.randint(0, PRIME - 1) for _ in range(num_perm)]
+        if np is not None:
+            self._a = np.array(self.a, dtype=np.uint64)
+            self._b = np.array(self.b, dtype=np.uint64)
+
+    def signature(self, shingle_set: Iterable[str]) -> Tuple[int, ...]:
+        hashes = [_hash32(s) for s in shingle_set]
+        if not hashes:
+            return tuple([MAX_HASH] * self.num_perm)
+
+        if np is not None:
+            x = np.array(hashes, dtype=np.uint64)[:, None]
+            values = ((x * self._a + self._b) % np.uint64(PRIME)) & np.uint64(MAX_HASH)
+            return tuple(int(v) for v in values.min(axis=0))
+
+        return tuple(
+            min(((a * x + b) % PRIME) & MAX_HASH for x in hashes)
+            for a, b in zip(self.a, self.b)
+        )
+
+
+def estimate_jaccard(sig_a: Tuple[int, ...], sig_b: Tuple[int, ...]) -> float:
+    return sum(1 for x, y in zip(sig_a, sig_b) if x == y) / len(sig_a)
+
+
+def lsh_candidates(signatures: List[Tuple[int, ...]], bands: int = BANDS,
+                   max_bucket: int = MAX_BUCKET) -> Set[Tuple[int, int]]:
+    """Candidate pairs (i < j) sharing at least one identical band"""
+    rows = len(signatures[0]) // bands if signatures else 0
+    candidates = set()
+
+    for band in range(bands):
+        buckets = defaultdict(list)
+        lo, hi = band * rows, (band + 1) * rows
+        for i, sig in enumerate(signatures):
+            buckets[sig[lo:hi]].append(i)
+
+        for members in buckets.values():
+            if len(members) < 2 or len(members) > max_bucket:
+                continue
+            for x in range(len(members)):
+                for y in range(x + 1, len(members)):
+                    candidates.add((members[x], members[y]))
+
+    return candidates
+
+
+class UnionFind:
+    def __init__(self, n: int):
+        self.parent = list(range(n))
+
+    def find(self, x: int) -> int:
+        while self.parent[x] != x:
+            self.parent[x] = self.parent[self.parent[x]]
+            x = self.parent[x]
+        return x
+
+    def union(self, a: int, b: int):
+        ra, rb = self.find(a), self.find(b)
+        if ra != rb:
+            self.parent[max(ra, rb)] = min(ra, rb)
+
+
+def source_key(event: Dict[str, Any]) -> Tuple[str, Tuple[str, ...]]:
+    """(page, providers) an event was extracted from"""
+    providers = event.get('providers') or ()
+    return normalize_text(event.get('source_page')), tuple(sorted(str(p) for p in providers))
+
+
+def find_near_duplicates(events: List[Dict[str, Any]], threshold: float = THRESHOLD,
+                         num_perm: int = NUM_PERM, bands: int = BANDS,
+                         max_year_gap: Optional[int] = MAX_YEAR_GAP,
+                         use_description: bool = True) -> List[Dict[str, Any]]:
+    """Cluster near-duplicate events from different pages/providers
+
+    Returns complete-link clusters (size >= 2) as dicts with member indices
+    into `events` and the scored pairs that linked them.
+    max_year_gap=None disables the year check.
+    """
+    hasher = MinHasher(num_perm)
+    signatures = [hasher.signature(shingles(e, use_description=use_description)) for e in events]
+    years = [normalize_year(e.get('year')) for e in events]
+    sources = [source_key(e) for e in events]
+
+    def score(i: int, j: int) -> Optional[float]:
+        """Similarity of an acceptable pair, None otherwise"""
+        if sources[i] == sources[j] and any(sources[i]):
+            return None         # same page and provider(s): not a cross-source duplicate
+        if (max_year_gap is not None and years[i] is not None and years[j] is not None
+                and abs(years[i] - years[j]) > max_year_gap):
+            return None
+        similarity = estimate_jaccard(signatures[i], signatures[j])
+        return similarity if similarity >= threshold else None
+
+    scored = []
+    for i, j in lsh_candidates(signatures, bands):
+        similarity = score(i, j)
+        if similarity is not None:
+            scored.append((similarity, min(i, j), max(i, j)))
+    scored.sort(key=lambda item: (-item[0], item[1], item[2]))
+
+    uf = UnionFind(len(events))
+    members = {i: [i] for i in range(len(events))}
+    pairs = []
+    for similarity, i, j in scored:
+        ri, rj = uf.find(i), uf.find(j)
+        if ri == rj:
+            pairs.append((i, j, similarity))
+            continue
+        # complete link: every pair across the two clusters must be acceptable
+        if any(score(a, b) is None for a in members[ri] for b in members[rj]):
+            continue
+        merged = sorted(members.pop(ri) + members.pop(rj))
+        uf.union(ri, rj)
+        members[uf.find(ri)] = merged
+        pairs.append((i, j, similarity))
+
+    linked_roots = {uf.find(i) for i, _, _ in pairs}
+    groups = defaultdict(list)
+    for i in range(len(events)):
+        root = uf.find(i)
+        if root in linked_roots:
+            groups[root].append(i)
+
+    pairs_by_root = defaultdict(list)
+    for i, j, similarity in pairs:
+        pairs_by_root[uf.find(i)].append({'a': i, 'b': j, 'similarity': round(similarity, 3)})
+
+    clusters = []
+    for cluster_id, (root, indices) in enumerate(sorted(groups.items(), key=lambda kv: kv[1][0])):
+        linked = pairs_by_root[root]
+        clusters.append({
+            'cluster_id': cluster_id,
+            'size': len(indices),
+            'max_similarity': max(p['similarity'] for p in linked),
+            'members': [
+                {
+                    'index': i,
+                    'title': events[i].get('title'),
+                    'year': events[i].get('year'),
+                    'source_page': events[i].get('source_page'),
+                }
+                for i in indices
+            ],
+            'pairs': sorted(linked, key=lambda p: -p['similarity']),
+        })
+
+    return clusters
+
+
+def self_check() -> bool:
+    """True if EXAMPLE_PAIR forms one cluster with the default threshold and banding"""
+    clusters = find_near_duplicates(list(EXAMPLE_PAIR))
+    return len(clusters) == 1 and clusters[0]['size'] == 2
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    if args == ["--self-check"]:
+        ok = self_check()
+        print(f"[{'OK' if ok else 'FAIL'}] {EXAMPLE_PAIR[0]['title']} / {EXAMPLE_PAIR[1]['title']}")
+        sys.exit(0 if ok else 1)
+    if not args:
+        print("Usage: python near_duplicates.py <events.json> [--threshold 0.5] "
+              "[--max-year-gap N] [--titles-only] [--out clusters.json] | --self-check")
+        sys.exit(1)
+
+    input_file = Path(args.pop(0))
+    threshold = THRESHOLD
+    max_year_gap = MAX_YEAR_GAP
+    use_description = True
+    output_file = PROCESSED_DIR / f"{input_file.stem}_near_duplicates.json"
+
+    while args:
+        arg = args.pop(0)
+        if arg == "--threshold":
+            threshold = float(args.pop(0))
+        elif arg == "--max-year-gap":
+            max_year_gap = int(args.pop(0))
+        elif arg == "--titles-only":
+            use_description = False
+        elif arg == "--out":
+            output_file = Path(args.pop(0))
+
+    with open(input_file, 'r', encoding='utf-8') as f:
+        events = json.load(f)
+
+    print(f"[LOAD] {input_file.name}: {len(events)} events")
+    clusters = find_near_duplicates(events, threshold=threshold, max_year_gap=max_year_gap,
+                                    use_description=use_description)
+
+    with open(output_file, 'w', encoding='utf-8') as f:
+        json.dump({'source': input_file.name, 'threshold': threshold, 'clusters': clusters},
+                  f, ensure_ascii=False, indent=2)
+
+    in_clusters = sum(c['size'] for c in clusters)
+    print(f"[CLUSTERS] {len(clusters)} clusters covering {in_clusters} events")
+    for cluster in clusters[:10]:
+        titles = ' | '.join(str(m['title']) for m in cluster['members'][:4])
+        print(f"  {cluster['max_similarity']:.2f}  {titles}")
+    print(f"[SAVED] {output_file.name}")
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+CMSD - Cross-provider join for the same page
+Several extractors produce the same pages (`*_single.json`, `*_left.json`,
+`*_gemini.json`, `*_groq.json`, `*_claude_deep.json`). Instead of keeping
+whichever copy arrives first, records are aligned across providers and
+one best record is built field by field.
+
+Alignment is a hash join on (page, normalized title, year), where page
+is the sheet from the filename, not the model's source_page. Records
+without an exact partner fall back to a fuzzy match (title trigram
+Jaccard) against groups of the same page within +-1 year, so every
+record is compared with a handful of candidates only and the join stays
+linear in the input size.
+
+Best record:
+  title, year, year_end, category, region, importance - most agreed value
+                                                        (ties: provider priority)
+  description                                         - longest
+  people, places, tags, bible_refs                    - union, first spelling kept
+  providers                                           - who contributed
+
+Usage:
+    python scripts/provider_join.py                              # data/processed + gemini_ultra
+    python scripts/provider_join.py data/processed --out data/processed/joined_providers.json
+"""
+
+import re
+import sys
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import List, Dict, Any, Tuple, Optional
+
+from event_dedup import normalize_text, normalize_year, chronological_key, with_event_id
+from event_io import iter_events, write_events
+
+PROJECT_ROOT = Path(__file__).parent.parent
+PROCESSED_DIR = PROJECT_ROOT / "data" / "processed"
+GEMINI_DIR = PROCESSED_DIR / "gemini_ultra"
+OUTPUT_FILE = PROCESSED_DIR / "joined_providers.json"
+
+# Filename suffix -> provider, in priority order for ties
+PROVIDER_SUFFIXES = ['gemini', 'claude_deep', 'single', 'left', 'groq']
+# Only per-page outputs: "<page>_<provider>.json" for the 16 sheets (1L..8R) and the
+# three cover PDFs. Aggregates such as remaining_7_gemini.json or
+# all_pdfs_gemini_ultra.json repeat per-page events and would vote twice.
+PAGE_PATTERN = r'\d+[LR]|PredniPreds|zadniPredsLic|zadniPredsRub'
+PROVIDER_FILE_RE = re.compile(
+    r'^(?P<page>' + PAGE_PATTERN + r')_(?P<provider>' + '|'.join(PROVIDER_SUFFIXES) + r')\.json$')
+
+VOTED_FIELDS = ('title', 'year', 'year_end', 'category', 'region', 'importance')
+LIST_FIELDS = ('people', 'places', 'tags', 'bible_refs')
+FUZZY_THRESHOLD = 0.6
+FUZZY_YEAR_GAP = 1
+
+
+def discover(directories: List[Path]) -> List[Tuple[str, str, Path]]:
+    """(provider, file page, path) for every provider output in `directories`"""
+    found = []
+    for directory in directories:
+        for path in sorted(directory.glob("*.json")):
+            match = PROVIDER_FILE_RE.match(path.name)
+            if match:
+                found.append((match['provider'], match['page'], path))
+    found.sort(key=lambda item: PROVIDER_SUFFIXES.index(item[0]))
+    return found
+
+
+def trigrams(title: str) -> frozenset:
+    padded = f" {title} "
+    return frozenset(padded[i:i + 3] for i in range(max(1, len(padded) - 2)))
+
+
+def jaccard(a: frozenset, b: frozenset) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+class Group:
+    """All provider records believed to describe one event"""
+
+    def __init__(self, page: str, title_key: str, year: Optional[int]):
+        self.page = page
+        self.title_key = title_key
+        self.grams = trigrams(title_key)
+        self.year = year
+        self.records: List[Tuple[str, Dict[str, Any]]] = []
+        self.providers = set()
+
+    def add(self, provider: str, event: Dict[str, Any]):
+        self.records.append((provider, event))
+        self.providers.add(provider)
+
+
+def _vote(values: List[Tuple[str, Any]]) -> Any:
+    """Most frequent non-empty value; ties go to the higher-priority provider"""
+    values = [(p, v) for p, v in values if v is not None and v != '']
+    if not values:
+        return None
+    counts = Counter(normalize_text(v) if isinstance(v, str) else v for _, v in values)
+    best = max(counts.values())
+    for provider in PROVIDER_SUFFIXES:
+        for p, v in values:
+            if p == provider and counts[normalize_text(v) if isinstance(v, str) else v] == best:
+                return v
+    return values[0][1]
+
+
+def best_record(group: Group) -> Dict[str, Any]:
+    """Field-wise best record for one aligned group"""
+    record: Dict[str, Any] = {}
+    for field in VOTED_FIELDS:
+        record[field] = _vote([(p, e.get(field)) for p, e in group.records])
+
+    descriptions = [e.get('description') or '' for _, e in group.records]
+    record['description'] = max(descriptions, key=len) or None
+
+    for field in LIST_FIELDS:
+        merged, seen = [], set()
+        for _, event in group.records:
+            for value in event.get(field) or []:
+                key = normalize_text(value) if isinstance(value, str) else value
+                if key not in seen:
+                    seen.add(key)
+                    merged.append(value)
+        record[field] = merged
+
+    record['source_page'] = _vote([(p, e.get('source_page')) for p, e in group.records]) or group.page
+    record['providers'] = sorted(group.providers, key=PROVIDER_SUFFIXES.index)
+    return with_event_id(record)
+
+
+def join_providers(inputs: List[Tuple[str, str, Path]], fuzzy_threshold: float = FUZZY_THRESHOLD
+                   ) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """Align records across providers and return (best records, stats)"""
+    exact: Dict[Tuple, Group] = {}
+    by_page_year: Dict[Tuple, List[Group]] = defaultdict(list)
+    groups: List[Group] = []
+    stats = Counter()
+    by_provider = Counter()
+
+    for provider, file_page, path in inputs:
+        for event in iter_events(path):
+            title_key = normalize_text(event.get('title'), remove_diacritics=True)
+            if not title_key:
+                stats['skipped'] += 1
+                continue
+            by_provider[provider] += 1
+            # Block on the sheet from the filename: the model's source_page varies
+            # per provider ("Infografika", "Page 10", "VII") and only goes to the output
+            page = file_page
+            year = normalize_year(event.get('year'))
+
+            # 1. hash join on the exact normalized key
+            group = exact.get((page, title_key, year))
+            if group is not None:
+                group.add(provider, event)
+                stats['exact'] += 1
+                continue
+
+            # 2. fuzzy fallback inside the (page, year +-1) block
+            grams = trigrams(title_key)
+            best, best_score = None, fuzzy_threshold
+            years = [None] if year is None else range(year - FUZZY_YEAR_GAP, year + FUZZY_YEAR_GAP + 1)
+            for y in years:
+                for candidate in by_page_year.get((page, y), ()):
+                    if provider in candidate.providers:
+                        continue
+                    score = jaccard(grams, candidate.grams)
+                    if score >= best_score:
+                        best, best_score = candidate, score
+            if best is not None:
+                best.add(provider, event)
+                exact[(page, title_key, year)] = best
+                stats['fuzzy'] += 1
+                continue
+
+            # 3. new group
+            group = Group(page, title_key, year)
+            group.add(provider, event)
+            exact[(page, title_key, year)] = group
+            by_page_year[(page, year)].append(group)
+            groups.append(group)
+            stats['new'] += 1
+
+    records = [best_record(group) for group in groups]
+    records.sort(key=chronological_key)
+
+    summary = {
+        'records_in': sum(by_provider.values()),
+        'records_out': len(records),
+        'by_provider': dict(by_provider),
+        'matched_exact': stats['exact'],
+        'matched_fuzzy': stats['fuzzy'],
+        'skipped': stats['skipped'],
+        'multi_provider': sum(1 for g in groups if len(g.providers) > 1),
+    }
+    return records, summary
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    output_file = OUTPUT_FILE
+    if '--out' in args:
+        i = args.index('--out')
+        output_file = Path(args[i + 1])
+        del args[i:i + 2]
+
+    directories = [Path(a) for a in args] or [PROCESSED_DIR, GEMINI_DIR]
+    inputs = discover(directories)
+    if not inputs:
+        print(f"Error: no provider outputs (*_{'/'.join(PROVIDER_SUFFIXES)}.json) found")
+        sys.exit(1)
+
+    for provider, page, path in inputs:
+        print(f"  [{provider:11s}] {path.name}")
+
+    records, summary = join_providers(inputs)
+    count = write_events(records, output_file)
+
+    print(f"\n[JOIN] {summary['records_in']} records -> {count} events")
+    print(f"  exact matches: {summary['matched_exact']}, fuzzy matches: {summary['matched_fuzzy']}, "
+          f"seen by >1 provider: {summary['multi_provider']}")
+    print(f"[SAVED] {output_file.name}")
@@ -0,0 +1,361 @@
+#!/usr/bin/env python3
+"""
+CMSD - Provider failover router
+Picks Claude / Gemini / Groq / OpenAI for a page payload based on size
+limits, remaining quota, recent error rate and measured latency.
+Falls through to the next candidate on failure, with a circuit breaker
+per provider.
+"""
+
+import os
+import json
+import time
+import base64
+from collections import deque
+from datetime import date
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Tuple
+
+PROJECT_ROOT = Path(__file__).parent.parent
+PDFS_DIR = PROJECT_ROOT / "data" / "raw" / "pdfs"
+OUTPUT_DIR = PROJECT_ROOT / "data" / "processed"
+STATE_FILE = OUTPUT_DIR / "provider_router_state.json"
+
+MB = 1024 * 1024
+
+# Candidate (provider, model) pairs. Size limits are the ones the single
+# provider scripts already compress to (extract_deep.py, extract_with_groq.py,
+# extract_with_gemini.py, extract.py). daily_quota = requests per day, None = unlimited.
+PROVIDERS = [
+    {"provider": "claude", "model": "claude-sonnet-4-20250514", "max_bytes": int(4.5 * MB),
+     "api_key_env": ["ANTHROPIC_API_KEY"], "daily_quota": None},
+    {"provider": "groq", "model": "llama-3.2-90b-vision-preview", "max_bytes": 10 * MB,
+     "api_key_env": ["GROQ_API_KEY"], "daily_quota": 1000},
+    {"provider": "gemini", "model": "models/gemini-2.5-flash", "max_bytes": 15 * MB,
+     "api_key_env": ["GEMINI_API_KEY", "GOOGLE_API_KEY"], "daily_quota": 250},
+    {"provider": "gemini", "model": "models/gemini-2.5-pro", "max_bytes": 15 * MB,
+     "api_key_env": ["GEMINI_API_KEY", "GOOGLE_API_KEY"], "daily_quota": 100},
+    {"provider": "openai", "model": "gpt-4o", "max_bytes": 20 * MB,
+     "api_key_env": ["OPENAI_API_KEY"], "daily_quota": None},
+]
+
+# Scoring / breaker tuning
+DEFAULT_LATENCY = 60.0       # seconds, assumed until a provider has been measured
+LATENCY_ALPHA = 0.3          # EWMA weight of the newest sample
+ERROR_WINDOW = 20            # outcomes kept for the error rate
+ERROR_PENALTY = 4.0          # score = latency * (1 + ERROR_PENALTY * error_rate)
+BREAKER_THRESHOLD = 3        # consecutive failures that open the breaker
+BREAKER_COOLDOWN = 300.0     # seconds before a half-open probe is allowed
+
+
+def detect_media_type(image_bytes: bytes) -> str:
+    """Guess image MIME type from magic bytes"""
+    if image_bytes.startswith(b"\x89PNG"):
+        return "image/png"
+    return "image/jpeg"
+
+
+class CircuitBreaker:
+    """Per-provider breaker: closed -> open after repeated failures -> half-open probe"""
+
+    def __init__(self):
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None
+
+    def state(self) -> str:
+        """closed / open / half-open"""
+        if self.opened_at is None:
+            return "closed"
+        if time.time() - self.opened_at >= BREAKER_COOLDOWN:
+            return "half-open"
+        return "open"
+
+    def allows_request(self) -> bool:
+        return self.state() != "open"
+
+    def record(self, ok: bool):
+        if ok:
+            self.consecutive_failures = 0
+            self.opened_at = None
+            return
+        self.consecutive_failures += 1
+        # A failed half-open probe re-opens immediately
+        if self.consecutive_failures >= BREAKER_THRESHOLD or self.opened_at is not None:
+            self.opened_at = time.time()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"consecutive_failures": self.consecutive_failures, "opened_at": self.opened_at}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "CircuitBreaker":
+        breaker = cls()
+        breaker.consecutive_failures = data.get("consecutive_failures", 0)
+        breaker.opened_at = data.get("opened_at")
+        return breaker
+
+
+class CandidateStats:
+    """Measured latency, recent error rate and daily quota use for one provider/model"""
+
+    def __init__(self):
+        self.latency: Optional[float] = None
+        self.outcomes = deque(maxlen=ERROR_WINDOW)
+        self.quota_day = date.today().isoformat()
+        self.used_today = 0
+
+    def _roll_quota_day(self):
+        today = date.today().isoformat()
+        if today != self.quota_day:
+            self.quota_day = today
+            self.used_today = 0
+
+    def remaining_quota(self, daily_quota: Optional[int]) -> Optional[int]:
+        if daily_quota is None:
+            return None
+        self._roll_quota_day()
+        return max(0, daily_quota - self.used_today)
+
+    def error_rate(self) -> float:
+        if not self.outcomes:
+            return 0.0
+        return self.outcomes.count(False) / len(self.outcomes)
+
+    def record(self, ok: bool, elapsed: float):
+        self._roll_quota_day()
+        self.used_today += 1
+        self.outcomes.append(ok)
+        if ok:
+            self.latency = elapsed if self.latency is None else (
+                LATENCY_ALPHA * elapsed + (1 - LATENCY_ALPHA) * self.latency
+            )
+
+    def score(self) -> float:
+        """Lower is better"""
+        latency = self.latency if self.latency is not None else DEFAULT_LATENCY
+        return latency * (1 + ERROR_PENALTY * self.error_rate())
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "latency": self.latency,
+            "outcomes": list(self.outcomes),
+            "quota_day": self.quota_day,
+            "used_today": self.used_today,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "CandidateStats":
+        stats = cls()
+        stats.latency = data.get("latency")
+        stats.outcomes.extend(data.get("outcomes", []))
+        stats.quota_day = data.get("quota_day", stats.quota_day)
+        stats.used_today = data.get("used_today", 0)
+        return stats
+
+
+# --- provider adapters ---------------------------------------------------
+# SDKs and the per-provider extraction functions are imported lazily so the
+# router works with only the SDKs you actually have installed.
+
+def _call_claude(image_bytes: bytes, pdf_name: str, model: str, api_key: str) -> List[Dict[str, Any]]:
+    import anthropic
+    from extract_deep import claude_deep_extraction
+
+    client = anthropic.Anthropic(api_key=api_key)
+    image_base64 = base64.b64encode(image_bytes).decode("utf-8")
+    return claude_deep_extraction(client, image_base64, pdf_name,
+                                  media_type=detect_media_type(image_bytes), model=model)
+
+
+def _call_groq(image_bytes: bytes, pdf_name: str, model: str, api_key: str) -> List[Dict[str, Any]]:
+    from groq import Groq
+    from extract_with_groq import extract_with_groq
+
+    client = Groq(api_key=api_key)
+    image_base64 = base64.b64encode(image_bytes).decode("utf-8")
+    return extract_with_groq(client, image_base64, pdf_name, model=model)
+
+
+def _call_gemini(image_bytes: bytes, pdf_name: str, model: str, api_key: str) -> List[Dict[str, Any]]:
+    import google.generativeai as genai
+    from extract_with_gemini import extract_with_gemini
+
+    genai.configure(api_key=api_key)
+    return extract_with_gemini(genai.GenerativeModel(model), image_bytes, pdf_name)
+
+
+def _call_openai(image_bytes: bytes, pdf_name: str, model: str, api_key: str) -> List[Dict[str, Any]]:
+    from openai import OpenAI
+    from extract import extract_events_from_image
+
+    client = OpenAI(api_key=api_key)
+    image_base64 = base64.b64encode(image_bytes).decode("utf-8")
+    return extract_events_from_image(client, image_base64, pdf_name, model=model)
+
+
+ADAPTERS = {
+    "claude": _call_claude,
+    "groq": _call_groq,
+    "gemini": _call_gemini,
+    "openai": _call_openai,
+}
+
+
+class ProviderRouter:
+    """Route page payloads to the best available provider with failover"""
+
+    def __init__(self, providers: List[Dict[str, Any]] = None, state_file: Optional[Path] = STATE_FILE,
+                 adapters: Dict[str, Any] = None):
+        self.providers = providers if providers is not None else PROVIDERS
+        self.adapters = adapters if adapters is not None else ADAPTERS
+        self.state_file = state_file
+        self.breakers: Dict[str, CircuitBreaker] = {}
+        self.stats: Dict[str, CandidateStats] = {}
+        self._load_state()
+
+    def breaker(self, provider: str) -> CircuitBreaker:
+        if provider not in self.breakers:
+            self.breakers[provider] = CircuitBreaker()
+        return self.breakers[provider]
+
+    def candidate_stats(self, candidate: Dict[str, Any]) -> CandidateStats:
+        key = f"{candidate['provider']}/{candidate['model']}"
+        if key not in self.stats:
+            self.stats[key] = CandidateStats()
+        return self.stats[key]
+
+    def _load_state(self):
+        if self.state_file is None or not self.state_file.exists():
+            return
+        try:
+            with open(self.state_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self.breakers = {k: CircuitBreaker.from_dict(v) for k, v in data.get("breakers", {}).items()}
+            self.stats = {k: CandidateStats.from_dict(v) for k, v in data.get("candidates", {}).items()}
+        except (OSError, ValueError, AttributeError) as e:
+            print(f"[WARNING] Ignoring unreadable router state {self.state_file.name}: {e}")
+
+    def save_state(self):
+        if self.state_file is None:
+            return
+        self.state_file.parent.mkdir(parents=True, exist_ok=True)
+        state = {
+            "breakers": {k: b.to_dict() for k, b in self.breakers.items()},
+            "candidates": {k: c.to_dict() for k, c in self.stats.items()},
+        }
+        with open(self.state_file, "w", encoding="utf-8") as f:
+            json.dump(state, f, indent=2)
+
+    @staticmethod
+    def _api_key(candidate: Dict[str, Any]) -> Optional[str]:
+        for env in candidate.get("api_key_env", []):
+            if os.getenv(env):
+                return os.getenv(env)
+        return None
+
+    def candidates(self, payload_size: int) -> List[Tuple[Dict[str, Any], str]]:
+        """Eligible (candidate, skip_reason) list, best first; skip_reason is '' for usable ones"""
+        usable = []
+        skipped = []
+
+        for candidate in self.providers:
+            name = candidate["provider"]
+            stats = self.candidate_stats(candidate)
+
+            if payload_size > candidate["max_bytes"]:
+                skipped.append((candidate, f"payload {payload_size / MB:.2f} MB > {candidate['max_bytes'] / MB:.1f} MB"))
+            elif name not in self.adapters:
+                skipped.append((candidate, "no adapter"))
+            elif self._api_key(candidate) is None:
+                skipped.append((candidate, "no API key"))
+            elif not self.breaker(name).allows_request():
+                skipped.append((candidate, "circuit open"))
+            elif stats.remaining_quota(candidate.get("daily_quota")) == 0:
+                skipped.append((candidate, "quota exhausted"))
+            else:
+                usable.append(candidate)
+
+        usable.sort(key=lambda c: self.candidate_stats(c).score())
+        return [(c, "") for c in usable] + skipped
+
+    def extract(self, image_bytes: bytes, pdf_name: str) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Extract events, failing over across providers. Returns (events, 'provider/model')"""
+        size = len(image_bytes)
+        print(f"Routing {pdf_name} ({size / MB:.2f} MB)...")
+
+        try:
+            for candidate, skip_reason in self.candidates(size):
+                name, model = candidate["provider"], candidate["model"]
+                if skip_reason:
+                    print(f"  [SKIP] {name}/{model}: {skip_reason}")
+                    continue
+
+                print(f"  [TRY] {name}/{model}")
+                started = time.time()
+                try:
+                    events = self.adapters[name](image_bytes, pdf_name, model, self._api_key(candidate))
+                except Exception as e:
+                    print(f"  [ERROR] {name}/{model}: {e}")
+                    events = []
+                elapsed = time.time() - started
+
+                ok = bool(events)
+                self.breaker(name).record(ok)
+                self.candidate_stats(candidate).record(ok, elapsed)
+
+                if ok:
+                    print(f"  [OK] {name}/{model}: {len(events)} events in {elapsed:.1f}s")
+                    return events, f"{name}/{model}"
+
+                print(f"  [FAILED] {name}/{model} after {elapsed:.1f}s "
+                      f"(breaker: {self.breaker(name).state()})")
+
+            print(f"  [ERROR] All providers failed for {pdf_name}")
+            return [], None
+
+        finally:
+            self.save_state()
+
+
+def render_page(pdf_path: Path, dpi: int = 200, quality: int = 90) -> bytes:
+    """Render first PDF page to JPEG bytes (largest payload any provider accepts)"""
+    import io
+    import fitz
+    from PIL import Image
+
+    doc = fitz.open(str(pdf_path))
+    page = doc[0]
+    zoom = dpi / 72
+    pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom))
+    img = Image.open(io.BytesIO(pix.tobytes("png")))
+    img.thumbnail((3072, 3072), Image.Resampling.LANCZOS)
+    if img.mode in ('RGBA', 'LA', 'P'):
+        img = img.convert('RGB')
+
+    buffer = io.BytesIO()
+    img.save(buffer, format='JPEG', quality=quality, optimize=True)
+    doc.close()
+    return buffer.getvalue()
+
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) < 2:
+        print("Usage: python provider_router.py <pdf_filename> [dpi]")
+        print("Example: python provider_router.py 6L.pdf 150")
+        sys.exit(1)
+
+    pdf_path = PDFS_DIR / sys.argv[1]
+    if not pdf_path.exists():
+        print(f"[ERROR] PDF not found: {pdf_path}")
+        sys.exit(1)
+
+    dpi = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    router = ProviderRouter()
+    events, used = router.extract(render_page(pdf_path, dpi=dpi), pdf_path.stem)
+
+    if events:
+        output_file = OUTPUT_DIR / f"{pdf_path.stem}_routed.json"
+        with open(output_file, "w", encoding="utf-8") as f:
+            json.dump(events, f, ensure_ascii=False, indent=2)
+        print(f"\n[SUCCESS] {len(events)} events via {used} -> {output_file.name}")
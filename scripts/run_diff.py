@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+CMSD - Diff two extraction/merge runs by stable event ID
+Events are matched on their content ID (the 'id' field written by the
+merge, or event_dedup.event_id for older files without one). One pass
+over each run with a hash table: O(n), no pairwise comparison.
+
+  added     - ID only in the new run
+  removed   - ID only in the old run
+  modified  - same ID, other fields changed (field-level old/new values)
+
+A changed title, year or source_page changes the identity itself, so it
+shows up as removed + added.
+
+Usage:
+    python scripts/run_diff.py old/final_complete_all_19_pdfs.json data/processed/final_complete_all_19_pdfs.json
+    python scripts/run_diff.py old.json new.json --out diff.json
+"""
+
+import sys
+import json
+import hashlib
+from pathlib import Path
+from typing import Dict, Any, Iterable, Tuple
+
+from event_dedup import event_id
+from event_io import iter_events
+
+IGNORED_FIELDS = {'id'}
+
+
+def content_hash(event: Dict[str, Any]) -> bytes:
+    body = {k: v for k, v in event.items() if k not in IGNORED_FIELDS}
+    return hashlib.blake2b(json.dumps(body, sort_keys=True, ensure_ascii=False).encode('utf-8'),
+                           digest_size=16).digest()
+
+
+def keyed(events: Iterable[Dict[str, Any]]) -> Iterable[Tuple[str, Dict[str, Any]]]:
+    for event in events:
+        yield event.get('id') or event_id(event), event
+
+
+def field_changes(old: Dict[str, Any], new: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    changes = {}
+    for field in sorted((old.keys() | new.keys()) - IGNORED_FIELDS):
+        if old.get(field) != new.get(field):
+            changes[field] = {'old': old.get(field), 'new': new.get(field)}
+    return changes
+
+
+def diff_runs(old_events: Iterable[Dict[str, Any]], new_events: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """Compare two runs; the old run is indexed, the new run is streamed"""
+    old_index: Dict[str, Tuple[bytes, Dict[str, Any]]] = {}
+    for uid, event in keyed(old_events):
+        old_index.setdefault(uid, (content_hash(event), event))
+
+    added, modified = [], []
+    unchanged = 0
+    seen = set()
+    for uid, event in keyed(new_events):
+        if uid in seen:
+            continue
+        seen.add(uid)
+
+        old = old_index.get(uid)
+        if old is None:
+            added.append({'id': uid, 'year': event.get('year'), 'title': event.get('title')})
+        elif old[0] == content_hash(event):
+            unchanged += 1
+        else:
+            modified.append({'id': uid, 'year': event.get('year'), 'title': event.get('title'),
+                             'changes': field_changes(old[1], event)})
+
+    removed = [
+        {'id': uid, 'year': event.get('year'), 'title': event.get('title')}
+        for uid, (_, event) in old_index.items() if uid not in seen
+    ]
+
+    return {
+        'summary': {'added': len(added), 'removed': len(removed),
+                    'modified': len(modified), 'unchanged': unchanged},
+        'added': added,
+        'removed': removed,
+        'modified': modified,
+    }
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    output_file = None
+    if '--out' in args:
+        i = args.index('--out')
+        output_file = Path(args[i + 1])
+        del args[i:i + 2]
+
+    if len(args) != 2:
+        print("Usage: python run_diff.py <old.json|jsonl> <new.json|jsonl> [--out diff.json]")
+        sys.exit(1)
+
+    old_file, new_file = Path(args[0]), Path(args[1])
+    diff = diff_runs(iter_events(old_file), iter_events(new_file))
+    summary = diff['summary']
+
+    print(f"[DIFF] {old_file.name} -> {new_file.name}")
+    print(f"  added: {summary['added']}  removed: {summary['removed']}  "
+          f"modified: {summary['modified']}  unchanged: {summary['unchanged']}")
+
+    for entry in diff['modified'][:10]:
+        print(f"  ~ {entry['year']}: {entry['title']}  ({', '.join(entry['changes'])})")
+    for entry in diff['added'][:5]:
+        print(f"  + {entry['year']}: {entry['title']}")
+    for entry in diff['removed'][:5]:
+        print(f"  - {entry['year']}: {entry['title']}")
+
+    if output_file:
+        with open(output_file, 'w', encoding='utf-8') as f:
+            json.dump(diff, f, ensure_ascii=False, indent=2)
+        print(f"[SAVED] {output_file.name}")
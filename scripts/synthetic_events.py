@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+CMSD - Synthetic dataset generator for load and scaling tests
+Learns the distributions of the real events and draws new events from
+them at any size:
+
+  year            density along the timeline (BIN_YEARS-wide bins), share undated
+  year_end        share of periods and their lengths
+  category, region, importance, source_page   value frequencies
+  title, description   length in words and word frequencies
+  people, places, tags, bible_refs   count per event and name frequencies
+
+Fields are drawn independently of each other. The same profile, size and
+seed always give the same events. Dated events come out in year order
+(undated ones last), like the merged dataset, so Parquet row-group
+statistics stay useful.
+
+Usage:
+    python scripts/synthetic_events.py --scale 100                     # JSON, ~230k events
+    python scripts/synthetic_events.py --scale 1000 --format jsonl --seed 7
+    python scripts/synthetic_events.py --events 500000 --format parquet --out /tmp/cmsd.parquet
+"""
+
+import re
+import sys
+import random
+import bisect
+import itertools
+from collections import Counter
+from pathlib import Path
+from typing import List, Dict, Any, Iterable, Iterator, Optional
+
+from event_io import write_events
+
+PROJECT_ROOT = Path(__file__).parent.parent
+SYNTHETIC_DIR = PROJECT_ROOT / "data" / "synthetic"
+
+BIN_YEARS = 10
+FORMATS = ('json', 'jsonl', 'parquet')
+WORD_RE = re.compile(r'\w+')
+
+LIST_FIELDS = ('tags', 'people', 'places', 'bible_refs')
+VALUE_FIELDS = ('category', 'region', 'importance', 'source_page')
+
+
+def _frequencies(values: Iterable[Any]) -> List[List[Any]]:
+    """[[value, count], ...] most common first (JSON-serializable, unlike a Counter with None keys)"""
+    return [[value, count] for value, count in Counter(values).most_common()]
+
+
+def learn_profile(events: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Distributions of the real events (plain lists and numbers, can be saved as JSON)"""
+    years = [e['year'] for e in events if isinstance(e.get('year'), int)]
+    spans = [e['year_end'] - e['year'] for e in events
+             if isinstance(e.get('year'), int) and isinstance(e.get('year_end'), int)]
+    titles = [WORD_RE.findall(str(e.get('title') or '')) for e in events]
+    descriptions = [WORD_RE.findall(str(e.get('description') or '')) for e in events]
+
+    profile = {
+        'events': len(events),
+        'undated': (len(events) - len(years)) / max(len(events), 1),
+        'year_bins': _frequencies(year // BIN_YEARS for year in years),
+        'periods': len(spans) / max(len(years), 1),
+        'period_lengths': _frequencies(spans),
+        'title_lengths': _frequencies(len(words) for words in titles),
+        'title_words': _frequencies(w for words in titles for w in words),
+        'description_lengths': _frequencies(len(words) for words in descriptions),
+        'description_words': _frequencies(w for words in descriptions for w in words),
+    }
+    for field in VALUE_FIELDS:
+        profile[field] = _frequencies(e.get(field) for e in events)
+    for field in LIST_FIELDS:
+        items = [e.get(field) if isinstance(e.get(field), list) else [] for e in events]
+        profile[f'{field}_counts'] = _frequencies(len(values) for values in items)
+        profile[f'{field}_names'] = _frequencies(v for values in items for v in values if v)
+    return profile
+
+
+class _Sampler:
+    """Weighted draws from [[value, count], ...] with precomputed cumulative weights"""
+
+    def __init__(self, frequencies: List[List[Any]]):
+        self.values = [value for value, _ in frequencies] or [None]
+        self.cum_weights = list(itertools.accumulate(count for _, count in frequencies)) or [1]
+
+    def one(self, rng: random.Random) -> Any:
+        return self.values[bisect.bisect(self.cum_weights, rng.random() * self.cum_weights[-1])]
+
+    def many(self, rng: random.Random, k: int) -> List[Any]:
+        return rng.choices(self.values, cum_weights=self.cum_weights, k=k) if k > 0 else []
+
+
+def _text(words: _Sampler, lengths: _Sampler, rng: random.Random) -> Optional[str]:
+    drawn = words.many(rng, lengths.one(rng))
+    if not drawn:
+        return None
+    text = ' '.join(drawn)
+    return text[0].upper() + text[1:]
+
+
+def _names(names: _Sampler, counts: _Sampler, rng: random.Random) -> List[str]:
+    # Distinct names, first-drawn order (the real lists never repeat a name)
+    return list(dict.fromkeys(names.many(rng, counts.one(rng))))
+
+
+def generate_events(profile: Dict[str, Any], size: int, seed: int = 42) -> Iterator[Dict[str, Any]]:
+    """`size` synthetic events drawn from `profile`, dated ones in year order"""
+    rng = random.Random(seed)
+    samplers = {name: _Sampler(value) for name, value in profile.items() if isinstance(value, list)}
+
+    dated = sum(rng.random() >= profile['undated'] for _ in range(size))
+    years = sorted(b * BIN_YEARS + rng.randrange(BIN_YEARS) for b in samplers['year_bins'].many(rng, dated))
+    years.extend([None] * (size - dated))
+
+    for year in years:
+        year_end = None
+        if year is not None and rng.random() < profile['periods']:
+            year_end = year + samplers['period_lengths'].one(rng)
+        yield {
+            'year': year,
+            'year_end': year_end,
+            'title': _text(samplers['title_words'], samplers['title_lengths'], rng) or 'Událost',
+            'description': _text(samplers['description_words'], samplers['description_lengths'], rng),
+            'category': samplers['category'].one(rng),
+            'region': samplers['region'].one(rng),
+            'importance': samplers['importance'].one(rng),
+            'tags': _names(samplers['tags_names'], samplers['tags_counts'], rng),
+            'people': _names(samplers['people_names'], samplers['people_counts'], rng),
+            'places': _names(samplers['places_names'], samplers['places_counts'], rng),
+            'bible_refs': _names(samplers['bible_refs_names'], samplers['bible_refs_counts'], rng),
+            'source_page': samplers['source_page'].one(rng),
+        }
+
+
+def write_synthetic(events: Iterable[Dict[str, Any]], path: Path, fmt: str) -> int:
+    """Stream events to `path` as JSON array, JSONL or Parquet; returns the number written"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if fmt == 'parquet':
+        from event_parquet import write_parquet     # optional dependency (pyarrow)
+        return write_parquet(events, path)
+    return write_events(events, path, jsonl=fmt == 'jsonl')
+
+
+def main():
+    from bench_fuzzy_candidates import load_real_events
+
+    def option(name, default):
+        return sys.argv[sys.argv.index(name) + 1] if name in sys.argv else default
+
+    fmt = option("--format", 'json')
+    if fmt not in FORMATS:
+        print(f"[ERROR] --format must be one of {', '.join(FORMATS)}")
+        sys.exit(1)
+    seed = int(option("--seed", 42))
+
+    real = load_real_events()
+    scale = float(option("--scale", 10))
+    size = int(option("--events", 0)) or round(scale * len(real))
+    out = Path(option("--out", SYNTHETIC_DIR / f"cmsd_{size}_seed{seed}.{fmt}"))
+
+    profile = learn_profile(real)
+    print(f"[LOAD] {len(real)} real events: {len(profile['title_words'])} title words, "
+          f"{len(profile['tags_names'])} tags, {len(profile['people_names'])} people")
+    count = write_synthetic(generate_events(profile, size, seed), out, fmt)
+    print(f"[OK] {count} synthetic events (seed {seed}) -> {out}")
+
+
+if __name__ == "__main__":
+    main()
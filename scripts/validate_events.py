@@ -0,0 +1,349 @@
+#!/usr/bin/env python3
+"""
+CMSD - Batch validation and normalization of extracted events
+Columnar pandas pass over whole batches instead of per-row Python:
+
+  year, year_end   coerced to Int64 ("-608", "608 př. n. l.", 1250.0);
+                   unparsable or boolean -> NULL + flag, reversed periods swapped
+  importance       coerced, missing -> 3, clamped to 1..5 (+ flag), so it
+                   no longer trips the CHECK constraint in populate_database
+  category         mapped to a canonical code through CATEGORY_CODES
+                   ("politics/war" -> politics, "military" -> war)
+  region           mapped through REGION_ALIASES, then folded by spelling
+                   (case, diacritics, punctuation) to one canonical name
+
+Text columns are factorized first, so lookups run once per distinct
+value, not once per event. Rejected rows (no title, metadata rows, years
+out of range) go to a rejects file as they came in, with their reasons.
+
+Usage:
+    python scripts/validate_events.py data/processed/final_complete_all_19_pdfs.json
+    python scripts/validate_events.py events.json --out validated.json --rejects rejects.json
+"""
+
+import gc
+import re
+import sys
+import json
+import operator
+from pathlib import Path
+from typing import List, Dict, Any, Iterable, Iterator, Tuple
+
+import numpy as np
+import pandas as pd
+
+from event_dedup import normalize_text
+
+PROJECT_ROOT = Path(__file__).parent.parent
+PROCESSED_DIR = PROJECT_ROOT / "data" / "processed"
+
+COLUMNS = ['id', 'year', 'year_end', 'title', 'description', 'category', 'region',
+           'importance', 'tags', 'people', 'places', 'bible_refs', 'source_page']
+LIST_COLUMNS = ['tags', 'people', 'places', 'bible_refs']
+CHECKED = ['year', 'year_end', 'title', 'importance', 'category', 'region'] + LIST_COLUMNS
+
+CATEGORIES = ('religion', 'war', 'politics', 'discovery', 'culture', 'science', 'economics', 'disaster', 'other')
+
+# Free-form category words -> canonical code (first known part of "a/b/c" wins)
+CATEGORY_CODES = {
+    **{c: c for c in CATEGORIES},
+    'military': 'war',
+    'law': 'politics',
+    'history': 'culture',
+    'philosophy': 'culture',
+    'architecture': 'culture',
+    'society': 'culture',
+    'people': 'culture',
+    'communication': 'science',
+    'geography': 'discovery',
+    'natural_disaster': 'disaster',
+}
+METADATA_CATEGORIES = {'metadata'}
+
+# Known alternative names -> canonical region (keys are normalized, diacritics stripped)
+REGION_ALIASES = {
+    'globalni': 'Svět',
+    'global': 'Svět',
+    'cely svet': 'Svět',
+    'spojene staty': 'USA',
+    'spojene staty americke': 'USA',
+    'sovetsky svaz': 'SSSR',
+    'cina': 'Čína',
+    'anglie': 'Anglie',
+    'cechy': 'Čechy',
+    'nemecko': 'Německo',
+}
+
+YEAR_MIN = -5_000_000
+YEAR_MAX = 2100
+DEFAULT_IMPORTANCE = 3
+BC_RE = re.compile(r'^\s*(-?\d+)\s*(př|pr|bc|b\.c)?', re.IGNORECASE)
+
+# Reject / flag reasons
+MISSING_TITLE = 'missing_title'
+METADATA_ROW = 'metadata_row'
+YEAR_OUT_OF_RANGE = 'year_out_of_range'
+YEAR_UNPARSED = 'year_unparsed'
+YEAR_END_SWAPPED = 'year_end_swapped'
+IMPORTANCE_MISSING = 'importance_missing'
+IMPORTANCE_CLAMPED = 'importance_clamped'
+CATEGORY_UNKNOWN = 'category_unknown'
+REJECT_REASONS = (MISSING_TITLE, YEAR_OUT_OF_RANGE, METADATA_ROW)
+# Reject bit set -> reason names
+REJECT_NAMES = [tuple(r for i, r in enumerate(REJECT_REASONS) if bits >> i & 1)
+                for bits in range(1 << len(REJECT_REASONS))]
+
+
+def _parse_year(value: Any):
+    """One distinct raw year value -> int or None"""
+    if value is None or (isinstance(value, float) and np.isnan(value)):
+        return None
+    if isinstance(value, (int, np.integer)) and not isinstance(value, bool):
+        return int(value)
+    if isinstance(value, (float, np.floating)):
+        return int(value) if np.isfinite(value) else None
+    match = BC_RE.match(str(value))
+    if not match:
+        return None
+    year = int(match.group(1))
+    return -abs(year) if match.group(2) else year
+
+
+def _map_unique(series: pd.Series, func) -> pd.Series:
+    """Apply `func` once per distinct value (factorize + take)"""
+    codes, uniques = pd.factorize(series, use_na_sentinel=True)
+    mapped = np.array([func(u) for u in uniques] + [func(None)], dtype=object)
+    return pd.Series(mapped[codes], index=series.index)
+
+
+def coerce_years(series: pd.Series) -> Tuple[pd.Series, pd.Series, pd.Series]:
+    """(Int64 years, unparsed mask, out-of-range mask)
+
+    Out-of-range and non-finite values (1e20, "inf") become NULL before the
+    Int64 cast, which cannot hold them, and are reported in the third mask.
+    Booleans are not years: they become NULL and count as unparsed.
+    """
+    numeric = pd.to_numeric(series, errors='coerce').astype('float64')
+    maybe_bool = numeric.isin((0, 1))
+    if maybe_bool.any():        # True would otherwise become year 1
+        booleans = series[maybe_bool].map(type).eq(bool).reindex(series.index, fill_value=False)
+        numeric = numeric.mask(booleans)
+    else:
+        booleans = maybe_bool
+    needs_parse = numeric.isna() & series.notna() & ~booleans
+    if needs_parse.any():
+        parsed = _map_unique(series[needs_parse].astype(str), _parse_year)
+        numeric.loc[needs_parse] = pd.to_numeric(parsed, errors='coerce').astype('float64')
+    out_of_range = numeric.notna() & ~numeric.between(YEAR_MIN, YEAR_MAX)
+    years = numeric.mask(out_of_range).round().astype('Int64')
+    return years, years.isna() & series.notna() & ~out_of_range, out_of_range
+
+
+def category_code(raw: Any) -> str:
+    if raw is None or (isinstance(raw, float) and np.isnan(raw)):
+        return None
+    for part in re.split(r'[/,;|]', str(raw).casefold()):
+        code = CATEGORY_CODES.get(part.strip().replace(' ', '_'))
+        if code:
+            return code
+    return None
+
+
+def is_metadata(raw: Any) -> bool:
+    return isinstance(raw, str) and raw.casefold() in METADATA_CATEGORIES
+
+
+def region_key(raw: Any) -> str:
+    if raw is None or (isinstance(raw, float) and np.isnan(raw)):
+        return ''
+    return normalize_text(raw, remove_diacritics=True)
+
+
+def canonical_regions(series: pd.Series) -> pd.Series:
+    """Aliases first, then one spelling per folded key (the most frequent one)"""
+    codes, uniques = pd.factorize(series, use_na_sentinel=True)
+    counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+    keys = [region_key(u) for u in uniques]
+    spelling = {}
+    for i in np.argsort(-counts, kind='stable'):
+        spelling.setdefault(keys[i], uniques[i])
+    spelling.update(REGION_ALIASES)
+    spelling[''] = None
+    mapped = np.array([spelling[key] for key in keys] + [None], dtype=object)
+    return pd.Series(mapped[codes], index=series.index)
+
+
+def _check(df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.Series, Dict[str, int]]:
+    """Normalized CHECKED columns, reject bits per row (REJECT_REASONS, 0 = kept) and flag counts"""
+    df = df.reindex(columns=CHECKED)
+    flags: Dict[str, int] = {}
+    reasons = np.zeros(len(df), dtype=np.int8)
+
+    def reject(mask: pd.Series, reason: str):
+        reasons[mask.fillna(False).to_numpy(dtype=bool)] |= 1 << REJECT_REASONS.index(reason)
+
+    def flag(mask: pd.Series, reason: str):
+        count = int(mask.fillna(False).sum())
+        if count:
+            flags[reason] = flags.get(reason, 0) + count
+
+    # Title
+    title = df['title'].astype('string').str.strip()
+    reject(title.isna() | (title == ''), MISSING_TITLE)
+    df['title'] = title
+
+    # Years
+    df['year'], unparsed, out_of_range = coerce_years(df['year'])
+    flag(unparsed, YEAR_UNPARSED)
+    df['year_end'], unparsed_end, out_of_range_end = coerce_years(df['year_end'])
+    flag(unparsed_end, YEAR_UNPARSED)
+    reject(out_of_range | out_of_range_end, YEAR_OUT_OF_RANGE)
+
+    swapped = (df['year_end'] < df['year']).fillna(False)
+    flag(swapped, YEAR_END_SWAPPED)
+    df.loc[swapped, ['year', 'year_end']] = df.loc[swapped, ['year_end', 'year']].to_numpy()
+
+    # Importance
+    importance = pd.to_numeric(df['importance'], errors='coerce')
+    flag(importance.isna(), IMPORTANCE_MISSING)
+    importance = importance.fillna(DEFAULT_IMPORTANCE).round()
+    clamped = importance.clip(1, 5)
+    flag(clamped != importance, IMPORTANCE_CLAMPED)
+    df['importance'] = clamped.astype('int8')
+
+    # Category
+    raw_category = df['category']
+    metadata = _map_unique(raw_category, is_metadata).astype(bool)
+    reject(metadata, METADATA_ROW)
+    codes = _map_unique(raw_category, category_code)
+    flag(codes.isna() & ~metadata, CATEGORY_UNKNOWN)
+    df['category'] = codes.fillna('other')
+
+    # Region
+    df['region'] = canonical_regions(df['region'])
+
+    # List columns: NULL / scalar -> []
+    for column in LIST_COLUMNS:
+        values = df[column].tolist()
+        if not all(type(v) is list for v in values):
+            df[column] = [v if type(v) is list else [] for v in values]
+
+    return df, reasons, flags
+
+
+
+
+def validate_frame(df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame, Dict[str, int]]:
+    """Validate one batch; returns (clean rows, rejected rows with 'reject_reasons', flag counts)
+
+    Only the input's own columns come back out. Rejected rows are the
+    untouched input rows, so the rejects show the original values.
+    """
+    checked, reasons, flags = _check(df)
+    clean = df.copy()
+    for column in CHECKED:
+        if column in df.columns:
+            clean[column] = checked[column]
+    rejected = reasons != 0
+    rejects = df[rejected].copy()
+    rejects['reject_reasons'] = [list(REJECT_NAMES[bits]) for bits in reasons[rejected]]
+    return clean[~rejected], rejects, flags
+
+
+def _values(series: pd.Series) -> List[Any]:
+    """Column -> JSON-ready list (pd.NA -> None, numpy ints -> int)"""
+    return series.to_numpy(dtype=object, na_value=None).tolist()
+
+
+def _validate_batch(batch: List[Dict[str, Any]], rejects: List[Dict[str, Any]] = None,
+                    flags: Dict[str, int] = None) -> List[Dict[str, Any]]:
+    keys = set().union(*batch)
+    present = [c for c in CHECKED if c in keys]
+    raw = {c: [event.get(c) for event in batch] for c in present}
+    checked, reasons, batch_flags = _check(pd.DataFrame(raw, dtype=object))
+    if flags is not None:
+        for reason, count in batch_flags.items():
+            flags[reason] = flags.get(reason, 0) + count
+
+    bits_list = reasons.tolist()
+    kept = [None if bits else dict(event) for event, bits in zip(batch, bits_list)]
+    for column in present:
+        values, before = _values(checked[column]), raw[column]
+        # 1250.0 == 1250 and True == 1, so the type counts as a change too
+        changed = (np.fromiter(map(operator.ne, values, before), bool, len(batch))
+                   | np.fromiter(map(operator.is_not, map(type, values), map(type, before)), bool, len(batch)))
+        for i in np.flatnonzero(changed & (reasons == 0)).tolist():
+            kept[i][column] = values[i]
+    if rejects is not None:
+        rejects.extend({**event, 'reject_reasons': list(REJECT_NAMES[bits])}
+                       for event, bits in zip(batch, bits_list) if bits)
+    return [event for event in kept if event is not None]
+
+
+def validate_events(events: Iterable[Dict[str, Any]], batch_size: int = 50_000,
+                    rejects: List[Dict[str, Any]] = None, flags: Dict[str, int] = None) -> Iterator[Dict[str, Any]]:
+    """Stream validated events batch by batch; rejects/flags are collected into the given containers
+
+    Only the CHECKED columns go through pandas. Each kept event is a copy
+    of the input dict with the changed cells replaced (keys it lacked stay
+    missing unless validation fills them in); each reject is a copy of the
+    input dict plus 'reject_reasons'.
+    """
+    batch = []
+
+    def run(batch):
+        # A batch allocates a few hundred thousand objects without cycles; with
+        # the dataset in memory the collector would rescan it over and over
+        collecting = gc.isenabled()
+        gc.disable()
+        try:
+            return _validate_batch(batch, rejects, flags)
+        finally:
+            if collecting:
+                gc.enable()
+
+    for event in events:
+        if isinstance(event, dict):
+            batch.append(event)
+        if len(batch) == batch_size:
+            yield from run(batch)
+            batch = []
+    if batch:
+        yield from run(batch)
+
+
+def print_report(kept: int, rejects: List[Dict[str, Any]], flags: Dict[str, int]):
+    from collections import Counter
+    reasons = Counter(r for row in rejects for r in row['reject_reasons'])
+    print(f"[VALID] {kept} events kept, {len(rejects)} rejected")
+    for reason, count in reasons.most_common():
+        print(f"  reject {reason:22s} {count:6d}")
+    for reason, count in sorted(flags.items(), key=lambda kv: -kv[1]):
+        print(f"  flag   {reason:22s} {count:6d}")
+
+
+if __name__ == "__main__":
+    from event_io import iter_events, write_events
+
+    args = sys.argv[1:]
+    if not args:
+        print("Usage: python validate_events.py <events.json|jsonl> [--out validated.json] [--rejects rejects.json]")
+        sys.exit(1)
+
+    input_file = Path(args.pop(0))
+    output_file = PROCESSED_DIR / f"{input_file.stem}_validated.json"
+    rejects_file = PROCESSED_DIR / f"{input_file.stem}_rejects.json"
+    while args:
+        arg = args.pop(0)
+        if arg == '--out':
+            output_file = Path(args.pop(0))
+        elif arg == '--rejects':
+            rejects_file = Path(args.pop(0))
+
+    rejects, flags = [], {}
+    kept = write_events(validate_events(iter_events(input_file), rejects=rejects, flags=flags), output_file)
+    with open(rejects_file, 'w', encoding='utf-8') as f:
+        json.dump(rejects, f, ensure_ascii=False, indent=2)
+
+    print_report(kept, rejects, flags)
+    print(f"[SAVED] {output_file.name}, {rejects_file.name}")